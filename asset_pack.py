@@ -0,0 +1,263 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+# Pacote único com os arquivos que o jogo usa (fonte, efeitos, músicas).
+# No lugar de abrir cada arquivo pelo caminho, o jogo abre o pacote uma vez
+# com mmap e entrega ao pygame objetos de arquivo que leem das páginas
+# mapeadas, sem um open por arquivo nem carregar o arquivo inteiro antes do
+# uso: cada leitura copia só o trecho pedido (a fonte TTF, por exemplo, é
+# lida aos poucos pelo SDL_ttf). readinto copia direto das páginas para o
+# buffer de quem lê; read precisa devolver bytes, então copia o trecho.
+#
+#   python asset_pack.py                 # gera assets.pack
+#   python asset_pack.py --list          # mostra o conteúdo
+#
+# Formato (little-endian):
+#   cabeçalho: magic b'TTAP', versão (u8), quantidade de arquivos (u32)
+#   índice:    para cada arquivo, início (u64), tamanho (u64), tamanho do
+#              caminho (u16) e o caminho em UTF-8
+#   dados:     os arquivos, um após o outro, alinhados em ALIGNMENT bytes
+#
+# Os caminhos no índice são os mesmos usados no código ('assets/...', com
+# '/'), então quem carrega só precisa trocar o caminho por open_asset().
+
+PACK_MAGIC = b'TTAP'
+PACK_VERSION = 1
+PACK_PATH = 'assets.pack'
+
+HEADER = struct.Struct('<4sBI')
+ENTRY = struct.Struct('<QQH')
+
+ALIGNMENT = 16
+
+
+class AssetPackError(Exception):
+    pass
+
+
+def referenced_assets():
+    """Caminhos de todos os arquivos que o jogo carrega."""
+    from game_assets import FONT_PATH, STARTUP_MUSIC, STARTUP_SOUNDS
+    paths = [FONT_PATH]
+    paths += [path for _, path in STARTUP_MUSIC]
+    paths += [path for _, path in STARTUP_SOUNDS]
+    return [normalize(path) for path in paths]
+
+
+def normalize(path):
+    return path.replace(os.sep, '/')
+
+
+def build_pack(paths, output=PACK_PATH):
+    """
+    Grava os arquivos `paths` (os que existirem) em um pacote. A gravação
+    é atômica: o pacote antigo só é trocado quando o novo está completo.
+    Retorna a lista de (caminho, tamanho) incluídos.
+    """
+    entries = []
+    for path in dict.fromkeys(normalize(p) for p in paths):
+        if os.path.isfile(path):
+            entries.append((path, os.path.getsize(path)))
+        else:
+            print(f"Aviso: {path} não existe, ficou fora do pacote")
+
+    index_size = HEADER.size + sum(
+        ENTRY.size + len(path.encode('utf-8')) for path, _ in entries)
+    offset = align(index_size)
+    index = [HEADER.pack(PACK_MAGIC, PACK_VERSION, len(entries))]
+    offsets = []
+    for path, size in entries:
+        name = path.encode('utf-8')
+        index.append(ENTRY.pack(offset, size, len(name)) + name)
+        offsets.append(offset)
+        offset = align(offset + size)
+
+    tmp_path = output + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(b''.join(index))
+        for (path, size), start in zip(entries, offsets):
+            f.write(b'\0' * (start - f.tell()))
+            with open(path, 'rb') as source:
+                data = source.read()
+            if len(data) != size:
+                raise AssetPackError(f"{path} mudou durante a gravação do pacote")
+            f.write(data)
+    os.replace(tmp_path, output)
+    return entries
+
+
+def align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class AssetFile:
+    """
+    Arquivo somente leitura sobre um trecho do pacote mapeado. É o que o
+    pygame recebe no lugar do caminho (Sound, Font e music.load aceitam
+    objetos de arquivo).
+    """
+
+    def __init__(self, view, name):
+        self.view = view
+        self.name = name
+        self.position = 0
+
+    def read(self, size=-1):
+        start = self.position
+        end = len(self.view) if size is None or size < 0 else min(
+            len(self.view), start + size)
+        self.position = max(start, end)
+        return self.view[start:end].tobytes()
+
+    def readinto(self, buffer):
+        buffer = memoryview(buffer).cast('B')
+        start = min(self.position, len(self.view))
+        end = min(len(self.view), start + len(buffer))
+        buffer[:end - start] = self.view[start:end]
+        self.position = max(self.position, end)
+        return end - start
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += len(self.view)
+        if offset < 0:
+            raise ValueError("posição negativa")
+        self.position = offset
+        return offset
+
+    def tell(self):
+        return self.position
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def writable(self):
+        return False
+
+    def close(self):
+        # O mapeamento pertence ao pacote, que continua aberto
+        pass
+
+
+class AssetPack:
+    def __init__(self, path=PACK_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        try:
+            self.entries = self.read_index()
+        except AssetPackError:
+            self.close()
+            raise
+
+    def read_index(self):
+        if len(self.map) < HEADER.size:
+            raise AssetPackError(f"{self.path}: arquivo curto demais")
+        magic, version, count = HEADER.unpack_from(self.map, 0)
+        if magic != PACK_MAGIC:
+            raise AssetPackError(f"{self.path}: não é um pacote de arquivos")
+        if version != PACK_VERSION:
+            raise AssetPackError(f"{self.path}: versão {version} não suportada")
+
+        entries = {}
+        pos = HEADER.size
+        for _ in range(count):
+            if pos + ENTRY.size > len(self.map):
+                raise AssetPackError(f"{self.path}: índice truncado")
+            offset, size, name_size = ENTRY.unpack_from(self.map, pos)
+            pos += ENTRY.size
+            if pos + name_size > len(self.map):
+                raise AssetPackError(f"{self.path}: índice truncado")
+            try:
+                name = self.map[pos:pos + name_size].decode('utf-8')
+            except UnicodeDecodeError:
+                raise AssetPackError(f"{self.path}: caminho inválido no índice") from None
+            pos += name_size
+            if offset + size > len(self.map):
+                raise AssetPackError(f"{self.path}: {name} passa do fim do pacote")
+            entries[name] = (offset, size)
+        return entries
+
+    def __contains__(self, path):
+        return normalize(path) in self.entries
+
+    def data(self, path):
+        """memoryview do conteúdo do arquivo (sem cópia)."""
+        offset, size = self.entries[normalize(path)]
+        return self.view[offset:offset + size]
+
+    def open(self, path):
+        return AssetFile(self.data(path), normalize(path))
+
+    def close(self):
+        self.entries = {}
+        self.view.release()
+        self.map.close()
+
+
+# Pacote em uso pelo jogo (None = arquivos soltos em assets/)
+active_pack = None
+
+
+def open_pack(path=PACK_PATH):
+    """Passa a carregar os arquivos do pacote, se ele existir."""
+    global active_pack
+    if not os.path.exists(path):
+        return None
+    # ValueError: o mmap não aceita um arquivo vazio
+    try:
+        active_pack = AssetPack(path)
+    except (OSError, ValueError, AssetPackError) as e:
+        print(f"Erro ao abrir o pacote {path}: {e}. Usando os arquivos soltos.")
+        active_pack = None
+    return active_pack
+
+
+def asset_exists(path):
+    if active_pack is not None and path in active_pack:
+        return True
+    return os.path.exists(path)
+
+
+def open_asset(path):
+    """
+    O que passar ao pygame para carregar `path`: um AssetFile do pacote,
+    ou o próprio caminho se o arquivo não estiver nele.
+    """
+    if active_pack is not None and path in active_pack:
+        return active_pack.open(path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Gera o pacote único com os arquivos usados pelo jogo.")
+    parser.add_argument('-o', '--output', default=PACK_PATH)
+    parser.add_argument('--list', action='store_true',
+                        help="mostra o conteúdo de um pacote já gerado")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        pack = AssetPack(args.output)
+        for path, (offset, size) in pack.entries.items():
+            print(f"{offset:>10} {size:>10}  {path}")
+        pack.close()
+        return 0
+
+    entries = build_pack(referenced_assets(), args.output)
+    total = sum(size for _, size in entries)
+    print(f"{len(entries)} arquivos, {total / 1024:,.0f} KiB em {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
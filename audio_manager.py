@@ -1,11 +1,104 @@
 import pygame
 import os
+import threading
+import time
+from collections import Counter
+
+from asset_pack import asset_exists, open_asset
+
+# Canais reservados para cada categoria de efeito. Cada categoria só toca
+# nos seus canais, então muitos 'move' seguidos nunca ocupam a voz de um
+# 'clear' ou 'rocket'. Dentro da categoria, cada som ocupa no máximo uma
+# voz: tocá-lo de novo enquanto ele ainda soa recomeça a mesma voz. Assim
+# 'move' e 'rotate' têm sempre um canal cada, e um 'clear' nunca expulsa
+# outro 'clear'.
+CHANNEL_GROUPS = {
+    'movement': 2,  # move, rotate
+    'impact': 2,    # drop
+    'event': 3,     # clear, rocket, send, level_up, game_over, pause
+}
+
+SOUND_CATEGORIES = {
+    'move': 'movement',
+    'rotate': 'movement',
+    'drop': 'impact',
+    'clear': 'event',
+    'rocket': 'event',
+    'level_up': 'event',
+    'game_over': 'event',
+    'pause': 'event',
+    'send': 'event',
+}
+DEFAULT_CATEGORY = 'event'
+
+# Com todos os canais da categoria ocupados, o som novo rouba a voz de
+# menor prioridade (a mais antiga, em caso de empate) se ela não for mais
+# importante que ele; senão, o som novo é descartado.
+SOUND_PRIORITIES = {
+    'game_over': 100,
+    'rocket': 90,
+    'clear': 80,
+    'send': 75,
+    'level_up': 70,
+    'pause': 60,
+    'drop': 30,
+    'rotate': 20,
+    'move': 10,
+}
+DEFAULT_PRIORITY = 50
+
+# Intervalo mínimo (ms) entre dois disparos do mesmo som. Segurar uma seta
+# gera um 'move' a cada passo da repetição automática (ARR); com o limite
+# eles viram no máximo um a cada MIN_RETRIGGER_MS.
+MIN_RETRIGGER_MS = {
+    'move': 50,
+    'rotate': 40,
+    'drop': 30,
+}
+
 
 class AudioManager:
     def __init__(self):
         pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+
+        # Canais 0..N-1 reservados para os grupos; Sound.play() sem canal
+        # (se alguém usar) fica com os que sobrarem
+        reserved = sum(CHANNEL_GROUPS.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved + 1))
+        pygame.mixer.set_reserved(reserved)
+        self.channel_groups = {}
+        first = 0
+        for category, count in CHANNEL_GROUPS.items():
+            self.channel_groups[category] = [
+                pygame.mixer.Channel(i) for i in range(first, first + count)]
+            first += count
+        # Canal -> (som, prioridade, instante em que começou)
+        self.voices = {}
+        self.last_played = {}
+        # Contadores por som: pedidos (toda chamada de play_sound), pedidos
+        # de um som não carregado, limitados pelo intervalo mínimo, tocados
+        # (dos quais recomeçaram a própria voz), descartados sem canal livre
+        # e vozes roubadas por outro som
+        self.voice_stats = {
+            'requested': Counter(),
+            'not_loaded': Counter(),
+            'rate_limited': Counter(),
+            'played': Counter(),
+            'retriggered': Counter(),
+            'dropped': Counter(),
+            'stolen': Counter(),
+        }
+
         self.sounds = {}
         self.music_tracks = {}
+        # Nomes ainda sendo carregados em segundo plano (load_in_background)
+        # e a música pedida antes de o caminho dela estar registrado
+        self.pending_sounds = set()
+        self.pending_music = set()
+        self.deferred_music = None
+        self.music_lock = threading.Lock()
+        # (nome, ms) de cada arquivo carregado, na ordem em que terminaram
+        self.load_times = []
         self.music_volume = 0.2  # ALTERADO AQUI: Volume inicial da música para 20%
         self.effects_volume = 0.7
         self.current_track = None
@@ -13,38 +106,149 @@ class AudioManager:
     
     def load_sound(self, name, path):
         """Carrega um efeito sonoro verificando se o arquivo existe"""
+        start = time.perf_counter()
         try:
-            if os.path.exists(path):
-                self.sounds[name] = pygame.mixer.Sound(path)
-                self.sounds[name].set_volume(self.effects_volume)
+            if asset_exists(path):
+                sound = pygame.mixer.Sound(open_asset(path))
+                sound.set_volume(self.effects_volume)
+                self.sounds[name] = sound
             else:
                 print(f"Warning: Sound file not found at {path}")
         except Exception as e:
             print(f"Error loading sound {name}: {str(e)}")
+        finally:
+            self.pending_sounds.discard(name)
+        self.load_times.append((name, (time.perf_counter() - start) * 1000))
+
+    def load_in_background(self, music=(), sounds=(), on_done=None):
+        """
+        Registra as músicas e carrega os efeitos em uma thread, para que o
+        menu apareça sem esperar pelos arquivos. `music` e `sounds` são
+        listas de (nome, caminho). Enquanto um efeito não carrega, tocá-lo
+        não faz nada. `on_done` é chamado (na thread) ao terminar.
+        """
+        music = list(music)
+        sounds = list(sounds)
+        self.pending_music.update(name for name, _ in music)
+        self.pending_sounds.update(name for name, _ in sounds)
+        loader = threading.Thread(
+            target=self.load_assets, args=(music, sounds, on_done),
+            name='asset-loader', daemon=True)
+        loader.start()
+        return loader
+
+    def load_assets(self, music, sounds, on_done=None):
+        with self.music_lock:
+            for name, path in music:
+                self.add_music(name, path)
+            deferred, self.deferred_music = self.deferred_music, None
+        if deferred is not None:
+            self.play_music(*deferred)
+        for name, path in sounds:
+            self.load_sound(name, path)
+        if on_done is not None:
+            on_done()
     
     def play_sound(self, name):
-        """Toca um efeito sonoro se existir"""
-        if name in self.sounds:
-            try:
-                self.sounds[name].play()
-            except Exception as e:
-                print(f"Error playing sound {name}: {str(e)}")
+        """Toca um efeito sonoro se existir, em um canal da sua categoria"""
+        stats = self.voice_stats
+        stats['requested'][name] += 1
+        if name not in self.sounds:
+            stats['not_loaded'][name] += 1
+            if name not in self.pending_sounds:
+                print(f"Warning: Sound {name} not loaded")
+            return
+
+        now = time.monotonic()
+        interval = MIN_RETRIGGER_MS.get(name, 0) / 1000
+        last = self.last_played.get(name)
+        if last is not None and now - last < interval:
+            stats['rate_limited'][name] += 1
+            return
+
+        channel = self.playing_channel(name)
+        if channel is not None:
+            stats['retriggered'][name] += 1
         else:
-            print(f"Warning: Sound {name} not loaded")
+            channel = self.find_channel(name)
+            if channel is None:
+                stats['dropped'][name] += 1
+                return
+
+        try:
+            channel.play(self.sounds[name])
+        except Exception as e:
+            print(f"Error playing sound {name}: {str(e)}")
+            return
+        self.voices[channel] = (name, SOUND_PRIORITIES.get(name, DEFAULT_PRIORITY), now)
+        self.last_played[name] = now
+        stats['played'][name] += 1
+
+    def playing_channel(self, name):
+        """Canal em que o som ainda está tocando, se houver"""
+        for channel in self.channel_groups[SOUND_CATEGORIES.get(name, DEFAULT_CATEGORY)]:
+            voice = self.voices.get(channel)
+            if voice is not None and voice[0] == name and channel.get_busy():
+                return channel
+        return None
+
+    def find_channel(self, name):
+        """Canal livre da categoria do som, ou a voz que ele pode roubar"""
+        channels = self.channel_groups[SOUND_CATEGORIES.get(name, DEFAULT_CATEGORY)]
+        for channel in channels:
+            if not channel.get_busy():
+                return channel
+
+        priority = SOUND_PRIORITIES.get(name, DEFAULT_PRIORITY)
+        victim = None
+        victim_key = None
+        for channel in channels:
+            _, voice_priority, started = self.voices.get(channel, (None, 0, 0.0))
+            key = (voice_priority, started)
+            if victim_key is None or key < victim_key:
+                victim, victim_key = channel, key
+        if victim_key[0] > priority:
+            return None
+        stolen_name = self.voices.get(victim, (None,))[0]
+        if stolen_name is not None:
+            self.voice_stats['stolen'][stolen_name] += 1
+        victim.stop()
+        return victim
+
+    def voice_report(self):
+        """
+        Resumo dos contadores de vozes, por som. Todos os sons conhecidos
+        aparecem: 'requested' 0 é um som que nunca foi pedido, diferente de
+        um pedido e descartado ('dropped') ou não carregado ('not_loaded').
+        """
+        names = sorted(set(SOUND_CATEGORIES).union(self.sounds, *self.voice_stats.values()))
+        return {name: {kind: counts[name] for kind, counts in self.voice_stats.items()}
+                for name in names}
     
     def add_music(self, name, path):
         """Adiciona uma trilha sonora verificando se o arquivo existe"""
-        if os.path.exists(path):
+        start = time.perf_counter()
+        if asset_exists(path):
             self.music_tracks[name] = path
         else:
             print(f"Warning: Music file not found at {path}")
+        self.pending_music.discard(name)
+        self.load_times.append((name, (time.perf_counter() - start) * 1000))
     
     def play_music(self, track_name, loops=-1, fade_ms=0):
         """Toca uma música específica com opção de fade in"""
+        with self.music_lock:
+            if track_name not in self.music_tracks and track_name in self.pending_music:
+                # Ainda sendo registrada: começa assim que o caminho estiver pronto
+                self.deferred_music = (track_name, loops, fade_ms)
+                return
         if track_name in self.music_tracks:
             if track_name != self.current_track or not pygame.mixer.music.get_busy():
                 try:
-                    pygame.mixer.music.load(self.music_tracks[track_name])
+                    path = self.music_tracks[track_name]
+                    # Vindo do pacote, o pygame precisa da extensão para saber o formato
+                    pygame.mixer.music.load(open_asset(path),
+                                            os.path.splitext(path)[1].lstrip('.'))
                     pygame.mixer.music.set_volume(self.music_volume) # Define o volume da música ao tocar
                     pygame.mixer.music.play(loops=loops, fade_ms=fade_ms)
                     self.current_track = track_name
@@ -56,6 +260,7 @@ class AudioManager:
     
     def stop_music(self, fade_ms=0):
         """Para a música atual com opção de fade out"""
+        self.deferred_music = None
         try:
             pygame.mixer.music.fadeout(fade_ms)
             self.current_track = None
@@ -83,7 +288,7 @@ class AudioManager:
     def set_effects_volume(self, volume):
         """Ajusta o volume dos efeitos com validação"""
         self.effects_volume = max(0.0, min(1.0, float(volume)))
-        for sound in self.sounds.values():
+        for sound in list(self.sounds.values()):
             sound.set_volume(self.effects_volume)
     
     def toggle_music_pause(self):
@@ -0,0 +1,226 @@
+import sys
+import time
+
+import numpy as np
+
+from board import COLUMNS, ROWS
+from engine import SHAPE_ROTATIONS, WALL_KICKS, LINE_SCORES
+
+# Simulação em lote de N tabuleiros independentes com NumPy (requer numpy).
+#
+# Cada passo do lote é uma jogada por tabuleiro: a peça atual nasce em
+# (5, 0), recebe `rotations` giros (com os mesmos WALL_KICKS do jogo), anda
+# até a coluna `xs` parando em paredes e blocos, e é largada (HARD_DROP).
+# É exatamente o que Engine faz com as ações
+# [ROTATE] * r + [LEFT ou RIGHT] * n + [HARD_DROP] aplicadas de uma vez.
+#
+# Representação: cada linha é um inteiro com as 10 colunas nos bits
+# WALL..WALL+9 e as paredes já marcadas nos bits de fora. Acima do tabuleiro
+# há TOP_PAD linhas vazias (a peça pode ficar acima do topo) e abaixo
+# BOTTOM_PAD linhas cheias (o chão), então paredes, chão e blocos viram um
+# único AND.
+
+WALL = 3
+TOP_PAD = 12
+BOTTOM_PAD = 4
+HEIGHT = TOP_PAD + ROWS + BOTTOM_PAD
+
+FULL_ROW = (1 << (COLUMNS + 2 * WALL)) - 1
+EMPTY_ROW = FULL_ROW & ~(((1 << COLUMNS) - 1) << WALL)
+
+SPAWN_X = 5
+SPAWN_Y = 0
+
+SCORE_TABLE = np.array([0] + [LINE_SCORES[n] for n in range(1, 5)], dtype=np.int64)
+
+
+def compile_tables():
+    """Converte SHAPE_ROTATIONS em arrays (forma, rotação 0..3, linha 0..3)."""
+    shapes_count = len(SHAPE_ROTATIONS)
+    counts = np.array([len(r) for r in SHAPE_ROTATIONS], dtype=np.int64)
+    dys = np.zeros((shapes_count, 4, 4), dtype=np.int64)
+    masks = np.zeros((shapes_count, 4, 4), dtype=np.int64)
+    min_dx = np.zeros((shapes_count, 4), dtype=np.int64)
+    for s, rotations in enumerate(SHAPE_ROTATIONS):
+        for r in range(4):
+            rot = rotations[r % len(rotations)]
+            min_dx[s, r] = rot.min_dx
+            for k, (dy, bits) in enumerate(rot.row_masks):
+                dys[s, r, k] = dy
+                masks[s, r, k] = bits
+    return counts, dys, masks, min_dx
+
+
+ROT_COUNTS, ROW_DY, ROW_MASK, MIN_DX = compile_tables()
+
+
+class BatchSim:
+    """
+    N partidas avançando juntas, uma peça por passo.
+
+    `boards` tem forma (N, HEIGHT); `score`, `lines`, `pieces` e `alive`
+    têm forma (N,). Tabuleiros que perderam param de mudar.
+    """
+
+    def __init__(self, n, seed=None):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.boards = np.empty((n, HEIGHT), dtype=np.int64)
+        self.current = np.empty(n, dtype=np.int64)
+        self.next = np.empty(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lines = np.zeros(n, dtype=np.int64)
+        self.pieces = np.zeros(n, dtype=np.int64)
+        self.alive = np.ones(n, dtype=bool)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Recomeça os tabuleiros de `mask` (todos, se None)."""
+        if mask is None:
+            mask = np.ones(self.n, dtype=bool)
+        count = int(mask.sum())
+        if count == 0:
+            return
+        self.boards[mask, :TOP_PAD + ROWS] = EMPTY_ROW
+        self.boards[mask, TOP_PAD + ROWS:] = FULL_ROW
+        self.current[mask] = self.random_shapes(count)
+        self.next[mask] = self.random_shapes(count)
+        self.score[mask] = 0
+        self.lines[mask] = 0
+        self.pieces[mask] = 0
+        self.alive[mask] = True
+
+    def random_shapes(self, count):
+        return self.rng.integers(0, len(SHAPE_ROTATIONS), size=count)
+
+    def fits(self, idx, shape, rot, x, y):
+        """Teste de colisão vetorizado para os tabuleiros `idx`."""
+        boards = self.boards
+        shift = x + MIN_DX[shape, rot] + WALL
+        # Fora da faixa representável só pode ser colisão com a parede
+        ok = (shift >= 0) & (shift <= WALL + COLUMNS)
+        shift = np.clip(shift, 0, WALL + COLUMNS)
+        for k in range(4):
+            row = np.clip(y + ROW_DY[shape, rot, k] + TOP_PAD, 0, HEIGHT - 1)
+            ok &= (boards[idx, row] & (ROW_MASK[shape, rot, k] << shift)) == 0
+        return ok
+
+    def step(self, rotations, xs, next_shapes=None):
+        """
+        Joga uma peça em cada tabuleiro vivo. `rotations` e `xs` têm forma
+        (N,). `next_shapes` permite fixar a peça sorteada para a prévia.
+        Retorna o array de linhas removidas neste passo.
+        """
+        idx = np.nonzero(self.alive)[0]
+        cleared_all = np.zeros(self.n, dtype=np.int64)
+        if idx.size == 0:
+            return cleared_all
+
+        shape = self.current[idx]
+        rot = np.zeros(idx.size, dtype=np.int64)
+        x = np.full(idx.size, SPAWN_X, dtype=np.int64)
+        y = np.full(idx.size, SPAWN_Y, dtype=np.int64)
+
+        # Giros: mesma regra de Engine.rotate (primeiro kick que couber)
+        turns = np.asarray(rotations, dtype=np.int64)[idx]
+        for turn in range(int(turns.max(initial=0))):
+            active = turns > turn
+            new_rot = (rot + 1) % ROT_COUNTS[shape]
+            done = ~active
+            for dx, dy in WALL_KICKS:
+                ok = ~done & self.fits(idx, shape, new_rot, x + dx, y + dy)
+                x[ok] += dx
+                y[ok] += dy
+                rot[ok] = new_rot[ok]
+                done |= ok
+
+        # Deslocamento lateral até a coluna pedida (para ao bater)
+        target = np.asarray(xs, dtype=np.int64)[idx]
+        moving = target != x
+        while moving.any():
+            direction = np.sign(target - x)
+            ok = moving & self.fits(idx, shape, rot, x + direction, y)
+            x[ok] += direction[ok]
+            moving = ok & (target != x)
+
+        # Queda: mesma regra de Engine.hard_drop (desce enquanto couber e
+        # volta uma linha)
+        falling = self.fits(idx, shape, rot, x, y)
+        while falling.any():
+            y[falling] += 1
+            falling &= self.fits(idx, shape, rot, x, y)
+        y -= 1
+
+        self.lock(idx, shape, rot, x, y)
+        cleared = self.clear_rows(idx)
+        cleared_all[idx] = cleared
+        self.score[idx] += SCORE_TABLE[cleared]
+        self.lines[idx] += cleared
+        self.pieces[idx] += 1
+
+        self.current[idx] = self.next[idx]
+        if next_shapes is None:
+            self.next[idx] = self.random_shapes(idx.size)
+        else:
+            self.next[idx] = np.asarray(next_shapes, dtype=np.int64)[idx]
+        return cleared_all
+
+    def lock(self, idx, shape, rot, x, y):
+        """Grava as peças; blocos acima do topo encerram a partida."""
+        shift = x + MIN_DX[shape, rot] + WALL
+        for k in range(4):
+            mask = ROW_MASK[shape, rot, k] << shift
+            row = y + ROW_DY[shape, rot, k]
+            has_cells = mask != 0
+            above = has_cells & (row < 0)
+            self.alive[idx[above]] = False
+            write = has_cells & (row >= 0)
+            rows = row[write] + TOP_PAD
+            np.bitwise_or.at(self.boards, (idx[write], rows), mask[write])
+
+    def clear_rows(self, idx):
+        """
+        Remove linhas completas e compacta as restantes em uma única
+        reordenação estável por tabuleiro.
+        """
+        field = self.boards[idx, TOP_PAD:TOP_PAD + ROWS]
+        keep = field != FULL_ROW
+        cleared = ROWS - keep.sum(axis=1)
+        has_clear = cleared > 0
+        if has_clear.any():
+            sub = field[has_clear]
+            # Linhas removidas (False) vão para o topo, as mantidas seguem
+            # na mesma ordem
+            order = np.argsort(keep[has_clear], axis=1, kind='stable')
+            sub = np.take_along_axis(sub, order, axis=1)
+            top = np.arange(ROWS) < cleared[has_clear][:, None]
+            sub[top] = EMPTY_ROW
+            self.boards[idx[has_clear], TOP_PAD:TOP_PAD + ROWS] = sub
+        return cleared
+
+    def grid(self, i):
+        """Ocupação do tabuleiro `i` como lista de 20 listas de bool."""
+        rows = self.boards[i, TOP_PAD:TOP_PAD + ROWS]
+        return [[bool(int(row) >> (WALL + x) & 1) for x in range(COLUMNS)]
+                for row in rows]
+
+
+def benchmark(sizes=(1, 10, 100, 1000, 10000, 100000), steps=50, seed=0):
+    """Mede passos de tabuleiro por segundo com jogadas aleatórias."""
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in sizes:
+        sim = BatchSim(n, seed)
+        start = time.perf_counter()
+        for _ in range(steps):
+            sim.step(rng.integers(0, 4, size=n), rng.integers(0, COLUMNS, size=n))
+            sim.reset(~sim.alive)
+        elapsed = time.perf_counter() - start
+        results.append((n, n * steps / elapsed))
+    return results
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or (1, 10, 100, 1000, 10000, 100000)
+    for n, rate in benchmark(sizes):
+        print(f"N={n:>7}: {rate:>14,.0f} passos de tabuleiro/s")
@@ -0,0 +1,431 @@
+import os
+
+# Sem janela nem som: o pygame usa os drivers "dummy" do SDL. Precisa vir
+# antes do primeiro import do pygame (feito também por main.py).
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import pygame
+
+import engine
+from board import Board, COLUMNS, ROWS
+from engine import (Engine, Piece, shapes, create_grid, convert_shape_format,
+                    valid_space, clear_rows)
+from bot import Bot, play_game
+import main as game_ui
+
+# Benchmarks reprodutíveis dos caminhos mais usados do jogo, sem tela.
+#
+#  - micro: uma operação por vez (convert_shape_format, valid_space,
+#    clear_rows, create_grid, queda instantânea, desenho da tela);
+#  - macro: partidas inteiras com entradas roteirizadas por uma semente fixa.
+#
+# Cada benchmark é uma função `(vezes) -> segundos`, que prepara seus dados
+# fora da medição e cronometra apenas a operação. O número de vezes por
+# amostra é calibrado para que cada amostra dure ao menos `min_time`; são
+# colhidas `repeat` amostras, e os resultados (mediana, quartis, intervalo
+# de confiança da mediana) podem ser salvos em JSON e comparados depois:
+#
+#   python benchmarks.py --save baseline.json
+#   python benchmarks.py --compare baseline.json --threshold 0.05
+#   python benchmarks.py -k valid_space -k draw
+
+# Preparação em blocos para operações que alteram o tabuleiro (as cópias
+# não entram na medição)
+CHUNK = 1000
+
+# Partidas roteirizadas (sementes 1..SCRIPT_GAMES) por execução do macro
+# benchmark, e limite de passos de cada uma (caso ela não termine)
+SCRIPT_GAMES = 10
+MAX_SCRIPT_TICKS = 20000
+
+SCRIPT_ACTIONS = (engine.LEFT, engine.LEFT_RELEASE, engine.RIGHT,
+                  engine.RIGHT_RELEASE, engine.ROTATE, engine.DOWN,
+                  engine.DOWN_RELEASE, engine.HARD_DROP)
+
+
+def sample_board(seed=0, filled_rows=12):
+    """Tabuleiro parcialmente cheio, com ao menos um buraco por linha."""
+    rng = random.Random(seed)
+    board = Board()
+    positions = []
+    colors = []
+    for y in range(ROWS - filled_rows, ROWS):
+        hole = rng.randrange(COLUMNS)
+        for x in range(COLUMNS):
+            if x != hole and rng.random() < 0.8:
+                positions.append((x, y))
+                colors.append(rng.randint(1, len(shapes)))
+    for position, color in zip(positions, colors):
+        board.lock([position], color)
+    return board
+
+
+def full_rows_board(seed=0, full=4):
+    """sample_board com as `full` últimas linhas completas."""
+    board = sample_board(seed)
+    rng = random.Random(seed)
+    touched = []
+    for y in range(ROWS - full, ROWS):
+        for x in range(COLUMNS):
+            if not board.is_occupied(x, y):
+                board.lock([(x, y)], rng.randint(1, len(shapes)))
+        touched.append(y)
+    return board, touched
+
+
+def sample_pieces():
+    return [Piece(x, 2, shape) for shape in shapes for x in (2, 5, 7)]
+
+
+def bench_convert_shape_format(number):
+    pieces = sample_pieces()
+    count = len(pieces)
+    start = time.perf_counter()
+    for i in range(number):
+        convert_shape_format(pieces[i % count])
+    return time.perf_counter() - start
+
+
+def bench_valid_space(number):
+    board = sample_board()
+    pieces = sample_pieces()
+    count = len(pieces)
+    start = time.perf_counter()
+    for i in range(number):
+        piece = pieces[i % count]
+        valid_space(piece, board, y=i % ROWS)
+    return time.perf_counter() - start
+
+
+def bench_clear_rows(number):
+    template, touched = full_rows_board()
+    elapsed = 0.0
+    done = 0
+    while done < number:
+        boards = [template.copy() for _ in range(min(CHUNK, number - done))]
+        start = time.perf_counter()
+        for board in boards:
+            clear_rows(board, touched)
+        elapsed += time.perf_counter() - start
+        done += len(boards)
+    return elapsed
+
+
+def bench_create_grid(number):
+    board = sample_board()
+    start = time.perf_counter()
+    for _ in range(number):
+        create_grid(board)
+    return time.perf_counter() - start
+
+
+def bench_hard_drop(number):
+    """Engine.hard_drop completo: queda, trava, linhas e próxima peça."""
+    template = sample_board(filled_rows=8)
+    game = Engine(seed=0)
+    state = game.state
+    events = []
+    elapsed = 0.0
+    done = 0
+    while done < number:
+        count = min(CHUNK, number - done)
+        setups = [(template.copy(), Piece(3 + i % 4, 0, shapes[i % len(shapes)]))
+                  for i in range(count)]
+        start = time.perf_counter()
+        for board, piece in setups:
+            state.board = board
+            state.current_piece = piece
+            game.hard_drop(events)
+        elapsed += time.perf_counter() - start
+        events.clear()
+        done += count
+    return elapsed
+
+
+def draw_inputs():
+    """Grade com o tabuleiro de exemplo e uma peça caindo, e a próxima peça."""
+    grid = create_grid(sample_board())
+    piece = Piece(5, 2, shapes[6])
+    for x, y in convert_shape_format(piece):
+        grid[y][x] = piece.color
+    return grid, Piece(5, 0, shapes[2])
+
+
+def bench_draw_window(number):
+    surface = pygame.display.get_surface()
+    grid, next_piece = draw_inputs()
+    start = time.perf_counter()
+    for i in range(number):
+        game_ui.draw_window(surface, grid, 1000 + i % 7, 50000)
+    return time.perf_counter() - start
+
+
+def bench_draw_next_shape(number):
+    surface = pygame.display.get_surface()
+    _, next_piece = draw_inputs()
+    start = time.perf_counter()
+    for _ in range(number):
+        game_ui.draw_next_shape(next_piece, surface)
+    return time.perf_counter() - start
+
+
+def bench_renderer_draw(number):
+    """PlayfieldRenderer.draw e draw_next com uma célula e a pontuação mudando."""
+    surface = pygame.display.get_surface()
+    renderer = game_ui.PlayfieldRenderer(surface)
+    grid, next_piece = draw_inputs()
+    grids = [grid, [row[:] for row in grid]]
+    grids[1][0][0] = (255, 0, 0)
+    start = time.perf_counter()
+    for i in range(number):
+        renderer.draw(grids[i % 2], 1000 + i % 7, 50000)
+        renderer.draw_next(next_piece)
+    return time.perf_counter() - start
+
+
+def scripted_inputs(seed):
+    """Roteiro de ações por passo, sorteado com uma semente fixa."""
+    rng = random.Random(seed)
+    script = []
+    for _ in range(MAX_SCRIPT_TICKS):
+        if rng.random() < 0.25:
+            script.append((rng.choice(SCRIPT_ACTIONS),))
+        else:
+            script.append(())
+    return script
+
+
+def bench_scripted_games(number):
+    """SCRIPT_GAMES partidas inteiras do Engine com entradas roteirizadas."""
+    scripts = [(seed, scripted_inputs(seed)) for seed in range(1, SCRIPT_GAMES + 1)]
+    elapsed = 0.0
+    for _ in range(number):
+        for seed, script in scripts:
+            game = Engine(seed)
+            state = game.state
+            start = time.perf_counter()
+            for actions in script:
+                game.step(actions)
+                if state.lost:
+                    break
+            elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def bench_bot_game(number):
+    """Partida do bot (sem antecipar a próxima peça), limitada a 100 peças."""
+    start = time.perf_counter()
+    for _ in range(number):
+        play_game(Bot(lookahead=False), seed=1, max_pieces=100)
+    return time.perf_counter() - start
+
+
+# (nome, tipo, função)
+BENCHMARKS = [
+    ('convert_shape_format', 'micro', bench_convert_shape_format),
+    ('valid_space', 'micro', bench_valid_space),
+    ('clear_rows', 'micro', bench_clear_rows),
+    ('create_grid', 'micro', bench_create_grid),
+    ('hard_drop', 'micro', bench_hard_drop),
+    ('draw_window', 'micro', bench_draw_window),
+    ('draw_next_shape', 'micro', bench_draw_next_shape),
+    ('renderer_draw', 'micro', bench_renderer_draw),
+    ('scripted_games', 'macro', bench_scripted_games),
+    ('bot_game', 'macro', bench_bot_game),
+]
+
+
+def calibrate(func, min_time):
+    """Menor número de vezes (1, 2, 5, 10, 20...) que leva `min_time`."""
+    number = 1
+    while True:
+        for factor in (1, 2, 5):
+            if func(number * factor) >= min_time:
+                return number * factor
+        number *= 10
+
+
+def median_ci(sorted_values):
+    """
+    Intervalo de confiança de ~95% da mediana pelas estatísticas de ordem
+    (não supõe distribuição normal dos tempos).
+    """
+    n = len(sorted_values)
+    half = 1.96 * n ** 0.5 / 2
+    low = max(0, int(n / 2 - half))
+    high = min(n - 1, int(n / 2 + half + 0.5))
+    return sorted_values[low], sorted_values[high]
+
+
+def measure(func, repeat, min_time=None):
+    """
+    Colhe `repeat` amostras de segundos por operação. Sem `min_time`, cada
+    amostra é uma única execução (partidas inteiras).
+    """
+    number = calibrate(func, min_time) if min_time else 1
+    func(number)  # aquecimento
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            samples.append(func(number) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    ordered = sorted(samples)
+    quartiles = statistics.quantiles(ordered, n=4) if len(ordered) > 1 else ordered * 3
+    ci_low, ci_high = median_ci(ordered)
+    return {
+        'number': number,
+        'repeat': repeat,
+        'median': statistics.median(ordered),
+        'mean': statistics.fmean(ordered),
+        'stdev': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        'min': ordered[0],
+        'max': ordered[-1],
+        'q1': quartiles[0],
+        'q3': quartiles[-1],
+        'ci_low': ci_low,
+        'ci_high': ci_high,
+        'samples': samples,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(selected, repeat, min_time, macro_repeat):
+    pygame.init()
+    pygame.display.set_mode((game_ui.s_width, game_ui.s_height))
+    results = {}
+    for name, kind, func in selected:
+        if kind == 'macro':
+            stats = measure(func, macro_repeat)
+        else:
+            stats = measure(func, repeat, min_time)
+        stats['kind'] = kind
+        results[name] = stats
+        print(f"{name:<22}{kind:<7}{format_time(stats['median']):>12}"
+              f"  ±{format_time((stats['ci_high'] - stats['ci_low']) / 2):>10}"
+              f"  (IQR {format_time(stats['q3'] - stats['q1'])}, "
+              f"{stats['repeat']}x{stats['number']})")
+        sys.stdout.flush()
+    pygame.quit()
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'min_time': min_time,
+        'results': results,
+    }
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def compare(baseline, current, threshold):
+    """
+    Compara as medianas. Só é regressão (ou melhora) se a diferença passar
+    de `threshold` e os intervalos de confiança das duas medianas não se
+    sobrepuserem, para que ruído não seja reportado como mudança.
+    Retorna a lista de benchmarks que pioraram.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<22}{'antes':>12}{'agora':>12}{'mudança':>10}")
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f"{name:<22}{'-':>12}{format_time(now['median']):>12}     (novo)")
+            continue
+        change = now['median'] / before['median'] - 1
+        verdict = ''
+        if change > threshold and now['ci_low'] > before['ci_high']:
+            verdict = 'REGRESSÃO'
+            regressions.append(name)
+        elif change < -threshold and now['ci_high'] < before['ci_low']:
+            verdict = 'melhora'
+        print(f"{name:<22}{format_time(before['median']):>12}"
+              f"{format_time(now['median']):>12}{change:>+10.1%}  {verdict}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmarks do jogo sem tela (micro e partidas inteiras).")
+    parser.add_argument('-k', dest='filters', action='append', default=[],
+                        help="roda só os benchmarks cujo nome contém o texto")
+    parser.add_argument('--micro', action='store_true', help="só os micro")
+    parser.add_argument('--macro', action='store_true', help="só as partidas")
+    parser.add_argument('-r', '--repeat', type=int, default=15,
+                        help="amostras por micro benchmark")
+    parser.add_argument('--macro-repeat', type=int, default=7,
+                        help="amostras (partidas) por macro benchmark")
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help="duração mínima (s) de cada amostra micro")
+    parser.add_argument('--save', metavar='ARQUIVO',
+                        help="salva os resultados em JSON")
+    parser.add_argument('--compare', metavar='ARQUIVO',
+                        help="compara com resultados salvos antes")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="piora relativa da mediana considerada regressão")
+    args = parser.parse_args(argv)
+
+    selected = [(name, kind, func) for name, kind, func in BENCHMARKS
+                if (not args.filters or any(f in name for f in args.filters))
+                and not (args.micro and kind != 'micro')
+                and not (args.macro and kind != 'macro')]
+    if not selected:
+        print("Nenhum benchmark selecionado.")
+        return 2
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+
+    current = run(selected, args.repeat, args.min_time, args.macro_repeat)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nResultados salvos em {args.save}")
+
+    if baseline is not None:
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressão(ões) acima de "
+                  f"{args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
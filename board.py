@@ -0,0 +1,184 @@
+# Tabuleiro compacto: um inteiro (máscara de bits) por linha para saber
+# quais células estão ocupadas, e um bytearray por linha com o índice da
+# cor de cada célula. O bit `x` da linha `y` corresponde à coluna `x`.
+# Cada linha também guarda quantas células estão preenchidas, atualizado
+# ao travar uma peça, para que só as linhas tocadas precisem ser checadas.
+# E cada coluna guarda a linha do seu bloco mais alto (`tops`, igual à
+# altura do tabuleiro se a coluna estiver vazia), usada para calcular a
+# queda de uma peça sem testar linha por linha.
+
+COLUMNS = 10
+ROWS = 20
+
+FULL_MASK = (1 << COLUMNS) - 1
+
+EMPTY = 0  # índice de cor de uma célula vazia
+
+
+class Board:
+    def __init__(self, columns=COLUMNS, rows=ROWS):
+        self.columns = columns
+        self.height = rows
+        self.full_mask = (1 << columns) - 1
+        self.rows = [0] * rows
+        self.colors = [bytearray(columns) for _ in range(rows)]
+        self.fill = [0] * rows
+        self.tops = [rows] * columns
+        # Alguma peça travou acima da área visível?
+        self.overflow = False
+
+    def clear(self):
+        """Esvazia o tabuleiro sem realocar as linhas."""
+        for y in range(self.height):
+            self.rows[y] = 0
+            self.colors[y][:] = bytes(self.columns)
+            self.fill[y] = 0
+        self.tops = [self.height] * self.columns
+        self.overflow = False
+
+    def copy(self):
+        """Cópia independente do tabuleiro (usada para simular jogadas)."""
+        board = Board.__new__(Board)
+        board.columns = self.columns
+        board.height = self.height
+        board.full_mask = self.full_mask
+        board.rows = self.rows[:]
+        board.colors = [bytearray(row) for row in self.colors]
+        board.fill = self.fill[:]
+        board.tops = self.tops[:]
+        board.overflow = self.overflow
+        return board
+
+    def is_occupied(self, x, y):
+        return (self.rows[y] >> x) & 1 == 1
+
+    def color_at(self, x, y):
+        """Índice de cor da célula (0 se vazia)."""
+        return self.colors[y][x]
+
+    def collides(self, positions):
+        """
+        Verifica se alguma das posições sai das paredes/chão ou colide com
+        um bloco travado. Células acima do topo (y < 0) só são checadas
+        contra as paredes.
+        """
+        rows = self.rows
+        height = self.height
+        columns = self.columns
+        for x, y in positions:
+            if not (0 <= x < columns) or y >= height:
+                return True
+            if y >= 0 and rows[y] & (1 << x):
+                return True
+        return False
+
+    def lock(self, positions, color):
+        """
+        Grava as células de uma peça no tabuleiro, no lugar. Retorna as
+        linhas tocadas pela peça, para passar a clear_full_rows.
+        """
+        rows = self.rows
+        colors = self.colors
+        fill = self.fill
+        tops = self.tops
+        touched = []
+        for x, y in positions:
+            if y < 0:
+                self.overflow = True
+                continue
+            bit = 1 << x
+            if not rows[y] & bit:
+                rows[y] |= bit
+                fill[y] += 1
+            colors[y][x] = color
+            if y < tops[x]:
+                tops[x] = y
+            if y not in touched:
+                touched.append(y)
+        return touched
+
+    def clear_full_rows(self, candidates=None):
+        """
+        Remove as linhas completas, desce as de cima e retorna quantas saíram.
+        `candidates` limita a busca às linhas informadas (as tocadas pela
+        última peça); sem ele, todas as linhas são checadas.
+        """
+        columns = self.columns
+        fill = self.fill
+        if candidates is None:
+            candidates = range(self.height)
+        full = [y for y in candidates if fill[y] == columns]
+        if not full:
+            return 0
+
+        # Só as linhas acima da última linha removida mudam de lugar: elas
+        # são reindexadas em uma única passada, e as linhas removidas voltam
+        # vazias no topo.
+        bottom = max(full)
+        rows = self.rows
+        colors = self.colors
+        new_rows = [0] * len(full)
+        new_colors = []
+        new_fill = [0] * len(full)
+        for y in full:
+            colors[y][:] = bytes(columns)
+            new_colors.append(colors[y])
+        for y in range(bottom + 1):
+            if fill[y] != columns:
+                new_rows.append(rows[y])
+                new_colors.append(colors[y])
+                new_fill.append(fill[y])
+        rows[:bottom + 1] = new_rows
+        colors[:bottom + 1] = new_colors
+        fill[:bottom + 1] = new_fill
+        self.update_tops()
+        return len(full)
+
+    def add_garbage(self, count, hole, color):
+        """
+        Empurra o tabuleiro `count` linhas para cima e preenche o fundo com
+        linhas de lixo (todas as células menos a coluna `hole`). Blocos
+        empurrados para fora do topo marcam `overflow`.
+        """
+        count = min(count, self.height)
+        if count <= 0:
+            return
+        columns = self.columns
+        if any(self.rows[:count]):
+            self.overflow = True
+        mask = self.full_mask & ~(1 << hole)
+        row_colors = bytes(color if x != hole else EMPTY for x in range(columns))
+        # As linhas que saem pelo topo são reaproveitadas como lixo
+        recycled = self.colors[:count]
+        for colors in recycled:
+            colors[:] = row_colors
+        self.rows[:] = self.rows[count:] + [mask] * count
+        self.colors[:] = self.colors[count:] + recycled
+        self.fill[:] = self.fill[count:] + [columns - 1] * count
+        self.update_tops()
+
+    def update_tops(self):
+        """Recalcula o topo de cada coluna descendo até achar todas."""
+        tops = [self.height] * self.columns
+        remaining = self.full_mask
+        for y, mask in enumerate(self.rows):
+            new = mask & remaining
+            if new:
+                for x in range(self.columns):
+                    if new >> x & 1:
+                        tops[x] = y
+                remaining &= ~new
+                if not remaining:
+                    break
+        self.tops = tops
+
+    def cells(self):
+        """Gera (x, y, cor) para cada célula ocupada."""
+        for y in range(self.height):
+            mask = self.rows[y]
+            if not mask:
+                continue
+            row_colors = self.colors[y]
+            for x in range(self.columns):
+                if mask & (1 << x):
+                    yield x, y, row_colors[x]
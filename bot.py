@@ -0,0 +1,306 @@
+import json
+import sys
+import time
+from collections import deque, namedtuple
+
+import engine
+from engine import (SHAPE_ROTATIONS, WALL_KICKS, LEFT, LEFT_RELEASE, RIGHT,
+                    RIGHT_RELEASE, ROTATE, DOWN, DOWN_RELEASE, HARD_DROP,
+                    rotation_fits)
+
+# Jogador automático: para a peça atual (e a próxima, se `lookahead`),
+# enumera todas as posições finais alcançáveis com os mesmos movimentos do
+# jogo (deslocar, girar com WALL_KICKS, descer) e escolhe a melhor segundo
+# uma heurística configurável sobre o tabuleiro resultante.
+
+# Posição final de uma peça e as ações que a levam até lá a partir da
+# posição atual (sem o HARD_DROP final)
+Placement = namedtuple('Placement', 'x y rotation path')
+
+# Pesos padrão da heurística (valores conhecidos para Tetris 10x20)
+DEFAULT_WEIGHTS = {
+    'height': -0.510066,     # soma das alturas das colunas
+    'lines': 0.760666,       # linhas removidas pela jogada
+    'holes': -0.35663,       # células vazias com algum bloco acima
+    'bumpiness': -0.184483,  # soma das diferenças de altura entre colunas vizinhas
+    'wells': 0.0,            # profundidade somada dos poços (colunas mais baixas que as vizinhas)
+}
+FEATURES = tuple(DEFAULT_WEIGHTS)
+
+# Ação de cada movimento da busca, já com a tecla solta no mesmo passo para
+# que a repetição automática (DAS) e a queda suave não continuem sozinhas
+MOVE_ACTIONS = {
+    'left': (LEFT, LEFT_RELEASE),
+    'right': (RIGHT, RIGHT_RELEASE),
+    'rotate': (ROTATE,),
+    'down': (DOWN, DOWN_RELEASE),
+}
+
+
+def reachable_placements(board, shape_index, x, y, rotation):
+    """
+    Busca em largura sobre (x, y, rotação) a partir da posição dada.
+    Retorna uma Placement para cada posição em que a peça não pode mais
+    cair, com o caminho mais curto de movimentos até ela.
+    """
+    rotations = SHAPE_ROTATIONS[shape_index]
+    count = len(rotations)
+    start = (x, y, rotation % count)
+    parents = {start: None}
+    queue = deque([start])
+    finals = []
+
+    # Primeira linha com algum bloco. Acima dela a peça só esbarra nas
+    # paredes, então a descida pelo "ar livre" é feita de uma vez só.
+    top = 0
+    while top < board.height and not board.rows[top]:
+        top += 1
+
+    while queue:
+        node = queue.popleft()
+        nx, ny, nr = node
+        rot = rotations[nr]
+
+        neighbours = []
+        if rotation_fits(rot, board, nx - 1, ny):
+            neighbours.append(((nx - 1, ny, nr), 'left'))
+        if rotation_fits(rot, board, nx + 1, ny):
+            neighbours.append(((nx + 1, ny, nr), 'right'))
+        if rotation_fits(rot, board, nx, ny + 1):
+            free_y = top - 1 - rot.max_dy
+            drop = free_y - ny if free_y > ny + 1 else 1
+            neighbours.append(((nx, ny + drop, nr), ('down', drop)))
+        else:
+            finals.append(node)
+
+        if count > 1:
+            # Mesma regra de Engine.rotate: primeiro kick que couber
+            new_r = (nr + 1) % count
+            new_rot = rotations[new_r]
+            for dx, dy in WALL_KICKS:
+                if rotation_fits(new_rot, board, nx + dx, ny + dy):
+                    neighbours.append(((nx + dx, ny + dy, new_r), 'rotate'))
+                    break
+
+        for state, move in neighbours:
+            if state not in parents:
+                parents[state] = (node, move)
+                queue.append(state)
+
+    placements = []
+    for node in finals:
+        moves = []
+        step = parents[node]
+        while step is not None:
+            node_before, move = step
+            moves.append(move)
+            step = parents[node_before]
+        path = []
+        for move in reversed(moves):
+            if isinstance(move, tuple):
+                move, times = move
+                path.extend(MOVE_ACTIONS[move] * times)
+            else:
+                path.extend(MOVE_ACTIONS[move])
+        fx, fy, fr = node
+        placements.append(Placement(fx, fy, fr, path))
+    return placements
+
+
+def place_rows(rows, full_mask, rot, x, y):
+    """
+    Aplica uma peça às máscaras das linhas sem mexer no tabuleiro.
+    Retorna (novas linhas, linhas removidas), ou (None, 0) se a peça
+    ficar acima do topo (fim de jogo).
+    """
+    new_rows = rows[:]
+    left = x + rot.min_dx
+    full = []
+    for dy, bits in rot.row_masks:
+        row = y + dy
+        if row < 0:
+            return None, 0
+        new_rows[row] |= bits << left
+        if new_rows[row] == full_mask:
+            full.append(row)
+    # Só as linhas tocadas pela peça podem ter ficado completas
+    if full:
+        bottom = max(full)
+        new_rows[:bottom + 1] = [0] * len(full) + [
+            r for r in new_rows[:bottom + 1] if r != full_mask]
+    return new_rows, len(full)
+
+
+def board_features(rows, columns, cleared):
+    """Calcula as métricas da heurística a partir das máscaras das linhas."""
+    height = len(rows)
+    heights = [0] * columns
+    holes = 0
+    seen = 0
+    for y, row in enumerate(rows):
+        # Células vazias abaixo de algum bloco já visto são buracos
+        holes += bin(seen & ~row).count('1')
+        new = row & ~seen
+        if new:
+            for x in range(columns):
+                if new >> x & 1:
+                    heights[x] = height - y
+            seen |= row
+
+    bumpiness = 0
+    for x in range(columns - 1):
+        bumpiness += abs(heights[x] - heights[x + 1])
+
+    wells = 0
+    for x in range(columns):
+        left = heights[x - 1] if x > 0 else height
+        right = heights[x + 1] if x < columns - 1 else height
+        depth = min(left, right) - heights[x]
+        if depth > 0:
+            wells += depth
+
+    return {
+        'height': sum(heights),
+        'lines': cleared,
+        'holes': holes,
+        'bumpiness': bumpiness,
+        'wells': wells,
+    }
+
+
+def load_weights(path):
+    """
+    Lê pesos de um arquivo JSON: um dicionário {métrica: peso} ou um
+    checkpoint do tune_bot.py (usa os melhores pesos encontrados).
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if 'best' in data:
+        data = data['best']['weights']
+    return {name: float(data[name]) for name in FEATURES if name in data}
+
+
+class Bot:
+    def __init__(self, weights=None, lookahead=True):
+        self.weights = dict(DEFAULT_WEIGHTS)
+        if weights:
+            self.weights.update(weights)
+        self.lookahead = lookahead
+        # Posições finais avaliadas desde a criação (para medir a vazão)
+        self.positions = 0
+
+    def evaluate(self, rows, columns, cleared):
+        features = board_features(rows, columns, cleared)
+        return sum(self.weights[name] * features[name] for name in FEATURES)
+
+    def best_score(self, board, shape_index, x, y, rotation):
+        """Melhor nota entre todas as posições finais de uma peça."""
+        rotations = SHAPE_ROTATIONS[shape_index]
+        best = None
+        for placement in reachable_placements(board, shape_index, x, y, rotation):
+            self.positions += 1
+            rows, cleared = place_rows(
+                board.rows, board.full_mask, rotations[placement.rotation],
+                placement.x, placement.y)
+            if rows is None:
+                continue
+            score = self.evaluate(rows, board.columns, cleared)
+            if best is None or score > best:
+                best = score
+        return best
+
+    def choose(self, state):
+        """Escolhe a melhor Placement para a peça atual (None se não houver)."""
+        board = state.board
+        piece = state.current_piece
+        rotations = SHAPE_ROTATIONS[piece.index]
+        nxt = state.next_piece
+
+        best = None
+        best_score = None
+        for placement in reachable_placements(
+                board, piece.index, piece.x, piece.y, piece.rotation):
+            self.positions += 1
+            rot = rotations[placement.rotation]
+            rows, cleared = place_rows(
+                board.rows, board.full_mask, rot, placement.x, placement.y)
+            if rows is None:
+                continue
+
+            score = self.evaluate(rows, board.columns, cleared)
+            if self.lookahead:
+                after = board.copy()
+                after.rows = rows
+                next_score = self.best_score(
+                    after, nxt.index, nxt.x, nxt.y, nxt.rotation)
+                if next_score is None:
+                    continue
+                # As linhas desta jogada continuam valendo no total
+                score = next_score + self.weights['lines'] * cleared
+
+            if best_score is None or score > best_score:
+                best = placement
+                best_score = score
+
+        if best is None:
+            # Nenhuma jogada evita o fim de jogo: larga a peça onde está
+            return Placement(piece.x, piece.y, piece.rotation, [])
+        return best
+
+    def actions(self, state):
+        """Ações para levar a peça atual até a melhor posição e travá-la."""
+        return list(self.choose(state).path) + [HARD_DROP]
+
+
+class AutoPlayer:
+    """
+    Controla uma partida do Engine: a cada peça nova, calcula a jogada e a
+    entrega como ações. `delay_ticks` espera alguns passos antes de cada
+    jogada (útil para demonstrações na tela).
+    """
+
+    def __init__(self, bot=None, delay_ticks=0):
+        self.bot = bot if bot is not None else Bot()
+        self.delay_ticks = delay_ticks
+        self.piece_number = None
+        self.played_piece = None
+        self.wait = 0
+
+    def actions(self, state):
+        # Só uma jogada por peça; a próxima vem quando a peça travar
+        if state.lost or state.pieces == self.played_piece:
+            return []
+        if state.pieces != self.piece_number:
+            self.piece_number = state.pieces
+            self.wait = self.delay_ticks
+        if self.wait > 0:
+            self.wait -= 1
+            return []
+        self.played_piece = state.pieces
+        return self.bot.actions(state)
+
+
+def play_game(bot=None, seed=None, max_pieces=None):
+    """Joga uma partida inteira sem tela e retorna o Engine ao final."""
+    game = engine.Engine(seed)
+    player = AutoPlayer(bot)
+    state = game.state
+    while not state.lost:
+        if max_pieces is not None and state.pieces >= max_pieces:
+            break
+        game.step(player.actions(state))
+    return game
+
+
+if __name__ == "__main__":
+    # Mede a vazão: python bot.py [peças] [--no-lookahead]
+    pieces = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 200
+    bot = Bot(lookahead='--no-lookahead' not in sys.argv)
+    start = time.perf_counter()
+    game = play_game(bot, seed=1, max_pieces=pieces)
+    elapsed = time.perf_counter() - start
+    state = game.state
+    print(f"{state.pieces} peças, {state.lines} linhas, pontuação {state.score}"
+          f"{' (fim de jogo)' if state.lost else ''}")
+    print(f"{bot.positions / elapsed:,.0f} posições/s, "
+          f"{state.pieces / elapsed:,.1f} peças/s")
@@ -0,0 +1,474 @@
+import argparse
+import asyncio
+import os
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from board import COLUMNS, ROWS
+from bot import AutoPlayer, Bot
+from engine import (SHAPE_ROTATIONS, TICK_MS, Engine, Piece, garbage_color,
+                    shape_colors, shapes)
+from versus import encode, percentile, read_message
+
+# Transmissão de partidas ao vivo para telas de espectadores. O jogo chama
+# Broadcaster.publish uma vez por quadro com o estado atual; o estado vira
+# um delta (só as linhas que mudaram) e é repassado ao loop asyncio, que
+# roda em outra thread e entrega a cada espectador pela sua própria fila.
+#
+#   python main.py --broadcast 7800              # transmite a partida jogada
+#   python broadcast.py serve --port 7800        # transmite uma partida do bot
+#   python broadcast.py view 127.0.0.1:7800      # tela de espectador
+#   python broadcast.py load 127.0.0.1:7800 --viewers 300
+#
+# Cada espectador recebe um quadro-chave (o tabuleiro inteiro) ao conectar
+# e depois só deltas. O espectador confirma os quadros recebidos a cada
+# ACK_EVERY quadros, e o servidor não deixa mais de MAX_IN_FLIGHT quadros
+# sem confirmação a caminho dele; o resto espera na fila do espectador. A
+# fila tem limite: se ela encher (tela travada ou rede ruim), os quadros
+# intermediários são descartados e o próximo envio é um quadro-chave, que
+# já leva o estado mais recente. Assim um espectador lento só fica para
+# trás ele mesmo, sem segurar o jogo nem os outros. (Os quadros têm poucas
+# dezenas de bytes, então limitar só os buffers do socket deixaria
+# minutos de partida acumulados antes de algum descarte.)
+#
+# Mensagens (mesmo formato do versus.py: tamanho u16, tipo u8, dados):
+#   quadro-chave: SNAPSHOT + cor de todas as células (ROWS * COLUMNS bytes)
+#   delta:        SNAPSHOT + linhas alteradas (u32, bit y = linha y) + cor
+#                 das COLUMNS células de cada linha alterada
+#   confirmação:  quadros recebidos até agora (u32), do espectador
+# As cores são os índices do Board (0 = vazia).
+
+DEFAULT_PORT = 7800
+
+MSG_KEYFRAME = 1
+MSG_DELTA = 2
+MSG_ACK = 3
+
+# Passo (u32), peça atual (forma u8, rotação u8, x i8, y i8), próxima peça
+# (forma u8), pontuação (u32) e recorde (u32)
+SNAPSHOT = struct.Struct('<IBBbbBII')
+CHANGED_ROWS = struct.Struct('<I')
+ACK = struct.Struct('<I')
+
+# Quadros esperando na fila de um espectador antes de descartá-los
+MAX_QUEUED_FRAMES = 30
+# Quadros enviados e ainda não confirmados por um espectador
+MAX_IN_FLIGHT = 30
+ACK_EVERY = 8
+
+START_TIMEOUT = 5
+
+# Cor de cada índice de cor do Board
+CELL_COLORS = [(0, 0, 0)] + shape_colors + [garbage_color]
+
+
+class Viewer:
+    """Um espectador conectado: fila limitada de quadros e a entrega deles."""
+
+    def __init__(self, writer, max_queued=MAX_QUEUED_FRAMES):
+        self.writer = writer
+        self.max_queued = max_queued
+        self.frames = deque()
+        self.wakeup = asyncio.Event()
+        self.needs_keyframe = True
+        self.sent = 0
+        self.acked = 0
+        self.dropped = 0
+
+    def offer(self, delta, keyframe):
+        """Enfileira o quadro novo (mensagens já codificadas)."""
+        if self.needs_keyframe or len(self.frames) >= self.max_queued:
+            # O quadro-chave substitui tudo o que ainda não foi enviado
+            self.dropped += len(self.frames)
+            self.frames.clear()
+            self.frames.append(keyframe)
+            self.needs_keyframe = False
+        else:
+            self.frames.append(delta)
+        self.wakeup.set()
+
+    def ack(self, received):
+        self.acked = received
+        self.wakeup.set()
+
+    async def send_loop(self):
+        writer = self.writer
+        frames = self.frames
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            while frames:
+                count = min(len(frames), MAX_IN_FLIGHT - (self.sent - self.acked))
+                if count <= 0:
+                    break  # espera uma confirmação
+                writer.write(b''.join(frames.popleft() for _ in range(count)))
+                self.sent += count
+                await writer.drain()
+
+
+class Broadcaster:
+    """
+    Publica o estado de uma partida para os espectadores conectados.
+    `publish` é chamado pelo laço do jogo (em qualquer thread) e não espera
+    por nenhum espectador: só calcula o delta e o entrega ao loop asyncio.
+    """
+
+    def __init__(self, max_queued=MAX_QUEUED_FRAMES):
+        self.max_queued = max_queued
+        self.viewers = set()
+        self.loop = None
+        self.thread = None
+        self.server = None
+
+        # Usados só por publish (thread do jogo)
+        self.last_cells = None
+        self.last_snapshot = None
+        self.publish_times = deque(maxlen=1000)
+
+        # Usados só pelo loop asyncio
+        self.keyframe = None
+        self.frames = 0
+        self.dropped = 0
+
+    async def start(self, host='0.0.0.0', port=DEFAULT_PORT):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self.handle_viewer, host, port)
+        return self.server
+
+    def start_in_thread(self, host='0.0.0.0', port=DEFAULT_PORT):
+        """Roda o servidor em uma thread própria (para o jogo com pygame)."""
+        loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=loop.run_forever, name='broadcast', daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(
+            self.start(host, port), loop).result(START_TIMEOUT)
+
+    def stop(self):
+        if self.thread is None:
+            return
+        loop = self.loop
+        loop.call_soon_threadsafe(self.server.close)
+        loop.call_soon_threadsafe(loop.stop)
+        self.thread.join(START_TIMEOUT)
+        self.thread = None
+
+    def publish(self, state, high_score=0):
+        """Envia o estado atual da partida, se algo mudou desde o último."""
+        if self.loop is None:
+            return
+        start = time.perf_counter()
+        cells = b''.join(state.board.colors)
+        piece = state.current_piece
+        snapshot = SNAPSHOT.pack(
+            state.ticks, piece.index, piece.rotation % len(piece.rotations),
+            piece.x, piece.y, state.next_piece.index, state.score, high_score)
+        last = self.last_cells
+        if cells == last and snapshot[4:] == self.last_snapshot:
+            return
+
+        changed = 0
+        rows = []
+        for y in range(ROWS):
+            row = cells[y * COLUMNS:(y + 1) * COLUMNS]
+            if last is None or row != last[y * COLUMNS:(y + 1) * COLUMNS]:
+                changed |= 1 << y
+                rows.append(row)
+        self.last_cells = cells
+        self.last_snapshot = snapshot[4:]
+
+        delta = encode(MSG_DELTA, snapshot + CHANGED_ROWS.pack(changed) + b''.join(rows))
+        keyframe = encode(MSG_KEYFRAME, snapshot + cells)
+        self.loop.call_soon_threadsafe(self.fan_out, delta, keyframe)
+        self.publish_times.append(time.perf_counter() - start)
+
+    def fan_out(self, delta, keyframe):
+        self.keyframe = keyframe
+        self.frames += 1
+        for viewer in self.viewers:
+            viewer.offer(delta, keyframe)
+
+    async def handle_viewer(self, reader, writer):
+        viewer = Viewer(writer, self.max_queued)
+        if self.keyframe is not None:
+            viewer.offer(None, self.keyframe)
+        self.viewers.add(viewer)
+        sender = asyncio.ensure_future(viewer.send_loop())
+        try:
+            while True:
+                kind, payload = await read_message(reader)
+                if kind == MSG_ACK:
+                    viewer.ack(ACK.unpack(payload)[0])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.viewers.discard(viewer)
+            sender.cancel()
+            self.dropped += viewer.dropped
+            writer.close()
+
+    def stats(self):
+        """Números atuais, para o resumo periódico (rode no loop asyncio)."""
+        times = sorted(self.publish_times)
+        return {
+            'viewers': len(self.viewers),
+            'frames': self.frames,
+            'dropped': self.dropped + sum(v.dropped for v in self.viewers),
+            'publish_p50_us': percentile(times, 0.50) * 1e6,
+            'publish_p99_us': percentile(times, 0.99) * 1e6,
+        }
+
+
+class SpectatorView:
+    """O estado da partida do lado do espectador, remontado dos quadros."""
+
+    def __init__(self):
+        self.cells = bytearray(ROWS * COLUMNS)
+        self.synced = False
+        self.tick = 0
+        self.piece = None
+        self.next_shape = 0
+        self.score = 0
+        self.high_score = 0
+        self.frames = 0
+        self.keyframes = 0
+
+    def apply(self, kind, payload):
+        (self.tick, shape, rotation, x, y, self.next_shape, self.score,
+         self.high_score) = SNAPSHOT.unpack_from(payload)
+        self.piece = (shape, rotation, x, y)
+        pos = SNAPSHOT.size
+        if kind == MSG_KEYFRAME:
+            self.cells[:] = payload[pos:pos + ROWS * COLUMNS]
+            self.synced = True
+            self.keyframes += 1
+        elif kind == MSG_DELTA:
+            (changed,) = CHANGED_ROWS.unpack_from(payload, pos)
+            pos += CHANGED_ROWS.size
+            for y in range(ROWS):
+                if changed >> y & 1:
+                    self.cells[y * COLUMNS:(y + 1) * COLUMNS] = payload[pos:pos + COLUMNS]
+                    pos += COLUMNS
+        self.frames += 1
+
+    def grid(self):
+        """Grade de cores no formato de create_grid, já com a peça atual."""
+        cells = self.cells
+        grid = [[CELL_COLORS[cells[y * COLUMNS + x]] for x in range(COLUMNS)]
+                for y in range(ROWS)]
+        if self.piece is not None:
+            shape, rotation, px, py = self.piece
+            for dx, dy in SHAPE_ROTATIONS[shape][rotation].cells:
+                if 0 <= py + dy < ROWS and 0 <= px + dx < COLUMNS:
+                    grid[py + dy][px + dx] = shape_colors[shape]
+        return grid
+
+    def next_piece(self):
+        return Piece(5, 0, shapes[self.next_shape])
+
+
+async def watch(host, port, view, on_frame=None, stall=0.0):
+    """
+    Recebe os quadros de uma transmissão em `view` até a conexão fechar.
+    `stall` para de ler por esse tempo logo depois do primeiro quadro
+    (simula uma tela travada ou uma rede engasgada).
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    received = 0
+    try:
+        while True:
+            kind, payload = await read_message(reader)
+            # Um delta só vale sobre um quadro-chave já recebido
+            if kind == MSG_KEYFRAME or view.synced:
+                view.apply(kind, payload)
+            received += 1
+            if received % ACK_EVERY == 0:
+                writer.write(encode(MSG_ACK, ACK.pack(received)))
+            if on_frame is not None:
+                on_frame()
+            if stall:
+                await asyncio.sleep(stall)
+                stall = 0.0
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_bot_game(host, port, report_seconds, delay_ticks):
+    """Transmite partidas do bot, uma atrás da outra, no ritmo do jogo."""
+    broadcaster = Broadcaster()
+    server = await broadcaster.start(host, port)
+    print(f"Transmitindo em {host}:{port}")
+    loop = asyncio.get_running_loop()
+    next_report = loop.time() + report_seconds
+    last_frames = 0
+    async with server:
+        while True:
+            game = Engine()
+            player = AutoPlayer(Bot(lookahead=False), delay_ticks=delay_ticks)
+            state = game.state
+            next_tick = loop.time()
+            while not state.lost:
+                game.step(player.actions(state))
+                broadcaster.publish(state)
+                next_tick += TICK_MS / 1000
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+                if loop.time() >= next_report:
+                    stats = broadcaster.stats()
+                    print(f"{stats['viewers']} espectadores, "
+                          f"{(stats['frames'] - last_frames) / report_seconds:.0f} quadros/s, "
+                          f"{stats['dropped']} descartados, publish p50 "
+                          f"{stats['publish_p50_us']:.0f} µs p99 {stats['publish_p99_us']:.0f} µs")
+                    last_frames = stats['frames']
+                    next_report += report_seconds
+
+
+async def load_viewers(host, port, count, seconds, slow, stall):
+    """`count` espectadores sem tela por `seconds` segundos; os `slow` primeiros travam por `stall` s."""
+    views = [SpectatorView() for _ in range(count)]
+    tasks = [asyncio.ensure_future(watch(host, port, view,
+                                         stall=stall if i < slow else 0.0))
+             for i, view in enumerate(views)]
+    await asyncio.sleep(seconds)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return [(view.frames, view.keyframes, view.tick) for view in views]
+
+
+def load_worker(host, port, count, seconds, slow, stall):
+    return asyncio.run(load_viewers(host, port, count, seconds, slow, stall))
+
+
+def load_test(host, port, viewers, seconds, slow, stall, workers):
+    workers = max(1, min(workers, viewers))
+    shares = [viewers // workers + (1 if i < viewers % workers else 0)
+              for i in range(workers)]
+    slow_shares = [slow // workers + (1 if i < slow % workers else 0)
+                   for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = [view for part in pool.map(
+            load_worker, [host] * workers, [port] * workers, shares,
+            [seconds] * workers, slow_shares, [stall] * workers)
+            for view in part]
+
+    def summary(views, label):
+        if not views:
+            return
+        frames = sorted(frames for frames, _, _ in views)
+        resyncs = sum(keyframes - 1 for _, keyframes, _ in views if keyframes)
+        last_tick = max(tick for _, _, tick in results)
+        behind = sorted(last_tick - tick for _, _, tick in views)
+        print(f"{label}: {len(views)}, quadros por espectador p50 {percentile(frames, 0.5):.0f} "
+              f"(mín. {frames[0]}), {resyncs} quadros-chave de ressincronização, "
+              f"atraso no fim p50 {percentile(behind, 0.5):.0f} / máx. {behind[-1]} passos")
+
+    fast = [view for i, view in enumerate(results) if not is_slow(i, shares, slow_shares)]
+    lagging = [view for i, view in enumerate(results) if is_slow(i, shares, slow_shares)]
+    print(f"{viewers} espectadores por {seconds:.0f} s ({workers} processos)")
+    summary(fast, "normais")
+    summary(lagging, f"travados por {stall:.0f} s")
+    return 0
+
+
+def is_slow(index, shares, slow_shares):
+    """O espectador `index` (na ordem dos resultados) é um dos lentos?"""
+    for share, slow in zip(shares, slow_shares):
+        if index < share:
+            return index < slow
+        index -= share
+    return False
+
+
+def run_viewer(host, port):
+    """Tela de espectador: desenha cada quadro com o mesmo draw_window do jogo."""
+    import pygame
+    import main as game_ui
+
+    pygame.init()
+    win = pygame.display.set_mode((game_ui.s_width, game_ui.s_height))
+    pygame.display.set_caption('Tetris - espectador')
+    frame_event = pygame.USEREVENT + 2
+    view = SpectatorView()
+    pending = threading.Event()
+
+    def on_frame():
+        # Um aviso por vez: quadros que chegam antes do redesenho se juntam
+        if not pending.is_set():
+            pending.set()
+            pygame.event.post(pygame.event.Event(frame_event))
+
+    def receive():
+        asyncio.run(watch(host, port, view, on_frame))
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    threading.Thread(target=receive, name='broadcast-viewer', daemon=True).start()
+    while True:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT or (
+                event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+            break
+        if event.type == frame_event:
+            pending.clear()
+            if view.synced:
+                game_ui.draw_window(win, view.grid(), view.score, view.high_score)
+                game_ui.draw_next_shape(view.next_piece(), win)
+                pygame.display.update()
+    pygame.quit()
+    return 0
+
+
+def parse_address(address):
+    host, _, port = address.partition(':')
+    return host or '127.0.0.1', int(port or DEFAULT_PORT)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Transmissão de partidas para espectadores.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help="transmite partidas do bot")
+    serve.add_argument('--host', default='0.0.0.0')
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve.add_argument('--report', type=float, default=10,
+                       help="segundos entre os resumos impressos")
+    serve.add_argument('--delay-ticks', type=int, default=20,
+                       help="espera do bot antes de cada jogada, em passos")
+
+    view = commands.add_parser('view', help="tela de espectador")
+    view.add_argument('address', help="HOST:PORTA da transmissão")
+
+    load = commands.add_parser('load', help="muitos espectadores sem tela")
+    load.add_argument('address', help="HOST:PORTA da transmissão")
+    load.add_argument('--viewers', type=int, default=300)
+    load.add_argument('--seconds', type=float, default=10)
+    load.add_argument('--slow', type=int, default=0,
+                      help="quantos espectadores param de ler por um tempo")
+    load.add_argument('--stall', type=float, default=5,
+                      help="segundos que os espectadores lentos ficam sem ler")
+    load.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                      help="processos com espectadores (padrão: núcleos da CPU)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'serve':
+            asyncio.run(serve_bot_game(args.host, args.port, args.report,
+                                       args.delay_ticks))
+            return 0
+        host, port = parse_address(args.address)
+        if args.command == 'view':
+            return run_viewer(host, port)
+        return load_test(host, port, args.viewers, args.seconds, args.slow,
+                         args.stall, args.workers)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,540 @@
+import random
+from collections import namedtuple
+
+from board import Board
+
+# Regras do jogo sem nenhuma dependência de pygame (tela, mixer ou relógio).
+# O `main.py` é apenas uma interface gráfica por cima deste módulo, e o
+# mesmo motor pode ser usado para simular partidas em lote (testes, bots).
+
+# Duração fixa de um passo da simulação (60 passos por segundo). A lógica
+# sempre avança nesse ritmo, independente da taxa de quadros da tela.
+TICKS_PER_SECOND = 60
+TICK_MS = 1000 / TICKS_PER_SECOND
+
+# Wall kick offsets (simplified for basic functionality, not full SRS)
+WALL_KICKS = [
+    (0, 0),
+    (-1, 0),
+    (1, 0),
+    (-2, 0),
+    (2, 0),
+    (0, -1),
+    (0, -2)
+]
+
+# SHAPE FORMATS
+S = [['.....', '.....', '..00.', '.00..', '.....'],
+     ['.....', '..0..', '..00.', '...0.', '.....']]
+
+Z = [['.....', '.00..', '..00.', '.....', '.....'],
+     ['.....', '..0..', '.00..', '.0...', '.....']]
+
+I = [['..0..', '..0..', '..0..', '..0..', '.....'],
+     ['.....', '0000.', '.....', '.....', '.....']]
+
+O = [['.....', '.....', '.00..', '.00..', '.....']]
+
+J = [['.....', '.0...', '.000.', '.....', '.....'],
+     ['.....', '..00.', '..0..', '..0..', '.....'],
+     ['.....', '.....', '.000.', '...0.', '.....'],
+     ['.....', '..0..', '..0..', '.00..', '.....']]
+
+L = [['.....', '...0.', '.000.', '.....', '.....'],
+     ['.....', '..0..', '..0..', '..00.', '.....'],
+     ['.....', '.....', '.000.', '.0...', '.....'],
+     ['.....', '.00..', '..0..', '..0..', '.....']]
+
+T = [['.....', '..0..', '.000.', '.....', '.....'],
+     ['.....', '..0..', '..00.', '..0..', '.....'],
+     ['.....', '.....', '.000.', '..0..', '.....'],
+     ['.....', '..0..', '.00..', '..0..', '.....']]
+
+shapes = [S, Z, I, O, J, L, T]
+shape_colors = [(0, 255, 0), (255, 0, 0), (0, 255, 255),
+                (255, 255, 0), (255, 165, 0), (0, 0, 255), (128, 0, 128)]
+
+# Índice de cor (no Board) das linhas de lixo do modo versus, logo depois
+# das cores das peças, e a cor usada para desenhá-las
+GARBAGE_COLOR = len(shape_colors) + 1
+garbage_color = (128, 128, 128)
+
+# Uma rotação já compilada de uma peça:
+# - template: células (coluna, linha) dentro do molde 5x5
+# - cells: deslocamentos (dx, dy) em relação a (piece.x, piece.y), já com o
+#   ajuste de -2, -4 aplicado
+# - row_masks: (dy, bits) por linha ocupada, com o bit 0 na coluna min_dx
+# - bottoms: (dx, dy) da célula mais baixa de cada coluna ocupada
+ShapeRotation = namedtuple(
+    'ShapeRotation', 'template cells row_masks min_dx max_dx max_dy bottoms')
+
+
+def compile_shape(shape):
+    """Converte os moldes em texto de uma peça em tuplas imutáveis."""
+    rotations = []
+    for format in shape:
+        template = tuple((j, i)
+                         for i, line in enumerate(format)
+                         for j, column in enumerate(line) if column == '0')
+        cells = tuple((j - 2, i - 4) for j, i in template)
+        min_dx = min(dx for dx, _ in cells)
+        masks = {}
+        bottoms = {}
+        for dx, dy in cells:
+            masks[dy] = masks.get(dy, 0) | (1 << (dx - min_dx))
+            bottoms[dx] = max(bottoms.get(dx, dy), dy)
+        rotations.append(ShapeRotation(
+            template, cells, tuple(sorted(masks.items())), min_dx,
+            max(dx for dx, _ in cells), max(dy for _, dy in cells),
+            tuple(sorted(bottoms.items()))))
+    return tuple(rotations)
+
+
+# Tabelas compiladas uma única vez, na mesma ordem de `shapes`
+SHAPE_ROTATIONS = tuple(compile_shape(shape) for shape in shapes)
+
+# Pontuação por quantidade de linhas removidas de uma vez
+LINE_SCORES = {1: 100, 2: 300, 3: 500, 4: 800}
+
+# Modo versus: linhas de lixo enviadas ao adversário por quantidade de
+# linhas removidas de uma vez
+GARBAGE_LINES = {1: 0, 2: 1, 3: 2, 4: 4}
+
+# Ações de entrada aceitas por Engine.step
+LEFT = 1
+LEFT_RELEASE = 2
+RIGHT = 3
+RIGHT_RELEASE = 4
+ROTATE = 5
+DOWN = 6
+DOWN_RELEASE = 7
+HARD_DROP = 8
+# Volta de uma pausa: a espera para travar a peça recomeça do zero. Passa
+# por step() como as outras ações, para ficar gravada nos replays.
+RESUME = 9
+
+# Eventos devolvidos por Engine.step (os nomes coincidem com os efeitos
+# sonoros carregados no AudioManager, exceto 'lock')
+EV_MOVE = 'move'
+EV_ROTATE = 'rotate'
+EV_DROP = 'drop'
+EV_LOCK = 'lock'
+EV_CLEAR = 'clear'
+EV_TETRIS = 'rocket'
+EV_LEVEL_UP = 'level_up'
+EV_GAME_OVER = 'game_over'
+EV_SEND = 'send'
+
+
+class Piece(object):
+    def __init__(self, x, y, shape):
+        self.x = x
+        self.y = y
+        self.shape = shape
+        self.index = shapes.index(shape)
+        self.rotations = SHAPE_ROTATIONS[self.index]
+        self.color = shape_colors[self.index]
+        self.rotation = 0
+
+    def compiled(self):
+        """Rotação atual da peça, já compilada."""
+        return self.rotations[self.rotation % len(self.rotations)]
+
+
+def create_grid(board):
+    """Monta a grade 20x10 de cores (usada apenas para desenhar)."""
+    grid = [[(0, 0, 0) for _ in range(board.columns)]
+            for _ in range(board.height)]
+
+    for x, y, color in board.cells():
+        grid[y][x] = (shape_colors[color - 1] if color != GARBAGE_COLOR
+                      else garbage_color)
+    return grid
+
+
+def convert_shape_format(shape):
+    x = shape.x
+    y = shape.y
+    return [(x + dx, y + dy) for dx, dy in shape.compiled().cells]
+
+
+def valid_space(shape, board, x=None, y=None):
+    """
+    Verifica se a posição atual da peça é válida (não colide com paredes, chão ou blocos travados).
+    `board` é a fonte da verdade para blocos ocupados. `x`/`y` permitem
+    testar outra posição sem alterar a peça.
+    """
+    if x is None:
+        x = shape.x
+    if y is None:
+        y = shape.y
+    return rotation_fits(shape.compiled(), board, x, y)
+
+
+def rotation_fits(rot, board, x, y):
+    """Mesmo teste de valid_space, direto sobre uma rotação compilada."""
+    left = x + rot.min_dx
+    if left < 0 or x + rot.max_dx >= board.columns:
+        return False
+    if y + rot.max_dy >= board.height:
+        return False
+
+    rows = board.rows
+    for dy, bits in rot.row_masks:
+        row = y + dy
+        if row >= 0 and rows[row] & (bits << left):
+            return False
+    return True
+
+
+def drop_distance(shape, board):
+    """
+    Quantas linhas a peça ainda pode descer. Usa o topo de cada coluna do
+    tabuleiro e a célula mais baixa da peça em cada coluna, sem testar
+    linha por linha. Se a peça estiver abaixo do topo de alguma das suas
+    colunas (encaixada sob uma saliência), cai no teste linha a linha.
+    """
+    rot = shape.compiled()
+    x = shape.x
+    y = shape.y
+    tops = board.tops
+    distance = min(tops[x + dx] - 1 - (y + dy) for dx, dy in rot.bottoms)
+    if distance < 0:
+        distance = 0
+        while rotation_fits(rot, board, x, y + distance + 1):
+            distance += 1
+    return distance
+
+
+def check_lost(board):
+    """
+    Verifica se alguma peça travou acima da área de jogo visível. Diferente
+    do jogo original, em que esses blocos ainda desciam se a mesma peça
+    completasse linhas, qualquer bloco travado acima do topo encerra a
+    partida.
+    """
+    return board.overflow
+
+
+def get_shape(rng=random):
+    """Retorna uma nova peça aleatória (sorteada com `rng`, se informado)."""
+    return Piece(5, 0, rng.choice(shapes))
+
+
+def clear_rows(board, touched=None):
+    """
+    Remove linhas completas e move os blocos acima para baixo. `touched`
+    são as linhas alteradas pela última peça (as únicas que podem ter
+    ficado completas).
+    """
+    return board.clear_full_rows(touched)
+
+
+class GameState:
+    """Estado completo de uma partida. Não guarda nenhum objeto do pygame."""
+
+    def __init__(self, rng=random):
+        self.board = Board()
+        self.reset(rng)
+
+    def reset(self, rng=random):
+        """Volta ao início de uma partida, reaproveitando o tabuleiro."""
+        self.rng = rng
+        self.board.clear()
+        self.current_piece = get_shape(rng)
+        self.next_piece = get_shape(rng)
+
+        self.score = 0
+        self.lines = 0
+        self.pieces = 0
+        self.lost = False
+        self.level_up = False
+
+        # Modo versus: lixo recebido que ainda não entrou no tabuleiro
+        # [(linhas, coluna do buraco), ...] e total de linhas enviadas
+        self.pending_garbage = []
+        self.garbage_sent = 0
+
+        # Relógio da simulação: passos já executados e tempo em milissegundos
+        self.ticks = 0
+        self.now_ms = 0
+        self.fall_time = 0
+        self.level_time = 0
+
+        self.lock_delay_start_time = None
+        # Há quanto tempo (ms) cada tecla lateral está segurada (None = solta)
+        self.left_held_ms = None
+        self.right_held_ms = None
+        self.down_held = False
+
+    def piece_positions(self):
+        """Células ocupadas pela peça atual."""
+        return convert_shape_format(self.current_piece)
+
+    def ghost_positions(self):
+        """Células onde a peça atual vai parar se for largada agora."""
+        distance = drop_distance(self.current_piece, self.board)
+        return [(x, y + distance) for x, y in convert_shape_format(self.current_piece)]
+
+
+class Engine:
+    """
+    Avança uma partida um passo de cada vez.
+
+    `step` recebe as ações de entrada do passo e devolve a lista de eventos
+    que aconteceram (movimentos, linhas removidas, fim de jogo...). Quem
+    desenha a tela ou toca os sons é a interface que usa o motor.
+    """
+
+    # Ajustando as velocidades para valores fixos
+    # Velocidade inicial mais rápida (menor = mais rápido)
+    base_fall_speed = 0.1
+    fast_fall_speed = 0.15  # Velocidade após 60 segundos
+    level_up_time = 60  # segundos
+    soft_drop_multiplier = 0.4
+
+    lock_delay_ms = 500
+
+    das_delay_ms = 150
+    arr_delay_ms = 30
+
+    def __init__(self, seed=None, versus=False):
+        # No modo versus as linhas removidas viram lixo para o adversário
+        self.versus = versus
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """
+        Começa uma nova partida. Cada partida tem sua semente e seu próprio
+        gerador de peças, então as mesmas entradas nos mesmos passos sempre
+        produzem o mesmo jogo.
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        if hasattr(self, 'state'):
+            self.state.reset(random.Random(seed))
+        else:
+            self.state = GameState(random.Random(seed))
+        self.fall_speed = self.base_fall_speed
+
+    def fits(self, piece):
+        return valid_space(piece, self.state.board)
+
+    def can_fall(self, piece):
+        return valid_space(piece, self.state.board, y=piece.y + 1)
+
+    def shift(self, dx, events):
+        """Move a peça na horizontal; retorna False se houver colisão."""
+        state = self.state
+        state.current_piece.x += dx
+        if not self.fits(state.current_piece):
+            state.current_piece.x -= dx
+            return False
+        events.append(EV_MOVE)
+        state.lock_delay_start_time = None
+        return True
+
+    def rotate(self, events):
+        state = self.state
+        piece = state.current_piece
+        original_rotation = piece.rotation
+        original_x = piece.x
+        original_y = piece.y
+
+        piece.rotation = (piece.rotation + 1) % len(piece.shape)
+
+        for dx, dy in WALL_KICKS:
+            piece.x = original_x + dx
+            piece.y = original_y + dy
+            if self.fits(piece):
+                events.append(EV_ROTATE)
+                if not self.can_fall(piece):
+                    state.lock_delay_start_time = state.now_ms
+                state.left_held_ms = None
+                state.right_held_ms = None
+                return True
+
+        piece.rotation = original_rotation
+        piece.x = original_x
+        piece.y = original_y
+        return False
+
+    def soft_drop(self, events):
+        state = self.state
+        state.current_piece.y += 1
+        if not self.fits(state.current_piece):
+            state.current_piece.y -= 1
+            if state.lock_delay_start_time is None:
+                state.lock_delay_start_time = state.now_ms
+            return False
+        events.append(EV_MOVE)
+        state.lock_delay_start_time = None
+        state.fall_time = 0
+        return True
+
+    def hard_drop(self, events):
+        state = self.state
+        events.append(EV_DROP)
+        if self.fits(state.current_piece):
+            state.current_piece.y += drop_distance(state.current_piece, state.board)
+        else:
+            state.current_piece.y -= 1
+        state.lock_delay_start_time = None
+        self.lock_piece(events)
+
+    def lock_piece(self, events):
+        """Trava a peça atual, remove linhas completas e puxa a próxima."""
+        state = self.state
+        piece = state.current_piece
+        touched = state.board.lock(convert_shape_format(piece), piece.index + 1)
+
+        state.current_piece = state.next_piece
+        state.next_piece = get_shape(state.rng)
+        state.pieces += 1
+
+        state.left_held_ms = None
+        state.right_held_ms = None
+        state.lock_delay_start_time = None
+        events.append(EV_LOCK)
+
+        rows_cleared = clear_rows(state.board, touched)
+
+        if rows_cleared > 0:
+            state.score += LINE_SCORES.get(rows_cleared, 0)
+            state.lines += rows_cleared
+            if rows_cleared == 4:
+                events.append(EV_TETRIS)
+            events.append(EV_CLEAR)
+            if self.versus:
+                self.send_garbage(GARBAGE_LINES.get(rows_cleared, 0), events)
+        elif state.pending_garbage:
+            self.raise_garbage()
+
+        if check_lost(state.board):
+            state.lost = True
+            events.append(EV_GAME_OVER)
+
+    def receive_garbage(self, count, hole):
+        """
+        Lixo enviado pelo adversário: `count` linhas com o buraco na coluna
+        `hole`. Entra no tabuleiro quando a próxima peça travar sem remover
+        linhas.
+        """
+        self.state.pending_garbage.append((count, hole))
+
+    def send_garbage(self, count, events):
+        """Usa as linhas de ataque primeiro para cancelar o lixo pendente."""
+        pending = self.state.pending_garbage
+        while count and pending:
+            lines, hole = pending[0]
+            cancelled = min(count, lines)
+            count -= cancelled
+            if cancelled == lines:
+                pending.pop(0)
+            else:
+                pending[0] = (lines - cancelled, hole)
+        if count:
+            self.state.garbage_sent += count
+            events.append(EV_SEND)
+
+    def raise_garbage(self):
+        state = self.state
+        for count, hole in state.pending_garbage:
+            state.board.add_garbage(count, hole, GARBAGE_COLOR)
+        state.pending_garbage = []
+        # A peça que acabou de aparecer sobe se o lixo a alcançou
+        piece = state.current_piece
+        while not self.fits(piece):
+            piece.y -= 1
+
+    def handle_action(self, action, events):
+        state = self.state
+        if action == LEFT:
+            self.shift(-1, events)
+            state.left_held_ms = 0
+        elif action == RIGHT:
+            self.shift(1, events)
+            state.right_held_ms = 0
+        elif action == ROTATE:
+            self.rotate(events)
+        elif action == DOWN:
+            state.down_held = True
+            self.soft_drop(events)
+        elif action == HARD_DROP:
+            self.hard_drop(events)
+        elif action == LEFT_RELEASE:
+            state.left_held_ms = None
+        elif action == RIGHT_RELEASE:
+            state.right_held_ms = None
+        elif action == DOWN_RELEASE:
+            state.down_held = False
+        elif action == RESUME:
+            state.lock_delay_start_time = None
+
+    def auto_repeat(self, held_ms, dx, events):
+        """
+        Repetição automática (DAS/ARR) de uma tecla lateral segurada.
+        Recebe o tempo segurado antes deste passo e retorna o novo valor.
+        Cada repetição cai em das_delay_ms + k * arr_delay_ms; todas as que
+        ficaram dentro do passo são aplicadas, então nenhuma é perdida ou
+        repetida.
+        """
+        if held_ms is None:
+            return None
+        held = held_ms + TICK_MS
+        das = self.das_delay_ms
+        if held > das:
+            repeats = int((held - das) // self.arr_delay_ms) + 1
+            if held_ms > das:
+                repeats -= int((held_ms - das) // self.arr_delay_ms) + 1
+            for _ in range(repeats):
+                if not self.shift(dx, events):
+                    break
+        return held
+
+    def step(self, actions=()):
+        """
+        Avança a partida um passo fixo (TICK_MS) aplicando `actions`.
+        Retorna a lista de eventos produzidos neste passo.
+        """
+        state = self.state
+        events = []
+        if state.lost:
+            return events
+
+        state.ticks += 1
+        state.now_ms += TICK_MS
+        state.fall_time += TICK_MS
+        state.level_time += TICK_MS
+
+        if not state.level_up and state.level_time / 1000 > self.level_up_time:
+            self.fall_speed = self.fast_fall_speed
+            state.level_up = True
+            events.append(EV_LEVEL_UP)
+
+        for action in actions:
+            self.handle_action(action, events)
+            if state.lost:
+                return events
+
+        state.left_held_ms = self.auto_repeat(state.left_held_ms, -1, events)
+        state.right_held_ms = self.auto_repeat(state.right_held_ms, 1, events)
+
+        current_fall_speed = self.fall_speed
+        if state.down_held:
+            current_fall_speed *= self.soft_drop_multiplier
+
+        if not self.can_fall(state.current_piece):
+            if state.lock_delay_start_time is None:
+                state.lock_delay_start_time = state.now_ms
+            elif (state.now_ms - state.lock_delay_start_time) >= self.lock_delay_ms:
+                self.lock_piece(events)
+        else:
+            state.lock_delay_start_time = None
+
+            if state.fall_time / 1000 >= current_fall_speed:
+                state.fall_time = 0
+                state.current_piece.y += 1
+
+        return events
@@ -0,0 +1,55 @@
+import pygame
+from collections import OrderedDict
+
+from asset_pack import open_asset
+from game_assets import FONT_PATH
+
+# Quantidade máxima de textos renderizados guardados em memória
+MAX_TEXT_SURFACES = 256
+
+_fonts = {}
+_text_surfaces = OrderedDict()
+
+
+def get_font(size, path=FONT_PATH, bold=False):
+    """
+    Retorna a fonte do caminho/tamanho pedidos, abrindo o arquivo TTF uma
+    única vez. Se o arquivo não existir, usa a fonte padrão do sistema.
+    """
+    key = (path, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        try:
+            font = pygame.font.Font(open_asset(path), size)
+        except FileNotFoundError:
+            print(f"Erro: Fonte não encontrada em {path}. Usando fonte padrão.")
+            font = pygame.font.SysFont('comicsans', size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+def render_text(font, text, color, antialias=True):
+    """
+    Renderiza um texto usando um cache LRU de superfícies, de modo que um
+    texto que não mudou (título, rótulos, pontuação igual) não é
+    renderizado de novo a cada quadro.
+    """
+    key = (font, text, tuple(color), antialias)
+    surface = _text_surfaces.get(key)
+    if surface is not None:
+        _text_surfaces.move_to_end(key)
+        return surface
+
+    surface = font.render(text, antialias, color)
+    _text_surfaces[key] = surface
+    if len(_text_surfaces) > MAX_TEXT_SURFACES:
+        _text_surfaces.popitem(last=False)
+    return surface
+
+
+def clear_cache():
+    """Descarta todas as fontes e textos em cache."""
+    _fonts.clear()
+    _text_surfaces.clear()
@@ -0,0 +1,24 @@
+import os
+
+# Arquivos que o jogo carrega: a fonte e os áudios abertos em segundo plano
+# ao iniciar (nome, caminho). Ficam neste módulo, sem dependências, para
+# que o asset_pack.py saiba o que empacotar sem importar o jogo (pygame,
+# rede, torneio...).
+
+FONT_PATH = os.path.join('assets', 'fonts', 'BigBlueTermPlusNerdFont-Regular.ttf')
+
+STARTUP_MUSIC = [
+    ('menu', 'assets/audio/music/main_theme.mp3'),
+    ('game', 'assets/audio/music/game_theme.mp3'),
+]
+STARTUP_SOUNDS = [
+    ('rotate', 'assets/audio/effects/rotate_piece.wav'),
+    ('move', 'assets/audio/effects/move_piece.wav'),
+    ('drop', 'assets/audio/effects/piece_landed.wav'),
+    ('clear', 'assets/audio/effects/line_clear.wav'),
+    ('level_up', 'assets/audio/effects/level_up_jingle.wav'),
+    ('game_over', 'assets/audio/effects/game_over.wav'),
+    ('rocket', 'assets/audio/effects/tetris_4_lines.wav'),
+    ('pause', 'assets/audio/effects/menu_sound.wav'),
+    ('send', 'assets/audio/effects/player_sending_blocks.wav'),
+]
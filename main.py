@@ -1,17 +1,28 @@
+import time
+
+# Início da execução, para o relatório de inicialização (--startup-report)
+STARTUP_START = time.perf_counter()
+
 import pygame
-import random
-import os
+import sys
 
+import engine
+from engine import create_grid, Engine
+import asset_pack
 from audio_manager import AudioManager
+from font_cache import get_font, render_text
+from game_assets import STARTUP_MUSIC, STARTUP_SOUNDS
+from score_store import ScoreStore
+from replay import Recorder, save_replay
+from bot import AutoPlayer, Bot, load_weights
+from profiler import FrameProfiler, StartupReport
 from main_menu import MainMenu
+from modal_screen import run_modal
 from pause_menu import PauseMenu
 from settings_menu import SettingsMenu
-
-pygame.font.init()
-
-# Definir o caminho para a fonte
-FONT_PATH = os.path.join(
-    'assets', 'fonts', 'BigBlueTermPlusNerdFont-Regular.ttf')
+from versus import DEFAULT_PORT, MSG_LOST, MatchLink, VersusConnection
+import broadcast
+import tournament
 
 # GLOBALS VARS
 s_width = 1280
@@ -24,271 +35,108 @@ play_height = 600  # 20 linhas * 30px/linha
 top_left_x = (s_width - play_width) // 2
 top_left_y = (s_height - play_height) // 2
 
-# Wall kick offsets (simplified for basic functionality, not full SRS)
-WALL_KICKS = [
-    (0, 0),
-    (-1, 0),
-    (1, 0),
-    (-2, 0),
-    (2, 0),
-    (0, -1),
-    (0, -2)
-]
-
-# SHAPE FORMATS (permanecem os mesmos)
-S = [['.....', '.....', '..00.', '.00..', '.....'],
-     ['.....', '..0..', '..00.', '...0.', '.....']]
-
-Z = [['.....', '.00..', '..00.', '.....', '.....'],
-     ['.....', '..0..', '.00..', '.0...', '.....']]
-
-I = [['..0..', '..0..', '..0..', '..0..', '.....'],
-     ['.....', '0000.', '.....', '.....', '.....']]
-
-O = [['.....', '.....', '.00..', '.00..', '.....']]
-
-J = [['.....', '.0...', '.000.', '.....', '.....'],
-     ['.....', '..00.', '..0..', '..0..', '.....'],
-     ['.....', '.....', '.000.', '...0.', '.....'],
-     ['.....', '..0..', '..0..', '.00..', '.....']]
-
-L = [['.....', '...0.', '.000.', '.....', '.....'],
-     ['.....', '..0..', '..0..', '..00.', '.....'],
-     ['.....', '.....', '.000.', '.0...', '.....'],
-     ['.....', '.00..', '..0..', '..0..', '.....']]
-
-T = [['.....', '..0..', '.000.', '.....', '.....'],
-     ['.....', '..0..', '..00.', '..0..', '.....'],
-     ['.....', '.....', '.000.', '..0..', '.....'],
-     ['.....', '..0..', '.00..', '..0..', '.....']]
-
-shapes = [S, Z, I, O, J, L, T]
-shape_colors = [(0, 255, 0), (255, 0, 0), (0, 255, 255),
-                (255, 255, 0), (255, 165, 0), (0, 0, 255), (128, 0, 128)]
-
-
-class Piece(object):
-    def __init__(self, x, y, shape):
-        self.x = x
-        self.y = y
-        self.shape = shape
-        self.color = shape_colors[shapes.index(shape)]
-        self.rotation = 0
-
-
-def create_grid(locked_pos={}):
-    grid = [[(0, 0, 0) for _ in range(10)] for _ in range(20)]
-
-    for i in range(len(grid)):
-        for j in range(len(grid[i])):
-            if (j, i) in locked_pos:
-                c = locked_pos[(j, i)]
-                grid[i][j] = c
-    return grid
-
-
-def convert_shape_format(shape):
-    positions = []
-    format = shape.shape[shape.rotation % len(shape.shape)]
-
-    for i, line in enumerate(format):
-        row = list(line)
-        for j, column in enumerate(row):
-            if column == '0':
-                positions.append((shape.x + j, shape.y + i))
-
-    for i, pos in enumerate(positions):
-        positions[i] = (pos[0] - 2, pos[1] - 4)
-
-    return positions
-
-
-def valid_space(shape, grid, locked_positions):
-    """
-    Verifica se a posição atual da peça é válida (não colide com paredes, chão ou blocos travados).
-    `grid` é usada apenas para suas dimensões. `locked_positions` é a fonte da verdade para blocos ocupados.
-    """
-    formatted = convert_shape_format(shape)
-
-    for pos in formatted:
-        x, y = pos
-
-        if not (0 <= x < 10):
-            return False
-
-        if y >= 20:
-            return False
-
-        if y >= 0 and (x, y) in locked_positions:
-            return False
-
-    return True
-
-
-def check_lost(positions):
-    """Verifica se alguma peça travou acima da área de jogo visível."""
-    for pos in positions:
-        x, y = pos
-        if y < 0:
-            return True
-    return False
-
-
-def get_shape():
-    """Retorna uma nova peça aleatória."""
-    return Piece(5, 0, random.choice(shapes))
-
-
-def draw_text_middle(surface, text, size, color):
-    """Desenha texto centralizado na tela."""
-    try:
-        font = pygame.font.Font(FONT_PATH, size)
-    except FileNotFoundError:
-        print(
-            f"Erro: Fonte não encontrada em {FONT_PATH}. Usando fonte padrão.")
-        font = pygame.font.SysFont("comicsans", size, bold=True)
-    label = font.render(text, 1, color)
-
-    surface.blit(label, (s_width / 2 - (label.get_width() / 2),
-                 s_height / 2 - label.get_height() / 2))
-
-
-def clear_rows(grid, locked):
-    """
-    Remove linhas completas e move os blocos acima para baixo.
-    `grid` é usada apenas para suas dimensões (largura/altura).
-    A verificação e modificação são feitas em `locked_positions`.
-    """
-    inc = 0
-    full_rows_indices = []
-
-    for i in range(len(grid) - 1, -1, -1):
-        is_row_full = True
-        for j in range(len(grid[i])):
-            if (j, i) not in locked:
-                is_row_full = False
-                break
-
-        if is_row_full:
-            inc += 1
-            full_rows_indices.append(i)
-
-            for j in range(len(grid[i])):
-                if (j, i) in locked:
-                    del locked[(j, i)]
-
-    if inc > 0:
-        keys_to_move = []
-        for key in locked:
-            x, y = key
-            lines_to_descend = 0
-            for row_idx_cleared in full_rows_indices:
-                if y < row_idx_cleared:
-                    lines_to_descend += 1
-
-            if lines_to_descend > 0:
-                keys_to_move.append(key)
-
-        temp_storage = {}
-        for key in keys_to_move:
-            color = locked.pop(key)
-            x, y = key
-
-            lines_to_descend_final = 0
-            for row_idx_cleared in full_rows_indices:
-                if y < row_idx_cleared:
-                    lines_to_descend_final += 1
-
-            temp_storage[(x, y + lines_to_descend_final)] = color
-
-        locked.update(temp_storage)
-
-    return inc
+# Teclas do jogo -> ações do motor (pressionar, soltar)
+KEY_ACTIONS = {
+    pygame.K_LEFT: (engine.LEFT, engine.LEFT_RELEASE),
+    pygame.K_RIGHT: (engine.RIGHT, engine.RIGHT_RELEASE),
+    pygame.K_UP: (engine.ROTATE, None),
+    pygame.K_DOWN: (engine.DOWN, engine.DOWN_RELEASE),
+    pygame.K_SPACE: (engine.HARD_DROP, None),
+}
+
+# Modo de renderização: redesenha apenas as regiões alteradas a cada quadro
+# (fundo estático em cache + pygame.display.update(rects)). Com False, a
+# tela inteira é redesenhada por draw_window a cada quadro.
+DIRTY_RENDERING = True
+
+# Taxa de quadros da tela. A lógica do jogo avança em passos fixos de
+# engine.TICK_MS, então a velocidade da peça é a mesma a 30, 60 ou 240 fps.
+RENDER_FPS = 60
+# Limite de tempo simulado por quadro, para não tentar recuperar de uma
+# travada longa (ex.: janela arrastada) com centenas de passos de uma vez.
+MAX_FRAME_MS = 250
+
+# Jogador automático (python main.py --autoplay), para demonstrações e
+# testes de carga. Espera alguns passos antes de cada jogada para que dê
+# para acompanhar na tela. Com --bot-weights <arquivo> usa os pesos de um
+# checkpoint do tune_bot.py.
+AUTOPLAY = False
+AUTOPLAY_DELAY_TICKS = 10
+AUTOPLAY_WEIGHTS = None
+
+# Medição do tempo de cada fase do quadro (python main.py --profile, ou F3
+# durante a partida); os resultados vão para profiles/ ao sair.
+PROFILE_TOGGLE_KEY = pygame.K_F3
+
+# Animações das telas de espera: o aviso da tela de Game Over pisca, e os
+# pontos de 'Aguardando adversário...' andam. Entre um quadro e outro a
+# tela dorme em run_modal (veja modal_screen.py).
+PROMPT_BLINK_MS = 500
+WAIT_DOTS_MS = 400
+
+# Transmissão da partida para espectadores (python main.py --broadcast
+# [PORTA]; veja broadcast.py). None = sem transmissão.
+broadcaster = None
+
+# Modo versus (python main.py --versus HOST:PORTA): o tabuleiro do
+# adversário aparece em miniatura à esquerda. A thread da rede avisa a
+# interface (partida começou, acabou, conexão caiu) com este evento.
+VERSUS_EVENT = pygame.USEREVENT + 1
+opponent_block = 15
+opponent_x = 100
+opponent_y = top_left_y + 100
+
+
+def ghost_color_of(color):
+    """Cor escurecida usada para desenhar a peça fantasma."""
+    return tuple(c // 4 for c in color)
 
 
 def draw_next_shape(shape, surface):
     """Desenha a próxima peça no canto superior direito."""
-    try:
-        font = pygame.font.Font(FONT_PATH, 30)
-    except FileNotFoundError:
-        print(
-            f"Erro: Fonte não encontrada em {FONT_PATH}. Usando fonte padrão.")
-        font = pygame.font.SysFont('comicsans', 30)
-    label = font.render('Próxima Peça', 1, (255, 255, 255))
+    label = render_text(get_font(30), 'Próxima Peça', (255, 255, 255))
 
     sx_next_shape = top_left_x + play_width + 100
     sy_next_shape = top_left_y + 80
 
-    format = shape.shape[shape.rotation % len(shape.shape)]
-    for i, line in enumerate(format):
-        row = list(line)
-        for j, column in enumerate(row):
-            if column == '0':
-                # Desenha a peça com cor sólida
-                pygame.draw.rect(surface, shape.color,
-                                 (sx_next_shape + j*block_size, sy_next_shape + i*block_size, block_size, block_size), 0)
-
+    draw_next_piece_cells(shape, surface)
     surface.blit(label, (sx_next_shape + 10, sy_next_shape - 30))
 
 
-def update_score(nscore):
-    """Atualiza o recorde se a nova pontuação for maior."""
-    score = max_score()
-
-    with open('scores.txt', 'w') as f:
-        if int(score) > nscore:
-            f.write(str(score))
-        else:
-            f.write(str(nscore))
-
-
-def max_score():
-    """Lê o recorde do arquivo scores.txt."""
-    try:
-        with open('scores.txt', 'r') as f:
-            lines = f.readlines()
-            if len(lines) > 0:
-                try:
-                    score = int(lines[0].strip())
-                except ValueError:
-                    score = 0
-            else:
-                score = 0
-    except FileNotFoundError:
-        score = 0
+def draw_next_piece_cells(shape, surface):
+    """Desenha apenas os blocos da próxima peça, sem o rótulo."""
+    sx_next_shape = top_left_x + play_width + 100
+    sy_next_shape = top_left_y + 80
 
-    return str(score)
+    for j, i in shape.compiled().template:
+        # Desenha a peça com cor sólida
+        pygame.draw.rect(surface, shape.color,
+                         (sx_next_shape + j*block_size, sy_next_shape + i*block_size, block_size, block_size), 0)
 
 
 def draw_window(surface, grid, current_score, high_score):
     """Desenha todos os elementos do jogo na tela principal."""
     surface.fill((0, 0, 0))  # Preenche o fundo geral da janela com preto
 
-    try:
-        font_title = pygame.font.Font(FONT_PATH, 60)
-        font_scores = pygame.font.Font(FONT_PATH, 30)
-    except FileNotFoundError:
-        print(
-            f"Erro: Fonte não encontrada em {FONT_PATH}. Usando fonte padrão.")
-        font_title = pygame.font.SysFont('comicsans', 60)
-        font_scores = pygame.font.SysFont('comicsans', 30)
+    font_title = get_font(60)
+    font_scores = get_font(30)
 
     # Título do jogo (centralizado na parte superior da tela)
-    label_title = font_title.render('TETRIS', 1, (255, 255, 255))
+    label_title = render_text(font_title, 'TETRIS', (255, 255, 255))
     title_x = s_width / 2 - (label_title.get_width() / 2)
     title_y = 20
     surface.blit(label_title, (title_x, title_y))
 
     # Pontuação do Jogador (P = <pontos do jogador>)
-    label_player_score = font_scores.render(
-        f'P = {current_score}', 1, (255, 255, 255))
+    label_player_score = render_text(
+        font_scores, f'P = {current_score}', (255, 255, 255))
     sx_player_elements = top_left_x + play_width + 100
     sy_player_score = top_left_y + 250
     surface.blit(label_player_score, (sx_player_elements, sy_player_score))
 
     # Recorde do Jogo (GR = <recorde atual>)
-    label_game_record = font_scores.render(
-        f'GR = {high_score}', 1, (255, 255, 255))
+    label_game_record = render_text(
+        font_scores, f'GR = {high_score}', (255, 255, 255))
     sx_game_record = sx_player_elements
     sy_game_record = sy_player_score + label_player_score.get_height() + 10
     surface.blit(label_game_record, (sx_game_record, sy_game_record))
@@ -301,368 +149,755 @@ def draw_window(surface, grid, current_score, high_score):
                 pygame.draw.rect(surface, block_color,
                                  (top_left_x + j*block_size, top_left_y + i*block_size, block_size, block_size), 0)
 
-    # Desenha as linhas da grade por cima dos blocos
-    for i in range(len(grid)):
+    # Desenha as linhas da grade e a borda por cima dos blocos
+    draw_grid_lines(surface)
+
+
+def draw_grid_lines(surface):
+    """Desenha as linhas da grade e a borda vermelha da área de jogo."""
+    for i in range(play_height // block_size):
         pygame.draw.line(surface, (128, 128, 128), (top_left_x, top_left_y +
                          i*block_size), (top_left_x+play_width, top_left_y + i*block_size), 1)
-        for j in range(len(grid[i])):
-            pygame.draw.line(surface, (128, 128, 128), (top_left_x + j*block_size,
-                             top_left_y), (top_left_x + j*block_size, top_left_y + play_height), 1)
+    for j in range(play_width // block_size):
+        pygame.draw.line(surface, (128, 128, 128), (top_left_x + j*block_size,
+                         top_left_y), (top_left_x + j*block_size, top_left_y + play_height), 1)
 
     # Desenha a borda da área de jogo (a borda vermelha)
     pygame.draw.rect(surface, (255, 0, 0), (top_left_x,
                      top_left_y, play_width, play_height), 5)
 
 
-def draw_game_over_screen(surface, final_score, high_score):
-    """Desenha a tela de Game Over."""
-    overlay = pygame.Surface((s_width, s_height), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    surface.blit(overlay, (0, 0))
-
-    try:
-        font_game_over = pygame.font.Font(FONT_PATH, 80)
-        font_scores = pygame.font.Font(FONT_PATH, 40)
-        font_prompt = pygame.font.Font(FONT_PATH, 25)
-    except FileNotFoundError:
-        print(
-            f"Erro: Fonte não encontrada em {FONT_PATH}. Usando fonte padrão.")
-        font_game_over = pygame.font.SysFont("comicsans", 80, bold=True)
-        font_scores = pygame.font.SysFont("comicsans", 40, bold=True)
-        font_prompt = pygame.font.SysFont("comicsans", 25)
-
-    # Título Game Over
-    label_game_over = font_game_over.render('GAME OVER', True, (255, 255, 255))
-    rect_game_over = label_game_over.get_rect(
-        center=(s_width / 2, s_height / 2 - 100))
-    surface.blit(label_game_over, rect_game_over)
-
-    # Pontuação Atual
-    label_final_score = font_scores.render(
-        f'Sua Pontuação: {final_score}', True, (255, 255, 255))
-    rect_final_score = label_final_score.get_rect(
-        center=(s_width / 2, s_height / 2 - 20))
-    surface.blit(label_final_score, rect_final_score)
-
-    # High Score
-    label_high_score = font_scores.render(
-        f'Recorde: {high_score}', True, (255, 255, 255))
-    rect_high_score = label_high_score.get_rect(
-        center=(s_width / 2, s_height / 2 + 40))
-    surface.blit(label_high_score, rect_high_score)
-
-    # Prompt para o usuário
-    label_prompt = font_prompt.render(
-        'Pressione ESPAÇO para jogar novamente ou ESC para o menu', True, (200, 200, 200))
-    rect_prompt = label_prompt.get_rect(
-        center=(s_width / 2, s_height / 2 + 120))
-    surface.blit(label_prompt, rect_prompt)
-
-    pygame.display.update()
-
-    waiting_for_input = True
-    while waiting_for_input:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return "quit"
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    return "restart"
-                if event.key == pygame.K_ESCAPE:
-                    return "menu"
-
-
-def main(win):
-    audio.play_music('game')
-    pause_menu = PauseMenu(win, audio)
-
-    locked_positions = {}
-    current_piece = get_shape()
-    next_piece = get_shape()
-    clock = pygame.time.Clock()
-
-    change_piece = False
-    run = True
-    paused = False
-
-    fall_time = 0
-    level_time = 0
-    score = 0
-
-    # Ajustando as velocidades para valores fixos
-    # Velocidade inicial mais rápida (menor = mais rápido)
-    base_fall_speed = 0.1
-    fast_fall_speed = 0.15  # Velocidade após 60 segundos
-    soft_drop_multiplier = 0.4
-
-    lock_delay_ms = 500
-    lock_delay_start_time = None
-
-    das_delay_ms = 150
-    arr_delay_ms = 30
-
-    left_pressed_time = 0
-    right_pressed_time = 0
-
-    while run:
-        current_time_ms = pygame.time.get_ticks()
-        current_high_score_in_game = max_score()
-
-        grid = create_grid(locked_positions)
-
-        shape_pos = convert_shape_format(current_piece)
-
-        fall_time += clock.get_rawtime()
-        level_time += clock.get_rawtime()
-        clock.tick(60)
-
-        # Modificando o sistema de levels para mudar apenas uma vez após 60 segundos
-        if level_time / 1000 > 60:  # 60 segundos
-            base_fall_speed = fast_fall_speed
-            if not hasattr(main, 'level_up_played'):
-                audio.play_sound('level_up')
-                main.level_up_played = True
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                run = False
-
-            if event.type == pygame.KEYDOWN:
-                if not paused:
-                    if event.key == pygame.K_LEFT:
-                        current_piece.x -= 1
-                        if not valid_space(current_piece, grid, locked_positions):
-                            current_piece.x += 1
-                        else:
-                            audio.play_sound('move')
-                            lock_delay_start_time = None
-                        left_pressed_time = current_time_ms
-
-                    elif event.key == pygame.K_RIGHT:
-                        current_piece.x += 1
-                        if not valid_space(current_piece, grid, locked_positions):
-                            current_piece.x -= 1
-                        else:
-                            audio.play_sound('move')
-                            lock_delay_start_time = None
-                        right_pressed_time = current_time_ms
-
-                    elif event.key == pygame.K_UP:
-                        original_rotation = current_piece.rotation
-                        original_x = current_piece.x
-                        original_y = current_piece.y
-
-                        current_piece.rotation = (
-                            current_piece.rotation + 1) % len(current_piece.shape)
-
-                        rotated_successfully = False
-                        for dx, dy in WALL_KICKS:
-                            current_piece.x = original_x + dx
-                            current_piece.y = original_y + dy
-                            if valid_space(current_piece, grid, locked_positions):
-                                rotated_successfully = True
-                                audio.play_sound('rotate')
-                                test_piece_below = Piece(
-                                    current_piece.x, current_piece.y + 1, current_piece.shape)
-                                test_piece_below.rotation = current_piece.rotation
-                                if not valid_space(test_piece_below, grid, locked_positions):
-                                    lock_delay_start_time = current_time_ms
-                                break
-                            else:
-                                current_piece.x = original_x
-                                current_piece.y = original_y
-
-                        if not rotated_successfully:
-                            current_piece.rotation = original_rotation
-                            current_piece.x = original_x
-                            current_piece.y = original_y
-                        else:
-                            left_pressed_time = 0
-                            right_pressed_time = 0
-
-                    elif event.key == pygame.K_DOWN:
-                        current_piece.y += 1
-                        if not valid_space(current_piece, grid, locked_positions):
-                            current_piece.y -= 1
-                            if lock_delay_start_time is None:
-                                lock_delay_start_time = current_time_ms
-                        else:
-                            audio.play_sound('move')
-                            lock_delay_start_time = None
-                            fall_time = 0
-
-                    elif event.key == pygame.K_SPACE:
-                        audio.play_sound('drop')
-                        while valid_space(current_piece, grid, locked_positions):
-                            current_piece.y += 1
-                        current_piece.y -= 1
-                        change_piece = True
-                        lock_delay_start_time = None
-
-                if event.key == pygame.K_p:
-                    paused = not paused
-                    if paused:
+class PlayfieldRenderer:
+    """
+    Desenha a tela do jogo redesenhando apenas o que mudou.
+
+    O fundo estático (título, grade e borda) é composto uma única vez em uma
+    superfície própria. A cada quadro só as células alteradas e os textos
+    de pontuação que mudaram são redesenhados (`draw`), e a próxima peça só
+    quando ela muda (`draw_next`); os dois retornam os retângulos sujos para
+    `pygame.display.update(rects)`.
+    """
+
+    def __init__(self, surface):
+        self.surface = surface
+
+        # Fundo: tudo o que não muda durante a partida
+        self.background = pygame.Surface(surface.get_size())
+        self.background.fill((0, 0, 0))
+        label_title = render_text(get_font(60), 'TETRIS', (255, 255, 255))
+        self.background.blit(
+            label_title, (s_width / 2 - (label_title.get_width() / 2), 20))
+        label_next = render_text(get_font(30), 'Próxima Peça', (255, 255, 255))
+        self.next_x = top_left_x + play_width + 100
+        self.next_y = top_left_y + 80
+        self.background.blit(label_next, (self.next_x + 10, self.next_y - 30))
+        draw_grid_lines(self.background)
+
+        # Linhas da grade por cima dos blocos (preto = transparente)
+        self.lines = pygame.Surface((play_width, play_height))
+        self.lines.fill((0, 0, 0))
+        self.lines.set_colorkey((0, 0, 0))
+        self.lines.blit(self.background, (0, 0),
+                        (top_left_x, top_left_y, play_width, play_height))
+
+        self.next_rect = pygame.Rect(
+            self.next_x, self.next_y, 5 * block_size, 5 * block_size)
+        self.invalidate()
+
+    def invalidate(self):
+        """Força um redesenho completo no próximo quadro (ex.: após um menu)."""
+        self.last_grid = None
+        self.last_next = None
+        self.score_text = None
+        self.record_text = None
+        self.score_rect = None
+        self.record_rect = None
+
+    def draw_cell(self, x, y, color):
+        rect = pygame.Rect(top_left_x + x*block_size, top_left_y + y*block_size,
+                           block_size, block_size)
+        self.surface.blit(self.background, rect, rect)
+        if color != (0, 0, 0):
+            pygame.draw.rect(self.surface, color, rect, 0)
+            self.surface.blit(
+                self.lines, rect, rect.move(-top_left_x, -top_left_y))
+        return rect
+
+    def draw_label(self, text, pos, old_rect):
+        """Troca um texto do HUD, limpando a área do texto anterior."""
+        if old_rect is not None:
+            self.surface.blit(self.background, old_rect, old_rect)
+        label = render_text(get_font(30), text, (255, 255, 255))
+        rect = self.surface.blit(label, pos)
+        return rect, (rect.union(old_rect) if old_rect is not None else rect)
+
+    def draw(self, grid, current_score, high_score):
+        """Atualiza o tabuleiro e o HUD e retorna os retângulos alterados."""
+        dirty = []
+        full = self.last_grid is None
+        if full:
+            self.surface.blit(self.background, (0, 0))
+            dirty.append(self.surface.get_rect())
+
+        for i, row in enumerate(grid):
+            last_row = None if full else self.last_grid[i]
+            for j, color in enumerate(row):
+                if full:
+                    if color != (0, 0, 0):
+                        self.draw_cell(j, i, color)
+                elif last_row[j] != color:
+                    dirty.append(self.draw_cell(j, i, color))
+        self.last_grid = [row[:] for row in grid]
+        if full:
+            # O fundo cobriu a prévia: draw_next a desenha de novo
+            self.last_next = None
+
+        score_text = f'P = {current_score}'
+        sy_player_score = top_left_y + 250
+        if score_text != self.score_text:
+            self.score_rect, rect = self.draw_label(
+                score_text, (self.next_x, sy_player_score), self.score_rect)
+            self.score_text = score_text
+            dirty.append(rect)
+
+        record_text = f'GR = {high_score}'
+        if record_text != self.record_text:
+            sy_game_record = sy_player_score + self.score_rect.height + 10
+            self.record_rect, rect = self.draw_label(
+                record_text, (self.next_x, sy_game_record), self.record_rect)
+            self.record_text = record_text
+            dirty.append(rect)
+
+        return [self.surface.get_rect()] if full else dirty
+
+    def draw_next(self, next_piece):
+        """Redesenha a prévia da próxima peça se ela mudou."""
+        next_key = (next_piece.index, next_piece.rotation)
+        if next_key == self.last_next:
+            return []
+        self.surface.blit(self.background, self.next_rect, self.next_rect)
+        draw_next_piece_cells(next_piece, self.surface)
+        self.last_next = next_key
+        return [self.next_rect]
+
+
+class GameOverScreen:
+    """Tela de Game Over: overlay e textos fixos criados uma única vez."""
+
+    def __init__(self, win):
+        self.win = win
+        self.overlay = pygame.Surface((s_width, s_height), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 180))
+
+        self.font_scores = get_font(40, bold=True)
+
+        # Título Game Over
+        self.label_game_over = render_text(
+            get_font(80, bold=True), 'GAME OVER', (255, 255, 255))
+        self.rect_game_over = self.label_game_over.get_rect(
+            center=(s_width / 2, s_height / 2 - 100))
+
+        # Prompt para o usuário
+        self.label_prompt = render_text(
+            get_font(25), 'Pressione ESPAÇO para jogar novamente ou ESC para o menu', (200, 200, 200))
+        self.rect_prompt = self.label_prompt.get_rect(
+            center=(s_width / 2, s_height / 2 + 120))
+
+    def run(self, final_score, high_score, title=None):
+        """
+        Desenha a tela de Game Over e retorna a escolha do jogador. `title`
+        troca o 'GAME OVER' (ex.: resultado de uma partida versus).
+        """
+        surface = self.win
+        surface.blit(self.overlay, (0, 0))
+        if title is None:
+            surface.blit(self.label_game_over, self.rect_game_over)
+        else:
+            label = render_text(get_font(80, bold=True), title, (255, 255, 255))
+            surface.blit(label, label.get_rect(center=self.rect_game_over.center))
+
+        # Pontuação Atual
+        label_final_score = render_text(
+            self.font_scores, f'Sua Pontuação: {final_score}', (255, 255, 255))
+        rect_final_score = label_final_score.get_rect(
+            center=(s_width / 2, s_height / 2 - 20))
+        surface.blit(label_final_score, rect_final_score)
+
+        # High Score
+        label_high_score = render_text(
+            self.font_scores, f'Recorde: {high_score}', (255, 255, 255))
+        rect_high_score = label_high_score.get_rect(
+            center=(s_width / 2, s_height / 2 + 40))
+        surface.blit(label_high_score, rect_high_score)
+
+        # Fundo fixo da tela; só o aviso pisca por cima dele
+        backdrop = surface.copy()
+        shown = time.monotonic()
+
+        def draw():
+            surface.blit(backdrop, (0, 0))
+            # Aceso nos quadros pares, contados desde que a tela apareceu
+            frame = round((time.monotonic() - shown) * 1000 / PROMPT_BLINK_MS)
+            if frame % 2 == 0:
+                surface.blit(self.label_prompt, self.rect_prompt)
+            pygame.display.update()
+
+        return run_modal(game_over_event, draw, frame_ms=PROMPT_BLINK_MS)
+
+
+def game_over_event(event):
+    """Escolha na tela de Game Over (None enquanto nenhuma tecla válida)."""
+    if event.type == pygame.QUIT:
+        return "quit"
+    if event.type == pygame.KEYDOWN:
+        if event.key == pygame.K_SPACE:
+            return "restart"
+        if event.key == pygame.K_ESCAPE:
+            return "menu"
+    return None
+
+
+class GameScene:
+    """
+    A partida em andamento. O objeto (motor, gravador, renderizador) é
+    criado uma vez e reaproveitado: `new_game` apenas zera o estado.
+    """
+
+    def __init__(self, win):
+        self.win = win
+        self.autoplayer = None
+        self.clock = pygame.time.Clock()
+        self.renderer = PlayfieldRenderer(win) if DIRTY_RENDERING else None
+        self.create_engine()
+        self.new_game()
+
+    def create_engine(self):
+        """Cria o motor da cena e o gravador das entradas."""
+        self.engine = Engine()
+        self.recorder = Recorder(self.engine)
+
+    def new_game(self, seed=None):
+        """Começa outra partida, com nova semente, sem recriar os objetos."""
+        self.engine.reset(seed)
+        self.recorder.reset()
+        if AUTOPLAY:
+            self.autoplayer = AutoPlayer(Bot(AUTOPLAY_WEIGHTS),
+                                         delay_ticks=AUTOPLAY_DELAY_TICKS)
+        # O som de subida de nível toca uma vez por partida
+        self.level_up_played = False
+        self.resume()
+
+    def resume(self):
+        """Volta a rodar depois de um menu: a tela inteira será redesenhada."""
+        if self.renderer is not None:
+            self.renderer.invalidate()
+        # O tempo parado fora da partida não conta para a simulação
+        self.clock.tick()
+        # Tempo real ainda não simulado e ações ainda não entregues ao motor.
+        # A espera para travar a peça recomeça pela ação RESUME, que passa
+        # por step() e fica no replay
+        self.accumulator = 0
+        self.actions = []
+        if self.engine.state.lock_delay_start_time is not None:
+            self.actions.append(engine.RESUME)
+
+    # Pontos de extensão usados pelo modo versus
+
+    def ready(self):
+        """Cena a rodar depois de new_game (a partida local começa já)."""
+        return 'game'
+
+    def tick(self, actions):
+        """Um passo do motor; retorna os eventos."""
+        return self.recorder.step(actions)
+
+    def finished(self):
+        return self.engine.state.lost
+
+    def finish_game(self):
+        """Registra a partida que acabou de terminar."""
+        state = self.engine.state
+        scores.record_game(state.score, state.lines)
+        save_replay(self.recorder.finish())
+
+    def abandon(self):
+        """O jogador saiu da partida pelo menu de pausa."""
+
+    def game_over_title(self):
+        return None
+
+    def draw_extras(self, full_redraw):
+        """Desenha o que mais a cena mostrar; retorna os retângulos alterados."""
+        return []
+
+    def run(self):
+        """Roda a partida até ela pedir outra cena: 'pause', 'game_over' ou 'quit'."""
+        win = self.win
+        state = self.engine.state
+        renderer = self.renderer
+        clock = self.clock
+
+        while True:
+            current_high_score_in_game = scores.high_score
+
+            self.accumulator = min(self.accumulator + clock.tick(RENDER_FPS), MAX_FRAME_MS)
+            profiler.start_frame()
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return 'quit'
+
+                if event.type == pygame.KEYDOWN:
+                    if event.key in KEY_ACTIONS:
+                        self.actions.append(KEY_ACTIONS[event.key][0])
+
+                    if event.key == PROFILE_TOGGLE_KEY:
+                        profiler.toggle()
+
+                    if event.key == pygame.K_p:
                         audio.play_sound('pause')
                         audio.pause_music()
-                    else:
-                        audio.unpause_music()
-
-            if event.type == pygame.KEYUP:
-                if event.key == pygame.K_LEFT:
-                    left_pressed_time = 0
-                elif event.key == pygame.K_RIGHT:
-                    right_pressed_time = 0
-                elif event.key == pygame.K_DOWN:
-                    pass
-
-        if not paused:
-            if left_pressed_time != 0 and current_time_ms - left_pressed_time > das_delay_ms:
-                if (current_time_ms - left_pressed_time - das_delay_ms) % arr_delay_ms < (clock.get_rawtime() / 1000 * 1000):
-                    current_piece.x -= 1
-                    if not valid_space(current_piece, grid, locked_positions):
-                        current_piece.x += 1
-                    else:
-                        audio.play_sound('move')
-                        lock_delay_start_time = None
-
-            if right_pressed_time != 0 and current_time_ms - right_pressed_time > das_delay_ms:
-                if (current_time_ms - right_pressed_time - das_delay_ms) % arr_delay_ms < (clock.get_rawtime() / 1000 * 1000):
-                    current_piece.x += 1
-                    if not valid_space(current_piece, grid, locked_positions):
-                        current_piece.x -= 1
-                    else:
-                        audio.play_sound('move')
-                        lock_delay_start_time = None
-
-            current_fall_speed = base_fall_speed
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_DOWN]:
-                current_fall_speed *= soft_drop_multiplier
-
-            test_piece_below = Piece(
-                current_piece.x, current_piece.y + 1, current_piece.shape)
-            test_piece_below.rotation = current_piece.rotation
-            can_fall_naturally = valid_space(
-                test_piece_below, grid, locked_positions)
-
-            if not can_fall_naturally:
-                if lock_delay_start_time is None:
-                    lock_delay_start_time = current_time_ms
-                elif (current_time_ms - lock_delay_start_time) >= lock_delay_ms:
-                    change_piece = True
-                    lock_delay_start_time = None
-            else:
-                lock_delay_start_time = None
-
-                if fall_time/1000 >= current_fall_speed:
-                    fall_time = 0
-                    current_piece.y += 1
-                    if not valid_space(current_piece, grid, locked_positions):
-                        current_piece.y -= 1
-                        change_piece = True
-                        if lock_delay_start_time is None:
-                            lock_delay_start_time = current_time_ms
-                    else:
-                        lock_delay_start_time = None
-
-            temp_grid = [row[:] for row in grid]
-            for pos in shape_pos:
-                x, y = pos
+                        return 'pause'
+
+                if event.type == pygame.KEYUP:
+                    if event.key in KEY_ACTIONS and KEY_ACTIONS[event.key][1]:
+                        self.actions.append(KEY_ACTIONS[event.key][1])
+
+            profiler.lap('events')
+
+            while self.accumulator >= engine.TICK_MS:
+                self.accumulator -= engine.TICK_MS
+                if self.autoplayer is not None:
+                    self.actions = self.actions + self.autoplayer.actions(state)
+                for ev in self.tick(self.actions):
+                    if ev == engine.EV_LOCK:
+                        continue
+                    if ev == engine.EV_LEVEL_UP:
+                        if self.level_up_played:
+                            continue
+                        self.level_up_played = True
+                    audio.play_sound(ev)
+                self.actions = []
+
+            if broadcaster is not None:
+                broadcaster.publish(state, current_high_score_in_game)
+
+            profiler.lap('logic')
+
+            grid = create_grid(state.board)
+            # Peça fantasma: mostra onde a peça atual vai parar
+            ghost_color = ghost_color_of(state.current_piece.color)
+            for x, y in state.ghost_positions():
                 if y > -1:
-                    temp_grid[y][x] = current_piece.color
-
-            draw_window(win, temp_grid, score, current_high_score_in_game)
-            draw_next_shape(next_piece, win)
-
-            if change_piece:
-                for pos in shape_pos:
-                    p = (pos[0], pos[1])
-                    locked_positions[p] = current_piece.color
-
-                current_piece = next_piece
-                next_piece = get_shape()
-                change_piece = False
-
-                left_pressed_time = 0
-                right_pressed_time = 0
-
-                grid = create_grid(locked_positions)
-
-                rows_cleared = clear_rows(grid, locked_positions)
-
-                if rows_cleared == 1:
-                    score += 100
-                elif rows_cleared == 2:
-                    score += 300
-                elif rows_cleared == 3:
-                    score += 500
-                elif rows_cleared == 4:
-                    score += 800
-                    audio.play_sound('rocket')
-
-                if rows_cleared > 0:
-                    audio.play_sound('clear')
-
-            if check_lost(locked_positions):
-                audio.play_sound('game_over')
-                update_score(score)
-                current_high_score_after_game = max_score()
-
-                action = draw_game_over_screen(
-                    win, score, current_high_score_after_game)
-
-                if action == "restart":
-                    audio.stop_music()
-                    return main(win)
-                elif action == "menu":
-                    audio.stop_music()
-                    return
-                elif action == "quit":
-                    run = False
-        else:  # Se estiver pausado
-            audio.pause_music()
-            action = pause_menu.run(win)
-
-            if action == "continue":
-                paused = False
-                audio.unpause_music()
-                lock_delay_start_time = None
-            elif action == "restart":
-                audio.stop_music()
-                return main(win)
-            elif action == "menu":
-                audio.stop_music()
-                return
-            elif action == "quit":
-                run = False
-
+                    grid[y][x] = ghost_color
+            for x, y in state.piece_positions():
+                if y > -1:
+                    grid[y][x] = state.current_piece.color
+
+            if renderer is not None:
+                full_redraw = renderer.last_grid is None
+                dirty_rects = renderer.draw(
+                    grid, state.score, current_high_score_in_game)
+                dirty_rects += self.draw_extras(full_redraw)
+                profiler.lap('draw_window')
+                dirty_rects += renderer.draw_next(state.next_piece)
+                profiler.lap('draw_next_shape')
+                dirty_rects += profiler.draw_overlay(
+                    win, renderer.background, force=full_redraw)
+            else:
+                draw_window(win, grid, state.score, current_high_score_in_game)
+                self.draw_extras(True)
+                profiler.lap('draw_window')
+                draw_next_shape(state.next_piece, win)
+                profiler.lap('draw_next_shape')
+                profiler.draw_overlay(win, force=True)
+                dirty_rects = None
+
+            if self.finished():
+                self.finish_game()
+                return 'game_over'
+
+            if dirty_rects is None:
+                pygame.display.update()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
+            profiler.lap('display_update')
+            profiler.end_frame()
+
+
+def draw_opponent(surface, view, footer):
+    """Tabuleiro do adversário em miniatura, pontuação e `footer`; retorna a área."""
+    width = 10 * opponent_block
+    height = 20 * opponent_block
+    area = pygame.Rect(opponent_x - 10, opponent_y - 45, width + 120, height + 135)
+    surface.fill((0, 0, 0), area)
+
+    label = render_text(get_font(30), 'Adversário', (255, 255, 255))
+    surface.blit(label, (opponent_x, opponent_y - 40))
+    for x, y, color in view.cells():
+        pygame.draw.rect(surface, color, (opponent_x + x * opponent_block,
+                                          opponent_y + y * opponent_block,
+                                          opponent_block, opponent_block))
+    pygame.draw.rect(surface, (255, 0, 0),
+                     (opponent_x, opponent_y, width, height), 2)
+
+    font = get_font(25)
+    surface.blit(render_text(font, f'P = {view.score}', (255, 255, 255)),
+                 (opponent_x, opponent_y + height + 10))
+    surface.blit(render_text(font, footer, (200, 200, 200)),
+                 (opponent_x, opponent_y + height + 45))
+    return area
+
+
+def waiting_frames(win):
+    """
+    Função de desenho da espera pelo adversário: a cada quadro de
+    WAIT_DOTS_MS os pontos de 'Aguardando adversário...' avançam um.
+    """
+    font = get_font(60, bold=True)
+    text = 'Aguardando adversário'
+    # Posição fixa, centrada com os três pontos, para o texto não pular
+    left = (s_width - render_text(font, text + '...', (255, 255, 255)).get_width()) // 2
+    shown = time.monotonic()
+
+    def draw():
+        frame = round((time.monotonic() - shown) * 1000 / WAIT_DOTS_MS)
+        label = render_text(font, text + '.' * (frame % 3 + 1), (255, 255, 255))
+        win.fill((0, 0, 0))
+        win.blit(label, (left, s_height / 2 - label.get_height() / 2))
         pygame.display.update()
 
+    return draw
 
-if __name__ == "__main__":
-    win = pygame.display.set_mode((s_width, s_height))
-    pygame.display.set_caption('Tetris')
 
-    # load_block_sprites() # Comentado, pois não usaremos sprites
+def versus_wait_event(event):
+    """Espera pelo adversário: ESC volta ao menu."""
+    if event.type == pygame.QUIT:
+        return 'quit'
+    if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+        return 'menu'
+    if event.type == VERSUS_EVENT and event.kind in ('start', 'disconnected'):
+        return event.kind
+    return None
 
-    audio = AudioManager()
 
-    audio.add_music('menu', 'assets/audio/music/main_theme.mp3')
-    audio.add_music('game', 'assets/audio/music/game_theme.mp3')
+class VersusScene(GameScene):
+    """
+    Partida contra outro jogador pela rede. O motor é o mesmo; a cada passo
+    o lixo recebido entra no jogo e os ataques e o delta do tabuleiro vão
+    para o servidor. A semente vem do servidor, então as partidas versus
+    não são gravadas em replay (o lixo recebido não está nas entradas).
+    """
 
-    audio.load_sound('rotate', 'assets/audio/effects/rotate_piece.wav')
-    audio.load_sound('move', 'assets/audio/effects/move_piece.wav')
-    audio.load_sound('drop', 'assets/audio/effects/piece_landed.wav')
-    audio.load_sound('clear', 'assets/audio/effects/line_clear.wav')
-    audio.load_sound('level_up', 'assets/audio/effects/level_up_jingle.wav')
-    audio.load_sound('game_over', 'assets/audio/effects/game_over.wav')
-    audio.load_sound('rocket', 'assets/audio/effects/rocket_ending_sound.wav')
-    audio.load_sound('pause', 'assets/audio/effects/pause_sound.wav')
+    def __init__(self, win, connection):
+        self.net = connection
+        super().__init__(win)
+        self.engine.versus = True
+        self.link = MatchLink(self.engine, connection.send)
+        self.panel_key = None
+
+    def ready(self):
+        """Entra na fila do servidor e espera o adversário."""
+        net = self.net
+        net.poll()
+        if net.match.in_match:
+            # Saiu da partida anterior sem terminá-la: conta como derrota
+            net.send(MSG_LOST)
+        net.find_match()
+        action = run_modal(versus_wait_event, waiting_frames(self.win),
+                           frame_ms=WAIT_DOTS_MS)
+        # O aviso do pygame chega depois da mensagem já estar na fila
+        net.poll()
+        if action == 'disconnected' or (action == 'start' and net.match.seed is None):
+            print("Conexão com o servidor versus perdida.")
+            return 'quit'
+        if action != 'start':
+            net.cancel()
+            return action
+
+        self.new_game(net.match.seed)
+        self.link.reset()
+        self.panel_key = None
+        return 'game'
+
+    def tick(self, actions):
+        self.net.poll()
+        self.link.receive(self.net.match.garbage)
+        events = super().tick(actions)
+        self.link.publish()
+        return events
+
+    def finished(self):
+        self.net.poll()
+        match = self.net.match
+        return (self.engine.state.lost or match.result is not None
+                or not match.connected)
+
+    def finish_game(self):
+        state = self.engine.state
+        # Garante o aviso de derrota mesmo se o passo final não publicou
+        self.link.publish()
+        scores.record_game(state.score, state.lines)
+
+    def abandon(self):
+        self.net.poll()
+        if self.net.match.in_match:
+            self.net.send(MSG_LOST)
+
+    def game_over_title(self):
+        match = self.net.match
+        if self.engine.state.lost or match.result == 'lost':
+            return 'DERROTA'
+        if match.result == 'won':
+            return 'VITÓRIA'
+        return 'CONEXÃO PERDIDA'
+
+    def draw_extras(self, full_redraw):
+        match = self.net.match
+        latency = match.latency_ms()
+        latency_text = 'Ping: -' if latency is None else f'Ping: {latency:.0f} ms'
+        key = (match.opponent.version, latency_text)
+        if key == self.panel_key and not full_redraw:
+            return []
+        self.panel_key = key
+        return [draw_opponent(self.win, match.opponent, latency_text)]
+
+
+class MatchReplayScene(GameScene):
+    """
+    Revê uma partida de torneio (python main.py --watch-match ID): os dois
+    bots jogam de novo com a mesma semente, o primeiro no tabuleiro
+    principal e o segundo em miniatura. As teclas do jogo são ignoradas.
+    """
 
-    main_menu = MainMenu(win, audio)
+    def __init__(self, win, record):
+        self.record = record
+        super().__init__(win)
+
+    def create_engine(self):
+        # Os motores são os da partida, criados de novo por new_game, e
+        # nada é gravado
+        self.recorder = None
+
+    def new_game(self, seed=None):
+        self.match = self.record.new_match()
+        self.engine = self.match.games[0]
+        self.opponent = tournament.GameView(self.match.games[1])
+        self.level_up_played = False
+        self.panel_key = None
+        self.resume()
+
+    def tick(self, actions):
+        # O laço de passos fixos ainda pode pedir passos no quadro em que a
+        # partida terminou; depois do fim, nenhum bot anda mais
+        if self.match.over:
+            return []
+        return self.match.step()[0]
+
+    def finished(self):
+        return self.match.over
+
+    def finish_game(self):
+        final_scores = tuple(game.state.score for game in self.match.games)
+        if (final_scores != self.record.scores
+                or self.match.winner() != self.record.winner):
+            print(f"Aviso: a partida {self.record.match_id} terminou diferente "
+                  f"do resultado gravado ({final_scores} contra {self.record.scores})")
+
+    def game_over_title(self):
+        winner = self.match.winner()
+        if winner is None:
+            return 'EMPATE'
+        return f'VENCE {self.record.names[winner]}'
+
+    def draw_extras(self, full_redraw):
+        key = self.opponent.version
+        if key == self.panel_key and not full_redraw:
+            return []
+        self.panel_key = key
+        return [draw_opponent(self.win, self.opponent, self.record.names[1])]
+
+
+class SceneManager:
+    """
+    Laço principal do jogo como máquina de estados. As cenas (menu,
+    configurações, partida, pausa e fim de jogo) são criadas uma vez e
+    reaproveitadas; cada uma roda até pedir a próxima pelo nome. Assim um
+    reinício não empilha chamadas nem recria menus e fontes.
+    """
+
+    def __init__(self, win, main_menu=None, make_game=GameScene):
+        self.win = win
+        # Cria a cena da partida: GameScene, ou a do modo versus ou a de
+        # rever uma partida de torneio
+        self.make_game = make_game
+        self.main_menu = main_menu or MainMenu(win, audio)
+        self.settings_menu = SettingsMenu(win, audio)
+        self.pause_menu = PauseMenu(win, audio)
+        self.game_over_screen = GameOverScreen(win)
+        self.game = None  # criada na primeira partida
+        self.scenes = {
+            'menu': self.show_menu,
+            'settings': self.show_settings,
+            'new_game': self.start_game,
+            'game': self.play,
+            'pause': self.show_pause,
+            'game_over': self.show_game_over,
+        }
+
+    def run(self, scene='menu'):
+        while scene != 'quit':
+            scene = self.scenes[scene]()
+
+    def show_menu(self):
+        action = self.main_menu.run()
+        if action == "play":
+            audio.stop_music()
+            return 'new_game'
+        if action == "settings":
+            # Ao entrar nas configurações, pausa a música do menu (se estiver tocando)
+            audio.pause_music()
+            return 'settings'
+        return 'quit'
+
+    def show_settings(self):
+        action = self.settings_menu.run(self.win)
+        if action == "back":
+            # Ao sair das configurações, despausa a música do menu (se estava tocando)
+            audio.unpause_music()
+            return 'menu'
+        return 'quit'
+
+    def start_game(self):
+        if self.game is None:
+            self.game = self.make_game(self.win)
+        else:
+            self.game.new_game()
+        scene = self.game.ready()
+        if scene != 'game':
+            return scene
+        # O menu de pausa volta à primeira opção a cada partida
+        self.pause_menu.selected_index = 0
+        audio.play_music('game')
+        return 'game'
+
+    def play(self):
+        return self.game.run()
+
+    def show_pause(self):
+        action = self.pause_menu.run(self.win)
+        if action == "continue":
+            audio.unpause_music()
+            self.game.resume()
+            return 'game'
+        self.game.abandon()
+        if action == "restart":
+            audio.stop_music()
+            return 'new_game'
+        if action == "menu":
+            audio.stop_music()
+            return 'menu'
+        return 'quit'
+
+    def show_game_over(self):
+        state = self.game.engine.state
+        action = self.game_over_screen.run(
+            state.score, scores.high_score, self.game.game_over_title())
+        if action == "restart":
+            audio.stop_music()
+            return 'new_game'
+        if action == "menu":
+            audio.stop_music()
+            return 'menu'
+        return 'quit'
+
+
+if __name__ == "__main__":
+    startup = StartupReport(STARTUP_START)
+    startup.phase('imports')
+
+    AUTOPLAY = '--autoplay' in sys.argv
+    profiler = FrameProfiler()
+    if '--profile' in sys.argv:
+        profiler.toggle()
+    if '--bot-weights' in sys.argv:
+        AUTOPLAY_WEIGHTS = load_weights(
+            sys.argv[sys.argv.index('--bot-weights') + 1])
+
+    # Com assets.pack (python asset_pack.py), fonte e sons vêm do pacote
+    # mapeado em memória; --no-pack força os arquivos soltos de assets/
+    if '--no-pack' not in sys.argv:
+        asset_pack.open_pack()
+    startup.phase('asset_pack')
+
+    win = pygame.display.set_mode((s_width, s_height))
+    pygame.display.set_caption('Tetris')
+    startup.phase('display')
 
-    while True:
-        if not main_menu.run(main):
-            break
+    # load_block_sprites() # Comentado, pois não usaremos sprites
 
+    audio = AudioManager()
+    startup.phase('mixer')
+    on_loaded = None
+    if '--startup-report' in sys.argv:
+        on_loaded = lambda: startup.assets_loaded(audio.load_times)
+    # O menu aparece sem esperar pelos áudios; um efeito que ainda não
+    # carregou simplesmente não toca
+    audio.load_in_background(STARTUP_MUSIC, STARTUP_SOUNDS, on_loaded)
+
+    scores = ScoreStore()
+    startup.phase('scores')
+
+    # O tempo até o menu aparecer é medido depois do primeiro quadro dele
+    # já estar na tela, dentro de SceneManager.run
+    main_menu = MainMenu(win, audio, startup.menu_ready if on_loaded is not None else None)
+    startup.phase('main_menu')
+
+    make_game = GameScene
+    connection = None
+    if '--versus' in sys.argv:
+        host, _, port = sys.argv[sys.argv.index('--versus') + 1].partition(':')
+        try:
+            connection = VersusConnection(
+                host, int(port or DEFAULT_PORT),
+                on_event=lambda kind: pygame.event.post(
+                    pygame.event.Event(VERSUS_EVENT, kind=kind)))
+        except (OSError, TimeoutError) as e:
+            print(f"Não foi possível conectar ao servidor versus: {e}")
+            pygame.quit()
+            sys.exit(1)
+        make_game = lambda win: VersusScene(win, connection)
+
+    if '--watch-match' in sys.argv:
+        match_id = int(sys.argv[sys.argv.index('--watch-match') + 1])
+        db_path = tournament.DB_PATH
+        if '--tournament-db' in sys.argv:
+            db_path = sys.argv[sys.argv.index('--tournament-db') + 1]
+        store = tournament.TournamentStore(db_path)
+        record = store.load_match(match_id)
+        store.close()
+        if record is None:
+            print(f"Partida {match_id} não encontrada em {db_path}")
+            pygame.quit()
+            sys.exit(1)
+        make_game = lambda win: MatchReplayScene(win, record)
+
+    if '--broadcast' in sys.argv:
+        args = sys.argv[sys.argv.index('--broadcast') + 1:]
+        port = int(args[0]) if args and args[0].isdigit() else broadcast.DEFAULT_PORT
+        broadcaster = broadcast.Broadcaster()
+        broadcaster.start_in_thread(port=port)
+        print(f"Transmitindo a partida na porta {port}")
+
+    # Para rever uma partida de torneio, vai direto para ela
+    first_scene = 'new_game' if '--watch-match' in sys.argv else 'menu'
+    SceneManager(win, main_menu, make_game).run(first_scene)
+
+    if broadcaster is not None:
+        broadcaster.stop()
+    if connection is not None:
+        connection.close()
+    scores.close()
+    for path in profiler.export():
+        print(f"Perfil salvo em {path}")
     pygame.quit()
@@ -0,0 +1,57 @@
+import time
+
+import pygame
+
+# Laço compartilhado das telas modais (menus e fim de jogo). Em vez de
+# girar a 60 fps chamando pygame.event.get(), a tela dorme em
+# pygame.event.wait até chegar uma entrada, então parada ela não gasta CPU.
+# Telas com animação informam `frame_ms`, e a espera passa a ter um limite
+# de tempo até o próximo quadro da animação.
+
+# O que handle_event retorna quando o evento mudou o que a tela mostra (a
+# seleção, um valor): a tela é redesenhada e continua rodando. Teclas que
+# não mudam nada não redesenham.
+REDRAW = object()
+
+# Eventos em que a janela volta a aparecer (restaurada depois de
+# minimizada, descoberta por outra janela) e o conteúdo precisa ser
+# redesenhado mesmo sem nenhuma tecla
+REDRAW_EVENTS = {pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED}
+
+
+def run_modal(handle_event, draw=None, frame_ms=None):
+    """
+    Roda uma tela modal até `handle_event(event)` retornar algo diferente
+    de None e de REDRAW, e retorna esse valor.
+
+    `draw()` redesenha a tela (e atualiza o display): é chamado ao entrar,
+    depois de cada lote de eventos em que handle_event retornou REDRAW ou
+    que mostre a janela de novo (REDRAW_EVENTS) e, se `frame_ms` for
+    informado, a cada `frame_ms` milissegundos.
+    """
+    if draw is not None:
+        draw()
+    next_frame = time.monotonic() + frame_ms / 1000 if frame_ms else None
+
+    while True:
+        if next_frame is None:
+            event = pygame.event.wait()
+        else:
+            timeout = max(1, int((next_frame - time.monotonic()) * 1000))
+            event = pygame.event.wait(timeout)
+
+        # Trata de uma vez tudo o que chegou antes de redesenhar
+        events = [] if event.type == pygame.NOEVENT else [event] + pygame.event.get()
+        redraw = False
+        for event in events:
+            result = handle_event(event)
+            if result is REDRAW or event.type in REDRAW_EVENTS:
+                redraw = True
+            elif result is not None:
+                return result
+
+        if next_frame is not None and time.monotonic() >= next_frame:
+            next_frame = time.monotonic() + frame_ms / 1000
+            redraw = True
+        if redraw and draw is not None:
+            draw()
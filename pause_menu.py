@@ -1,10 +1,6 @@
 import pygame
-import os # Importar para usar os.path.join
-
-pygame.font.init()
-
-# Definir o caminho para a fonte
-FONT_PATH = os.path.join('assets', 'fonts', 'BigBlueTermPlusNerdFont-Regular.ttf') # Verifique o nome exato do arquivo
+from font_cache import get_font, render_text
+from modal_screen import REDRAW, run_modal
 
 
 class PauseMenu:
@@ -24,14 +20,9 @@ class PauseMenu:
         self.selected_index = 0
 
         # Configurações de fonte e cores
-        # Usar pygame.font.Font
-        try:
-            self.font_title = pygame.font.Font(FONT_PATH, 70)
-            self.font_options = pygame.font.Font(FONT_PATH, 45)
-        except FileNotFoundError:
-            print(f"Erro: Fonte não encontrada em {FONT_PATH}. Usando fonte padrão.")
-            self.font_title = pygame.font.SysFont('comicsans', 70, bold=True)
-            self.font_options = pygame.font.SysFont('comicsans', 45)
+        # Fontes compartilhadas (o arquivo TTF é aberto uma única vez)
+        self.font_title = get_font(70, bold=True)
+        self.font_options = get_font(45)
 
         self.bg_color = (0, 0, 0, 180)  # Preto com mais transparência
         self.text_color = (255, 255, 255)
@@ -42,41 +33,53 @@ class PauseMenu:
         self.title_spacing = 60   # Reduzido o espaço após o título
         self.menu_offset_y = -50  # Deslocamento para cima do menu inteiro
 
-    def draw(self, surface):
-        # Overlay semi-transparente
-        overlay = pygame.Surface(
-            (surface.get_width(), surface.get_height()), pygame.SRCALPHA)
-        overlay.fill(self.bg_color)
-        surface.blit(overlay, (0, 0))
+        # Overlay semi-transparente, criado uma vez; a cada entrada no menu
+        # ele é aplicado sobre a tela do jogo em `backdrop`
+        self.overlay = pygame.Surface(win.get_size(), pygame.SRCALPHA)
+        self.overlay.fill(self.bg_color)
+        self.backdrop = None
 
         # Título centralizado (movido para cima)
-        title = self.font_title.render('JOGO PAUSADO', True, self.text_color)
-        title_rect = title.get_rect(
-            center=(surface.get_width()//2,
-                    (surface.get_height()//4) + self.menu_offset_y))
-        surface.blit(title, title_rect)
-
-        # Opções do menu com melhor espaçamento
-        start_y = title_rect.bottom + self.title_spacing
-
-        for i, option in enumerate(self.options):
-            color = self.selected_color if i == self.selected_index else self.text_color
+        self.title = render_text(self.font_title, 'JOGO PAUSADO', self.text_color)
+        self.title_rect = self.title.get_rect(
+            center=(win.get_width()//2,
+                    (win.get_height()//4) + self.menu_offset_y))
+
+        # Opções pré-renderizadas nos dois estados; a tela só é redesenhada
+        # quando a seleção muda
+        self.options_y = self.title_rect.bottom + self.title_spacing
+        self.option_surfaces = [self.render_option(i) for i in range(len(self.options))]
+
+    def render_option(self, i):
+        """Superfícies da opção `i`: normal, selecionada e a sombra."""
+        option = self.options[i]
+        center = (self.win.get_width()//2, self.options_y + i * self.option_spacing)
+        normal = render_text(self.font_options, option, self.text_color)
+
+        # Adiciona indicador visual para a opção selecionada
+        text = f"> {option} <"
+        selected = render_text(self.font_options, text, self.selected_color)
+        # Adiciona um efeito de sombra suave
+        shadow = render_text(self.font_options, text, (100, 100, 100))
+        return ((normal, normal.get_rect(center=center)),
+                (selected, selected.get_rect(center=center)),
+                (shadow, shadow.get_rect(center=(center[0] + 2, center[1] + 2))))
+
+    def enter(self, surface):
+        """Guarda a tela atual escurecida pelo overlay como fundo do menu."""
+        self.backdrop = surface.copy()
+        self.backdrop.blit(self.overlay, (0, 0))
 
-            # Adiciona indicador visual para a opção selecionada
-            text = f"> {option} <" if i == self.selected_index else option
-
-            label = self.font_options.render(text, True, color)
-            label_rect = label.get_rect(
-                center=(surface.get_width()//2, start_y + i * self.option_spacing))
+    def draw(self, surface):
+        surface.blit(self.backdrop, (0, 0))
+        surface.blit(self.title, self.title_rect)
 
-            # Adiciona um efeito de sombra suave
+        for i, (normal, selected, shadow) in enumerate(self.option_surfaces):
             if i == self.selected_index:
-                shadow = self.font_options.render(text, True, (100, 100, 100))
-                shadow_rect = shadow.get_rect(
-                    center=(label_rect.centerx + 2, label_rect.centery + 2))
-                surface.blit(shadow, shadow_rect)
-
-            surface.blit(label, label_rect)
+                surface.blit(*shadow)
+                surface.blit(*selected)
+            else:
+                surface.blit(*normal)
 
         pygame.display.update()
 
@@ -99,44 +102,44 @@ class PauseMenu:
         self.audio.play_sound('move')
 
     def run(self, surface):
-        clock = pygame.time.Clock()
-        paused = True
-
-        while paused:
-            clock.tick(60)
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+        self.enter(surface)
+        return run_modal(self.handle_event, lambda: self.draw(surface))
+
+    def handle_event(self, event):
+        """
+        Trata um evento; retorna a ação escolhida, REDRAW se a seleção
+        mudou ou None se nada mudou (os volumes não aparecem neste menu).
+        """
+        if event.type == pygame.QUIT:
+            return "quit"
+
+        if event.type == pygame.KEYDOWN: # Garante que só verifica event.key em eventos KEYDOWN
+            if event.key == pygame.K_UP:
+                self.selected_index = (
+                    self.selected_index - 1) % len(self.options)
+                self.audio.play_sound('move')
+                return REDRAW
+            elif event.key == pygame.K_DOWN:
+                self.selected_index = (
+                    self.selected_index + 1) % len(self.options)
+                self.audio.play_sound('move')
+                return REDRAW
+            elif event.key == pygame.K_RETURN:
+                selected_option = self.options[self.selected_index]
+
+                # Opções que retornam uma ação
+                if selected_option == "Continuar":
+                    return "continue"
+                elif selected_option == "Reiniciar":
+                    return "restart"
+                elif selected_option == "Voltar ao Menu":
+                    return "menu"
+                elif selected_option == "Sair":
                     return "quit"
+                # Opções que ajustam volume
+                else:
+                    self.handle_volume_adjustment(selected_option)
 
-                if event.type == pygame.KEYDOWN: # Garante que só verifica event.key em eventos KEYDOWN
-                    if event.key == pygame.K_UP:
-                        self.selected_index = (
-                            self.selected_index - 1) % len(self.options)
-                        self.audio.play_sound('move')
-                    elif event.key == pygame.K_DOWN:
-                        self.selected_index = (
-                            self.selected_index + 1) % len(self.options)
-                        self.audio.play_sound('move')
-                    elif event.key == pygame.K_RETURN:
-                        selected_option = self.options[self.selected_index]
-
-                        # Opções que retornam uma ação
-                        if selected_option == "Continuar":
-                            return "continue"
-                        elif selected_option == "Reiniciar":
-                            return "restart"
-                        elif selected_option == "Voltar ao Menu":
-                            return "menu"
-                        elif selected_option == "Sair":
-                            return "quit"
-                        # Opções que ajustam volume
-                        else:
-                            self.handle_volume_adjustment(selected_option)
-
-                    elif event.key == pygame.K_ESCAPE:
-                        return "continue"
-
-            self.draw(surface)
-
-        return "continue"
\ No newline at end of file
+            elif event.key == pygame.K_ESCAPE:
+                return "continue"
+        return None
\ No newline at end of file
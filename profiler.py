@@ -0,0 +1,262 @@
+import csv
+import json
+import os
+import threading
+import time
+from array import array
+from datetime import datetime
+
+from font_cache import get_font, render_text
+
+# Medição do tempo de cada fase do quadro no laço do jogo. Desligado, cada
+# chamada é só um teste de atributo; ligado (--profile ou F3), guarda os
+# últimos RING_SIZE quadros de cada fase em um buffer circular (para p50,
+# p95, p99 e máximo recentes) e um histograma da sessão inteira, exportado
+# em CSV e JSON ao sair do jogo.
+
+PHASES = ('events', 'logic', 'draw_window', 'draw_next_shape',
+          'display_update', 'frame')
+
+RING_SIZE = 600  # ~10 s a 60 fps
+
+# Histograma da sessão: faixas de 0,1 ms até 100 ms (acima disso, a última)
+BUCKET_MS = 0.1
+BUCKETS = 1000
+
+PROFILE_DIR = 'profiles'
+
+# Quadros entre duas atualizações dos números na tela
+OVERLAY_REFRESH_FRAMES = 15
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    def __init__(self, phases=PHASES, ring_size=RING_SIZE):
+        self.phases = phases
+        self.ring_size = ring_size
+        self.enabled = False
+        self.show_overlay = False
+
+        # Buffer circular com os tempos (ms) dos últimos quadros
+        self.ring = {phase: array('d', [0.0]) * ring_size for phase in phases}
+        self.ring_index = 0
+        self.ring_count = 0
+
+        # Histograma e totais da sessão inteira
+        self.histogram = {phase: array('L', [0]) * (BUCKETS + 1) for phase in phases}
+        self.session_count = 0
+        self.session_total = {phase: 0.0 for phase in phases}
+        self.session_max = {phase: 0.0 for phase in phases}
+
+        self.recording = False
+        self.current = {phase: 0.0 for phase in phases}
+        self.frame_start = 0.0
+        self.last = 0.0
+
+        self.overlay_rect = None
+        self.overlay_lines = []
+        self.frames_since_overlay = OVERLAY_REFRESH_FRAMES
+
+    def toggle(self):
+        """Liga/desliga a medição junto com os números na tela."""
+        self.enabled = not self.enabled
+        self.show_overlay = self.enabled
+
+    def start_frame(self):
+        self.recording = self.enabled
+        if not self.recording:
+            return
+        # Quadros interrompidos (fim de jogo, menu) não chegam a end_frame
+        for phase in self.phases:
+            self.current[phase] = 0.0
+        self.frame_start = self.last = time.perf_counter()
+
+    def lap(self, phase):
+        """Soma o tempo desde a última marca na fase `phase`."""
+        if not self.recording:
+            return
+        now = time.perf_counter()
+        self.current[phase] += (now - self.last) * 1000
+        self.last = now
+
+    def end_frame(self):
+        if not self.recording:
+            return
+        current = self.current
+        current['frame'] = (time.perf_counter() - self.frame_start) * 1000
+
+        i = self.ring_index
+        for phase in self.phases:
+            ms = current[phase]
+            self.ring[phase][i] = ms
+            bucket = int(ms / BUCKET_MS)
+            self.histogram[phase][bucket if bucket < BUCKETS else BUCKETS] += 1
+            self.session_total[phase] += ms
+            if ms > self.session_max[phase]:
+                self.session_max[phase] = ms
+
+        self.ring_index = (i + 1) % self.ring_size
+        self.ring_count = min(self.ring_count + 1, self.ring_size)
+        self.session_count += 1
+        self.frames_since_overlay += 1
+
+    def rolling_stats(self):
+        """{fase: (p50, p95, p99, max)} dos últimos quadros, em ms."""
+        stats = {}
+        for phase in self.phases:
+            values = sorted(self.ring[phase][:self.ring_count])
+            stats[phase] = (percentile(values, 0.50), percentile(values, 0.95),
+                            percentile(values, 0.99), values[-1] if values else 0.0)
+        return stats
+
+    def session_percentile(self, phase, fraction):
+        """Percentil aproximado (pela faixa do histograma) da sessão."""
+        target = fraction * self.session_count
+        seen = 0
+        for bucket, count in enumerate(self.histogram[phase]):
+            seen += count
+            if count and seen >= target:
+                # Limite superior da faixa, sem passar do máximo medido
+                return min((bucket + 1) * BUCKET_MS, self.session_max[phase])
+        return 0.0
+
+    def session_stats(self):
+        stats = {}
+        for phase in self.phases:
+            count = self.session_count
+            stats[phase] = {
+                'count': count,
+                'mean_ms': self.session_total[phase] / count if count else 0.0,
+                'p50_ms': self.session_percentile(phase, 0.50),
+                'p95_ms': self.session_percentile(phase, 0.95),
+                'p99_ms': self.session_percentile(phase, 0.99),
+                'max_ms': self.session_max[phase],
+            }
+        return stats
+
+    def draw_overlay(self, surface, background=None, force=False):
+        """
+        Desenha a tabela de tempos no canto superior esquerdo e retorna os
+        retângulos alterados. `background` é usado para apagar o texto
+        anterior quando só partes da tela são redesenhadas; `force` redesenha
+        mesmo sem mudança (depois de a tela inteira ter sido redesenhada).
+        """
+        dirty = []
+        refresh = self.show_overlay and self.frames_since_overlay >= OVERLAY_REFRESH_FRAMES
+        if self.overlay_rect is not None and not force and (
+                refresh or not self.show_overlay):
+            if background is not None:
+                surface.blit(background, self.overlay_rect, self.overlay_rect)
+            else:
+                surface.fill((0, 0, 0), self.overlay_rect)
+            dirty.append(self.overlay_rect)
+            self.overlay_rect = None
+
+        if not self.show_overlay:
+            self.overlay_rect = None
+            return dirty
+
+        if refresh or not self.overlay_lines:
+            self.frames_since_overlay = 0
+            self.overlay_lines = [f"{'fase':<16}{'p50':>7}{'p95':>7}{'p99':>7}{'max':>7}"]
+            for phase, values in self.rolling_stats().items():
+                self.overlay_lines.append(
+                    f"{phase:<16}" + ''.join(f"{v:>7.2f}" for v in values))
+        elif self.overlay_rect is not None and not force:
+            # Nada mudou desde o último desenho
+            return dirty
+
+        font = get_font(14)
+        x, y = 10, 10
+        rect = None
+        for line in self.overlay_lines:
+            label = render_text(font, line, (0, 255, 0))
+            line_rect = surface.blit(label, (x, y))
+            rect = line_rect if rect is None else rect.union(line_rect)
+            y += label.get_height()
+        self.overlay_rect = rect
+        if rect is not None:
+            dirty.append(rect)
+        return dirty
+
+    def export(self, directory=PROFILE_DIR):
+        """Salva os resultados da sessão em CSV e JSON; retorna os caminhos."""
+        if self.session_count == 0:
+            return []
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"profile_{datetime.now():%Y%m%d-%H%M%S}")
+
+        session = self.session_stats()
+        rolling = self.rolling_stats()
+        with open(base + '.json', 'w') as f:
+            json.dump({
+                'frames': self.session_count,
+                'session': session,
+                'rolling': {phase: dict(zip(('p50_ms', 'p95_ms', 'p99_ms', 'max_ms'), values))
+                            for phase, values in rolling.items()},
+            }, f, indent=2)
+
+        with open(base + '.csv', 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['phase', 'count', 'mean_ms', 'p50_ms', 'p95_ms',
+                             'p99_ms', 'max_ms'])
+            for phase, stats in session.items():
+                writer.writerow([phase, stats['count']] + [
+                    f"{stats[key]:.4f}" for key in
+                    ('mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms')])
+        return [base + '.json', base + '.csv']
+
+
+class StartupReport:
+    """
+    Tempo de cada fase da inicialização (python main.py --startup-report).
+    As fases do início são medidas na thread principal com `phase`; os
+    arquivos carregados em segundo plano chegam por `assets_loaded`. O
+    relatório é impresso quando o menu já apareceu e os arquivos terminaram.
+    """
+
+    def __init__(self, start):
+        self.start = start
+        self.last = start
+        self.phases = []
+        self.menu_ms = None
+        self.assets = None
+        self.assets_ms = None
+        self.lock = threading.Lock()
+        self.printed = False
+
+    def phase(self, name):
+        """Fecha a fase `name`, que começou no fim da fase anterior."""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    def menu_ready(self):
+        self.menu_ms = (time.perf_counter() - self.start) * 1000
+        self.print_if_complete()
+
+    def assets_loaded(self, load_times):
+        """Chamado pela thread de carregamento com [(nome, ms), ...]."""
+        self.assets = list(load_times)
+        self.assets_ms = (time.perf_counter() - self.start) * 1000
+        self.print_if_complete()
+
+    def print_if_complete(self):
+        with self.lock:
+            if self.printed or self.menu_ms is None or self.assets_ms is None:
+                return
+            self.printed = True
+        print("Inicialização (ms):")
+        for name, ms in self.phases:
+            print(f"  {name:<28}{ms:>9.1f}")
+        print(f"  {'menu visível em':<28}{self.menu_ms:>9.1f}")
+        print("Arquivos em segundo plano (ms):")
+        for name, ms in self.assets:
+            print(f"  {name:<28}{ms:>9.1f}")
+        print(f"  {'todos prontos em':<28}{self.assets_ms:>9.1f}")
@@ -0,0 +1,220 @@
+import hashlib
+import os
+import struct
+import sys
+from datetime import datetime
+
+import engine
+
+# Formato binário de replay (.ttr):
+#   cabeçalho: magic 'TTRP', versão (u8), semente (u64), passos simulados
+#              (u32), pontuação final (u32), peças travadas (u32), linhas
+#              removidas (u32), resumo do tabuleiro final (u64, board_hash)
+#              e quantidade de entradas (u32)
+#   corpo:     uma entrada por ação, como um varint de
+#              (passos desde a entrada anterior << 4) | código da ação
+# Uma ação no mesmo passo ou até 7 passos depois da anterior ocupa 1 byte;
+# até ~17 s depois, 2 bytes.
+# A versão 1 não tinha peças, linhas nem o resumo do tabuleiro; ela ainda é
+# lida, e esses campos ficam None.
+
+MAGIC = b'TTRP'
+VERSION = 2
+HEADER = struct.Struct('<4sBQIIIIQI')
+HEADER_V1 = struct.Struct('<4sBQIII')
+
+REPLAY_EXTENSION = '.ttr'
+# Pasta onde o jogo guarda o replay de cada partida terminada
+REPLAY_DIR = 'replays'
+
+
+class ReplayError(Exception):
+    """Arquivo de replay inválido ou corrompido."""
+
+
+def board_hash(state):
+    """
+    Resumo de 64 bits do tabuleiro e da peça em jogo, para notar uma
+    partida que divergiu mesmo terminando com a mesma pontuação.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for colors in state.board.colors:
+        digest.update(colors)
+    for x, y in engine.convert_shape_format(state.current_piece):
+        digest.update(struct.pack('<hh', x, y))
+    return int.from_bytes(digest.digest(), 'little')
+
+
+class Replay:
+    def __init__(self, seed, inputs=None, ticks=0, score=0,
+                 pieces=None, lines=None, board_hash=None):
+        self.seed = seed
+        # Lista de (passo, ação), em ordem
+        self.inputs = inputs if inputs is not None else []
+        self.ticks = ticks
+        self.score = score
+        # Estado final conferido por verify (None em replays da versão 1)
+        self.pieces = pieces
+        self.lines = lines
+        self.board_hash = board_hash
+
+    def encode(self):
+        body = bytearray()
+        last_tick = 0
+        for tick, action in self.inputs:
+            value = ((tick - last_tick) << 4) | action
+            last_tick = tick
+            while value >= 0x80:
+                body.append((value & 0x7F) | 0x80)
+                value >>= 7
+            body.append(value)
+        if self.board_hash is None:
+            # Sem o estado final, só cabe no formato antigo
+            header = HEADER_V1.pack(MAGIC, 1, self.seed, self.ticks,
+                                    self.score, len(self.inputs))
+        else:
+            header = HEADER.pack(MAGIC, VERSION, self.seed, self.ticks,
+                                 self.score, self.pieces, self.lines,
+                                 self.board_hash, len(self.inputs))
+        return header + bytes(body)
+
+    @classmethod
+    def decode(cls, data):
+        if len(data) < len(MAGIC) + 1:
+            raise ReplayError("arquivo muito curto")
+        magic, version = data[:len(MAGIC)], data[len(MAGIC)]
+        if magic != MAGIC:
+            raise ReplayError("não é um arquivo de replay")
+        header = {1: HEADER_V1, VERSION: HEADER}.get(version)
+        if header is None:
+            raise ReplayError(f"versão {version} não suportada")
+        if len(data) < header.size:
+            raise ReplayError("arquivo muito curto")
+        if header is HEADER:
+            (_, _, seed, ticks, score, pieces, lines, final_hash,
+             count) = header.unpack_from(data)
+        else:
+            _, _, seed, ticks, score, count = header.unpack_from(data)
+            pieces = lines = final_hash = None
+
+        inputs = []
+        tick = 0
+        pos = header.size
+        for _ in range(count):
+            value = 0
+            shift = 0
+            while True:
+                if pos >= len(data):
+                    raise ReplayError("arquivo truncado")
+                byte = data[pos]
+                pos += 1
+                value |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            tick += value >> 4
+            inputs.append((tick, value & 0x0F))
+        return cls(seed, inputs, ticks, score, pieces, lines, final_hash)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.encode())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.decode(f.read())
+
+
+def save_replay(replay, directory=REPLAY_DIR):
+    """Salva o replay com um nome único (data + semente) e retorna o caminho."""
+    os.makedirs(directory, exist_ok=True)
+    name = f"{datetime.now():%Y%m%d-%H%M%S}_{replay.seed}{REPLAY_EXTENSION}"
+    path = os.path.join(directory, name)
+    replay.save(path)
+    return path
+
+
+class Recorder:
+    """Grava as entradas de uma partida enquanto ela é jogada."""
+
+    def __init__(self, game):
+        self.game = game
+        self.reset()
+
+    def reset(self):
+        """Começa a gravar a partida atual do motor (depois de game.reset)."""
+        self.replay = Replay(self.game.seed)
+
+    def step(self, actions=()):
+        """Mesmo que game.step, mas registrando as ações."""
+        tick = self.game.state.ticks
+        for action in actions:
+            self.replay.inputs.append((tick, action))
+        return self.game.step(actions)
+
+    def finish(self):
+        """Fecha a gravação com o total de passos e o estado final."""
+        state = self.game.state
+        self.replay.ticks = state.ticks
+        self.replay.score = state.score
+        self.replay.pieces = state.pieces
+        self.replay.lines = state.lines
+        self.replay.board_hash = board_hash(state)
+        return self.replay
+
+
+def simulate(replay):
+    """Re-simula uma partida gravada sem nenhuma renderização."""
+    game = engine.Engine(replay.seed)
+    state = game.state
+    inputs = replay.inputs
+    i = 0
+    count = len(inputs)
+    while state.ticks < replay.ticks and not state.lost:
+        tick = state.ticks
+        if i < count and inputs[i][0] == tick:
+            actions = []
+            while i < count and inputs[i][0] == tick:
+                actions.append(inputs[i][1])
+                i += 1
+            game.step(actions)
+        else:
+            game.step()
+    return game
+
+
+def verify(replay):
+    """
+    Retorna (ok, estado final simulado) de um replay. O replay só é válido
+    se a re-simulação chegar à mesma pontuação no mesmo número de passos,
+    com as mesmas peças, linhas e tabuleiro final (os três últimos não
+    existem em replays da versão 1).
+    """
+    state = simulate(replay).state
+    ok = state.score == replay.score and state.ticks == replay.ticks
+    if ok and replay.board_hash is not None:
+        ok = (state.pieces == replay.pieces and state.lines == replay.lines
+              and board_hash(state) == replay.board_hash)
+    return ok, state
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python replay.py <arquivo.ttr> [...]")
+        sys.exit(2)
+
+    failed = 0
+    for path in sys.argv[1:]:
+        try:
+            replay = Replay.load(path)
+            ok, state = verify(replay)
+        except (OSError, ReplayError) as e:
+            failed += 1
+            print(f"ERRO {path}: {e}")
+            continue
+        if not ok:
+            failed += 1
+        print(f"{'OK ' if ok else 'ERRO'} {path}: seed={replay.seed} "
+              f"passos={replay.ticks} pontuação={replay.score} simulada={state.score}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,121 @@
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+# Banco com todas as partidas terminadas
+DB_PATH = 'scores.db'
+# Arquivo antigo que guardava apenas o recorde
+LEGACY_SCORES_PATH = 'scores.txt'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    score INTEGER NOT NULL,
+    lines INTEGER NOT NULL DEFAULT 0,
+    played_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_games_score ON games (score DESC);
+CREATE INDEX IF NOT EXISTS idx_games_played_at ON games (played_at);
+"""
+
+
+class ScoreStore:
+    """
+    Guarda as pontuações das partidas em um banco SQLite.
+
+    O recorde fica em memória e só muda quando uma partida termina
+    (`record_game`), então o laço do jogo nunca lê o disco. As gravações são
+    feitas por uma thread própria para não travar a renderização.
+    """
+
+    def __init__(self, path=DB_PATH, legacy_path=LEGACY_SCORES_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.executescript(SCHEMA)
+            self.conn.commit()
+        self.migrate_legacy(legacy_path)
+
+        self._high_score = self.query_high_score()
+
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(
+            target=self.write_loop, name='score-writer', daemon=True)
+        self.writer.start()
+
+    def migrate_legacy(self, legacy_path):
+        """Importa o recorde do scores.txt se o banco ainda estiver vazio."""
+        if not legacy_path or not os.path.exists(legacy_path):
+            return
+        with self.lock:
+            (count,) = self.conn.execute('SELECT COUNT(*) FROM games').fetchone()
+            if count:
+                return
+            try:
+                with open(legacy_path, 'r') as f:
+                    score = int(f.readline().strip() or 0)
+            except ValueError:
+                return
+            if score > 0:
+                played_at = datetime.fromtimestamp(
+                    os.path.getmtime(legacy_path)).isoformat(timespec='seconds')
+                self.conn.execute(
+                    'INSERT INTO games (score, played_at) VALUES (?, ?)',
+                    (score, played_at))
+                self.conn.commit()
+
+    def query_high_score(self):
+        with self.lock:
+            (score,) = self.conn.execute(
+                'SELECT MAX(score) FROM games').fetchone()
+        return score or 0
+
+    @property
+    def high_score(self):
+        """Recorde atual (em memória)."""
+        return self._high_score
+
+    def record_game(self, score, lines=0):
+        """Registra uma partida terminada; a gravação acontece em segundo plano."""
+        self._high_score = max(self._high_score, score)
+        played_at = datetime.now().isoformat(timespec='seconds')
+        self.pending.put((score, lines, played_at))
+
+    def write_loop(self):
+        while True:
+            item = self.pending.get()
+            try:
+                if item is None:
+                    return
+                with self.lock:
+                    self.conn.execute(
+                        'INSERT INTO games (score, lines, played_at) VALUES (?, ?, ?)',
+                        item)
+                    self.conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error saving score: {str(e)}")
+            finally:
+                self.pending.task_done()
+
+    def top_scores(self, limit=10):
+        """Melhores partidas: lista de (score, lines, played_at)."""
+        with self.lock:
+            return self.conn.execute(
+                'SELECT score, lines, played_at FROM games '
+                'ORDER BY score DESC, played_at ASC LIMIT ?',
+                (limit,)).fetchall()
+
+    def flush(self):
+        """Espera todas as gravações pendentes terminarem."""
+        self.pending.join()
+
+    def close(self):
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+        with self.lock:
+            self.conn.close()
@@ -1,10 +1,6 @@
 import pygame
-import os # Importar para usar os.path.join
-
-pygame.font.init()
-
-# Definir o caminho para a fonte
-FONT_PATH = os.path.join('assets', 'fonts', 'BigBlueTermPlusNerdFont-Regular.ttf') # Verifique o nome exato do arquivo
+from font_cache import get_font, render_text
+from modal_screen import REDRAW, run_modal
 
 class SettingsMenu:
     def __init__(self, win, audio_manager):
@@ -17,14 +13,9 @@ class SettingsMenu:
         ]
         self.selected_index = 0
 
-        # Usar pygame.font.Font
-        try:
-            self.font_title = pygame.font.Font(FONT_PATH, 70)
-            self.font_options = pygame.font.Font(FONT_PATH, 45)
-        except FileNotFoundError:
-            print(f"Erro: Fonte não encontrada em {FONT_PATH}. Usando fonte padrão.")
-            self.font_title = pygame.font.SysFont('comicsans', 70, bold=True)
-            self.font_options = pygame.font.SysFont('comicsans', 45)
+        # Fontes compartilhadas (o arquivo TTF é aberto uma única vez)
+        self.font_title = get_font(70, bold=True)
+        self.font_options = get_font(45)
 
         self.bg_color = (0, 0, 0, 180) # Preto com transparência
         self.text_color = (255, 255, 255)
@@ -34,76 +25,109 @@ class SettingsMenu:
         self.title_spacing = 80
         self.menu_offset_y = -30
 
+        # Overlay criado uma vez e aplicado sobre a tela anterior a cada
+        # entrada no menu (`backdrop`)
+        self.overlay = pygame.Surface(win.get_size(), pygame.SRCALPHA)
+        self.overlay.fill(self.bg_color)
+        self.backdrop = None
+
+        self.title = render_text(self.font_title, 'CONFIGURAÇÕES', self.text_color)
+        self.title_rect = self.title.get_rect(center=(win.get_width()//2, (win.get_height()//4) + self.menu_offset_y))
+
+        # Opções pré-renderizadas nos dois estados; as de volume só são
+        # renderizadas de novo quando o valor muda
+        self.options_y = self.title_rect.bottom + self.title_spacing
+        self.option_surfaces = [self.render_option(i) for i in range(len(self.options))]
+
+    def render_option(self, i):
+        """Superfícies da opção `i`: normal, selecionada e a sombra."""
+        option = self.options[i]
+        center = (self.win.get_width()//2, self.options_y + i * self.option_spacing)
+        normal = render_text(self.font_options, option, self.text_color)
+        text = f"> {option} <"
+        selected = render_text(self.font_options, text, self.selected_color)
+        shadow = render_text(self.font_options, text, (100, 100, 100))
+        return ((normal, normal.get_rect(center=center)),
+                (selected, selected.get_rect(center=center)),
+                (shadow, shadow.get_rect(center=(center[0] + 2, center[1] + 2))))
+
     def update_volume_options(self):
-        # Atualiza os textos de volume para refletir os valores atuais
-        self.options[0] = "Volume Música: {:.0%}".format(self.audio.music_volume)
-        self.options[1] = "Volume Efeitos: {:.0%}".format(self.audio.effects_volume)
+        """
+        Atualiza os textos de volume para refletir os valores atuais;
+        retorna se algum mudou.
+        """
+        changed = False
+        volumes = ["Volume Música: {:.0%}".format(self.audio.music_volume),
+                   "Volume Efeitos: {:.0%}".format(self.audio.effects_volume)]
+        for i, text in enumerate(volumes):
+            if self.options[i] != text:
+                self.options[i] = text
+                self.option_surfaces[i] = self.render_option(i)
+                changed = True
+        return changed
+
+    def enter(self, surface):
+        """Guarda a tela atual escurecida pelo overlay como fundo do menu."""
+        self.backdrop = surface.copy()
+        self.backdrop.blit(self.overlay, (0, 0))
+        # O volume pode ter mudado pelo menu de pausa
+        self.update_volume_options()
 
     def draw(self, surface):
-        overlay = pygame.Surface((surface.get_width(), surface.get_height()), pygame.SRCALPHA)
-        overlay.fill(self.bg_color)
-        surface.blit(overlay, (0, 0))
-
-        title = self.font_title.render('CONFIGURAÇÕES', True, self.text_color)
-        title_rect = title.get_rect(center=(surface.get_width()//2, (surface.get_height()//4) + self.menu_offset_y))
-        surface.blit(title, title_rect)
-
-        start_y = title_rect.bottom + self.title_spacing
-
-        for i, option in enumerate(self.options):
-            color = self.selected_color if i == self.selected_index else self.text_color
-            text = f"> {option} <" if i == self.selected_index else option
-            label = self.font_options.render(text, True, color)
-            label_rect = label.get_rect(center=(surface.get_width()//2, start_y + i * self.option_spacing))
+        surface.blit(self.backdrop, (0, 0))
+        surface.blit(self.title, self.title_rect)
 
+        for i, (normal, selected, shadow) in enumerate(self.option_surfaces):
             if i == self.selected_index:
-                shadow = self.font_options.render(text, True, (100, 100, 100))
-                shadow_rect = shadow.get_rect(center=(label_rect.centerx + 2, label_rect.centery + 2))
-                surface.blit(shadow, shadow_rect)
-
-            surface.blit(label, label_rect)
+                surface.blit(*shadow)
+                surface.blit(*selected)
+            else:
+                surface.blit(*normal)
         pygame.display.update()
 
     def run(self, surface):
-        clock = pygame.time.Clock()
-        in_settings = True
-
-        while in_settings:
-            clock.tick(60)
-            self.update_volume_options() # Atualiza os textos de volume a cada frame
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return "quit"
-
-                if event.type == pygame.KEYDOWN: # Garante que só verifica event.key em eventos KEYDOWN
-                    self.audio.play_sound('move') # Som ao navegar no menu
-                    if event.key == pygame.K_UP:
-                        self.selected_index = (self.selected_index - 1) % len(self.options)
-                    elif event.key == pygame.K_DOWN:
-                        self.selected_index = (self.selected_index + 1) % len(self.options)
-                    elif event.key == pygame.K_LEFT or event.key == pygame.K_KP_MINUS: # Tecla esquerda ou '-' do teclado numérico
-                        if self.selected_index == 0: # Volume Música
-                            new_vol = max(0.0, self.audio.music_volume - 0.1)
-                            self.audio.set_music_volume(new_vol)
-                        elif self.selected_index == 1: # Volume Efeitos
-                            new_vol = max(0.0, self.audio.effects_volume - 0.1)
-                            self.audio.set_effects_volume(new_vol)
-                        self.audio.play_sound('drop') # Som de ajuste de volume
-                    elif event.key == pygame.K_RIGHT or event.key == pygame.K_KP_PLUS: # Tecla direita ou '+' do teclado numérico
-                        if self.selected_index == 0: # Volume Música
-                            new_vol = min(1.0, self.audio.music_volume + 0.1)
-                            self.audio.set_music_volume(new_vol)
-                        elif self.selected_index == 1: # Volume Efeitos
-                            new_vol = min(1.0, self.audio.effects_volume + 0.1)
-                            self.audio.set_effects_volume(new_vol)
-                        self.audio.play_sound('drop') # Som de ajuste de volume
-                    elif event.key == pygame.K_RETURN:
-                        self.audio.play_sound('drop') # Som de seleção
-                        if self.selected_index == 2: # Voltar
-                            in_settings = False
-                    elif event.key == pygame.K_ESCAPE:
-                        in_settings = False # Volta com ESC
-
-            self.draw(surface)
-        return "back" # Retorna para o MainMenu
\ No newline at end of file
+        self.enter(surface)
+        return run_modal(self.handle_event, lambda: self.draw(surface))
+
+    def handle_event(self, event):
+        """
+        Trata um evento; retorna "back"/"quit" para sair, REDRAW se a
+        seleção ou um volume mudou ou None se nada mudou.
+        """
+        if event.type == pygame.QUIT:
+            return "quit"
+
+        if event.type == pygame.KEYDOWN: # Garante que só verifica event.key em eventos KEYDOWN
+            self.audio.play_sound('move') # Som ao navegar no menu
+            if event.key == pygame.K_UP:
+                self.selected_index = (self.selected_index - 1) % len(self.options)
+                return REDRAW
+            elif event.key == pygame.K_DOWN:
+                self.selected_index = (self.selected_index + 1) % len(self.options)
+                return REDRAW
+            elif event.key == pygame.K_LEFT or event.key == pygame.K_KP_MINUS: # Tecla esquerda ou '-' do teclado numérico
+                if self.selected_index == 0: # Volume Música
+                    new_vol = max(0.0, self.audio.music_volume - 0.1)
+                    self.audio.set_music_volume(new_vol)
+                elif self.selected_index == 1: # Volume Efeitos
+                    new_vol = max(0.0, self.audio.effects_volume - 0.1)
+                    self.audio.set_effects_volume(new_vol)
+                self.audio.play_sound('drop') # Som de ajuste de volume
+            elif event.key == pygame.K_RIGHT or event.key == pygame.K_KP_PLUS: # Tecla direita ou '+' do teclado numérico
+                if self.selected_index == 0: # Volume Música
+                    new_vol = min(1.0, self.audio.music_volume + 0.1)
+                    self.audio.set_music_volume(new_vol)
+                elif self.selected_index == 1: # Volume Efeitos
+                    new_vol = min(1.0, self.audio.effects_volume + 0.1)
+                    self.audio.set_effects_volume(new_vol)
+                self.audio.play_sound('drop') # Som de ajuste de volume
+            elif event.key == pygame.K_RETURN:
+                self.audio.play_sound('drop') # Som de seleção
+                if self.selected_index == 2: # Voltar
+                    return "back" # Retorna para o MainMenu
+            elif event.key == pygame.K_ESCAPE:
+                return "back" # Volta com ESC
+            # Só os textos de volume que mudaram são renderizados de novo
+            if self.update_volume_options():
+                return REDRAW
+        return None
\ No newline at end of file
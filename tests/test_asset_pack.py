@@ -0,0 +1,54 @@
+import pytest
+
+import asset_pack
+from asset_pack import ENTRY, HEADER, AssetPack, AssetPackError, build_pack, open_pack
+
+
+@pytest.fixture
+def pack_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'assets').mkdir()
+    (tmp_path / 'assets' / 'a.wav').write_bytes(bytes(range(200)))
+    (tmp_path / 'assets' / 'b.ttf').write_bytes(b'fonte')
+    build_pack(['assets/a.wav', 'assets/b.ttf'], 'assets.pack')
+    monkeypatch.setattr(asset_pack, 'active_pack', None)
+    return tmp_path / 'assets.pack'
+
+
+def test_read_readinto_and_seek(pack_path):
+    pack = AssetPack(str(pack_path))
+    f = pack.open('assets/a.wav')
+    assert f.read(10) == bytes(range(10))
+    buffer = bytearray(300)
+    assert f.readinto(buffer) == 190
+    assert buffer[:190] == bytes(range(10, 200))
+    assert f.readinto(buffer) == 0 and f.read() == b''
+    f.seek(-5, 2)
+    assert f.read() == bytes(range(195, 200))
+    assert pack.open('assets/b.ttf').read() == b'fonte'
+    # O mapeamento só fecha sem nenhum arquivo aberto sobre ele
+    del f
+    pack.close()
+
+
+def corrupt(pack_path, data):
+    pack_path.write_bytes(data)
+    return open_pack(str(pack_path))
+
+
+def test_truncated_index_falls_back_to_loose_files(pack_path, capsys):
+    data = pack_path.read_bytes()
+    index_end = HEADER.size + 2 * ENTRY.size + len('assets/a.wav') + len('assets/b.ttf')
+    # Cortes no cabeçalho, no meio de uma entrada e no meio de um caminho
+    for size in range(0, index_end):
+        assert corrupt(pack_path, data[:size]) is None, size
+    assert 'Usando os arquivos soltos' in capsys.readouterr().out
+
+
+def test_invalid_path_in_index_falls_back(pack_path, capsys):
+    data = bytearray(pack_path.read_bytes())
+    data[HEADER.size + ENTRY.size] = 0xFF
+    assert corrupt(pack_path, bytes(data)) is None
+    assert 'caminho inválido' in capsys.readouterr().out
+    with pytest.raises(AssetPackError):
+        AssetPack(str(pack_path))
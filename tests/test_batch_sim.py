@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+import engine
+from board import COLUMNS
+from bot import Bot
+
+np = pytest.importorskip('numpy')
+batch_sim = pytest.importorskip('batch_sim')
+
+GAMES = 8
+PIECES = 120
+
+
+def engine_actions(rotations, x):
+    """As ações que o Engine recebe para uma jogada do BatchSim."""
+    dx = x - batch_sim.SPAWN_X
+    move = engine.RIGHT if dx > 0 else engine.LEFT
+    return [engine.ROTATE] * rotations + [move] * abs(dx) + [engine.HARD_DROP]
+
+
+def board_grid(board):
+    return [[board.is_occupied(x, y) for x in range(board.columns)]
+            for y in range(board.height)]
+
+
+def test_batch_step_matches_engine_hard_drop():
+    games = [engine.Engine(seed) for seed in range(GAMES)]
+    sim = batch_sim.BatchSim(GAMES, seed=0)
+    sim.current[:] = [game.state.current_piece.index for game in games]
+    sim.next[:] = [game.state.next_piece.index for game in games]
+    # Metade das partidas joga com o bot (remove linhas), metade ao acaso
+    bot = Bot(lookahead=False)
+    rng = random.Random(0)
+
+    for _ in range(PIECES):
+        rotations = []
+        xs = []
+        for i, game in enumerate(games):
+            if i % 2 == 0 and not game.state.lost:
+                placement = bot.choose(game.state)
+                rotations.append(placement.rotation)
+                xs.append(placement.x)
+            else:
+                rotations.append(rng.randrange(4))
+                xs.append(rng.randrange(COLUMNS))
+
+        lines_before = [game.state.lines for game in games]
+        for game, r, x in zip(games, rotations, xs):
+            if not game.state.lost:
+                # Sem gravidade entre as jogadas: a peça nasce sempre em y=0
+                game.state.fall_time = 0
+                game.step(engine_actions(r, x))
+        cleared = sim.step(np.array(rotations), np.array(xs),
+                           [game.state.next_piece.index for game in games])
+
+        for i, game in enumerate(games):
+            state = game.state
+            assert bool(sim.alive[i]) == (not state.lost), i
+            if state.lost:
+                continue
+            assert sim.grid(i) == board_grid(state.board), i
+            assert int(sim.score[i]) == state.score
+            assert int(sim.lines[i]) == state.lines
+            assert int(sim.pieces[i]) == state.pieces
+            assert int(sim.current[i]) == state.current_piece.index
+            assert int(cleared[i]) == state.lines - lines_before[i]
+
+    assert sum(game.state.lines for game in games) > 0
+    assert any(game.state.lost for game in games)
@@ -0,0 +1,171 @@
+import random
+
+import engine
+from board import Board, COLUMNS, ROWS
+from bot import DEFAULT_WEIGHTS
+from engine import Piece, drop_distance, shapes, valid_space
+from tournament import BotMatch
+
+
+def random_board(rng, density):
+    """Tabuleiro com células soltas (buracos e saliências por toda parte)."""
+    board = Board()
+    for y in range(ROWS):
+        if rng.random() < density:
+            for x in range(COLUMNS):
+                if rng.random() < density:
+                    board.lock([(x, y)], rng.randint(1, 7))
+    return board
+
+
+def descend(piece, board):
+    """A queda como no jogo original: desce uma linha enquanto couber."""
+    distance = 0
+    while valid_space(piece, board, y=piece.y + distance + 1):
+        distance += 1
+    return distance
+
+
+def uses_fallback(piece, board):
+    """A peça está abaixo do topo de alguma das suas colunas?"""
+    return any(board.tops[piece.x + dx] - 1 - (piece.y + dy) < 0
+               for dx, dy in piece.compiled().bottoms)
+
+
+def test_drop_distance_matches_row_by_row_descent():
+    rng = random.Random(13)
+    checked = fallback = 0
+    while checked < 3000:
+        board = random_board(rng, rng.choice((0.2, 0.5, 0.8)))
+        piece = Piece(rng.randrange(COLUMNS), rng.randrange(ROWS + 4), rng.choice(shapes))
+        piece.rotation = rng.randrange(4)
+        if not valid_space(piece, board):
+            continue
+        assert drop_distance(piece, board) == descend(piece, board)
+        checked += 1
+        fallback += uses_fallback(piece, board)
+    # Os dois caminhos foram exercitados
+    assert 0 < fallback < checked
+
+
+def test_drop_under_an_overhang_uses_the_fallback():
+    board = Board()
+    # Teto na linha 10 sobre as colunas 2..6, chão parcial na linha 18
+    board.lock([(x, 10) for x in range(2, 7)], 1)
+    board.lock([(4, 18)], 2)
+    piece = Piece(4, 14, shapes[3])  # O ocupa colunas 3-4, linhas 12-13
+    assert valid_space(piece, board)
+    assert uses_fallback(piece, board)
+    assert drop_distance(piece, board) == descend(piece, board) == 4
+
+    # Acima do teto, o topo das colunas já dá a resposta
+    piece.y = 5
+    assert not uses_fallback(piece, board)
+    assert drop_distance(piece, board) == descend(piece, board) == 5
+
+
+def test_tops_follow_every_board_change():
+    rng = random.Random(14)
+    board = random_board(rng, 0.5)
+    for _ in range(200):
+        action = rng.randrange(3)
+        if action == 0:
+            board.lock([(rng.randrange(COLUMNS), rng.randrange(ROWS))], 1)
+        elif action == 1:
+            y = rng.randrange(ROWS)
+            board.lock([(x, y) for x in range(COLUMNS)], 2)
+            board.clear_full_rows()
+        else:
+            board.add_garbage(rng.randint(1, 3), rng.randrange(COLUMNS),
+                              engine.GARBAGE_COLOR)
+        expected = [min([y for y in range(ROWS) if board.is_occupied(x, y)],
+                        default=ROWS) for x in range(COLUMNS)]
+        assert board.tops == expected
+
+
+def full_scan(board):
+    """A remoção de linhas checando o tabuleiro inteiro, linha a linha."""
+    kept = [(mask, bytes(colors)) for mask, colors in zip(board.rows, board.colors)
+            if mask != board.full_mask]
+    cleared = board.height - len(kept)
+    return cleared, [0] * cleared + [mask for mask, _ in kept], \
+        [bytes(board.columns)] * cleared + [colors for _, colors in kept]
+
+
+def assert_consistent(board):
+    assert board.fill == [bin(mask).count('1') for mask in board.rows]
+    for mask, colors in zip(board.rows, board.colors):
+        assert [x for x in range(board.columns) if colors[x]] == \
+            [x for x in range(board.columns) if mask >> x & 1]
+
+
+def test_clearing_touched_rows_matches_a_full_scan():
+    rng = random.Random(14)
+    checked = cleared_total = 0
+    while checked < 3000:
+        board = random_board(rng, 0.9)
+        # No jogo nenhuma linha fica completa entre uma peça e outra
+        board.clear_full_rows()
+        piece = Piece(rng.randrange(COLUMNS), 0, rng.choice(shapes))
+        piece.rotation = rng.randrange(4)
+        if not valid_space(piece, board):
+            continue
+        piece.y += drop_distance(piece, board)
+        touched = board.lock(engine.convert_shape_format(piece), piece.index + 1)
+
+        expected, rows, colors = full_scan(board)
+        assert engine.clear_rows(board, touched) == expected
+        assert board.rows == rows
+        assert [bytes(c) for c in board.colors] == colors
+        assert_consistent(board)
+        checked += 1
+        cleared_total += expected
+    assert cleared_total > 0
+
+
+def test_filling_the_hole_of_a_raised_garbage_row():
+    board = Board()
+    board.lock([(x, ROWS - 1) for x in range(1, COLUMNS)], 3)
+    board.add_garbage(2, 0, engine.GARBAGE_COLOR)
+    # A linha quase cheia subiu duas linhas e as de lixo entraram embaixo,
+    # todas com a coluna 0 vazia
+    assert board.fill[ROWS - 3:] == [COLUMNS - 1] * 3
+    assert board.tops[0] == ROWS and board.tops[1] == ROWS - 3
+
+    # Uma barra em pé na coluna 0 completa as três
+    touched = board.lock([(0, y) for y in range(ROWS - 4, ROWS)], 3)
+    assert sorted(touched) == list(range(ROWS - 4, ROWS))
+    expected, rows, _ = full_scan(board)
+    assert board.clear_full_rows(touched) == expected == 3
+    assert board.rows == rows
+    assert board.rows[ROWS - 1] == 1
+    assert_consistent(board)
+
+
+def test_full_row_outside_the_candidates_waits_for_a_full_scan():
+    board = Board()
+    board.lock([(x, ROWS - 1) for x in range(COLUMNS)], 4)
+    board.lock([(3, ROWS - 5)], 1)
+    # Só as linhas informadas são checadas: a linha completa fica
+    assert board.clear_full_rows([ROWS - 5]) == 0
+    assert board.rows[ROWS - 1] == board.full_mask
+    assert board.clear_full_rows() == 1
+    assert board.rows[ROWS - 1] == 0
+    assert board.is_occupied(3, ROWS - 4)
+    assert_consistent(board)
+
+
+def test_versus_games_never_leave_a_full_row():
+    # Com lixo entrando, as linhas tocadas continuam sendo as únicas que
+    # podem ficar completas: nenhuma linha completa sobra depois de um passo
+    match = BotMatch(3, ((DEFAULT_WEIGHTS, False), (DEFAULT_WEIGHTS, False)),
+                     max_ticks=6000, delay_ticks=0)
+    received = 0
+    while not match.over:
+        match.step()
+        for game in match.games:
+            board = game.state.board
+            assert board.full_mask not in board.rows
+            assert_consistent(board)
+        received = max(received, *(g.state.garbage_sent for g in match.games))
+    assert received > 0
@@ -0,0 +1,306 @@
+import random
+
+import pytest
+
+import engine
+from board import Board, COLUMNS, ROWS
+from bot import AutoPlayer, Bot
+from engine import (DOWN, EV_GAME_OVER, EV_MOVE, HARD_DROP, LEFT, LEFT_RELEASE,
+                    RIGHT, RIGHT_RELEASE, ROTATE, Engine, Piece, shapes)
+
+# As regras do motor comparadas com as do jogo original, que guardava os
+# blocos travados em um dicionário {(x, y): cor} e checava a grade inteira.
+#
+# Uma diferença é intencional: no jogo original os blocos travados acima do
+# topo (y < 0) ficavam no dicionário e desciam junto quando a mesma peça
+# completava linhas; a partida só acabava se algum continuasse acima do
+# topo depois da remoção. O motor não guarda nada acima do topo, então
+# travar qualquer bloco ali encerra a partida (lock out), tenha a peça
+# completado linhas ou não. Veja test_lock_out_is_stricter_than_the_old_rules.
+
+
+def old_valid_space(positions, locked):
+    for x, y in positions:
+        if not (0 <= x < COLUMNS) or y >= ROWS:
+            return False
+        if y >= 0 and (x, y) in locked:
+            return False
+    return True
+
+
+def old_clear_rows(locked):
+    full = [i for i in range(ROWS - 1, -1, -1)
+            if all((j, i) in locked for j in range(COLUMNS))]
+    for i in full:
+        for j in range(COLUMNS):
+            del locked[(j, i)]
+    moved = {}
+    for (x, y) in list(locked):
+        descend = sum(1 for i in full if y < i)
+        if descend:
+            moved[(x, y + descend)] = locked.pop((x, y))
+    locked.update(moved)
+    return len(full)
+
+
+def old_check_lost(locked):
+    """Checado depois de old_clear_rows, como no jogo original."""
+    return any(y < 0 for _, y in locked)
+
+
+def board_from(locked):
+    board = Board()
+    for (x, y), color in locked.items():
+        board.lock([(x, y)], color)
+    return board
+
+
+def board_cells(board):
+    return {(x, y): color for x, y, color in board.cells()}
+
+
+SHAPES = dict(zip('SZIOJLT', shapes))
+
+
+def piece(name, x, y, rotation=0):
+    p = Piece(x, y, SHAPES[name])
+    p.rotation = rotation
+    return p
+
+
+def place(game, p):
+    """Troca a peça atual do motor."""
+    game.state.current_piece = p
+    return p
+
+
+class MirroredEngine(Engine):
+    """Engine que repete cada peça travada nas regras antigas e compara."""
+
+    def reset(self, seed=None):
+        super().reset(seed)
+        self.locked = {}
+        self.old_lost = False
+        self.locked_out = False
+
+    def lock_piece(self, events):
+        p = self.state.current_piece
+        positions = engine.convert_shape_format(p)
+        for pos in positions:
+            self.locked[pos] = p.index + 1
+        self.locked_out = any(y < 0 for _, y in positions)
+        super().lock_piece(events)
+        old_clear_rows(self.locked)
+        self.old_lost = old_check_lost(self.locked)
+
+    def check_old_rules(self):
+        """O tabuleiro e o fim de jogo batem com as regras antigas?"""
+        state = self.state
+        # Perder nas regras antigas implica lock out; o contrário só vale
+        # para o motor (a diferença intencional descrita no topo)
+        assert state.lost == self.locked_out
+        assert not self.old_lost or self.locked_out
+        if not state.lost:
+            assert board_cells(state.board) == self.locked
+            assert old_valid_space(state.piece_positions(), self.locked)
+
+
+def test_clear_non_contiguous_rows():
+    locked = {}
+    for y in (19, 17, 15):
+        for x in range(COLUMNS):
+            locked[(x, y)] = 1
+    # Blocos soltos entre e acima das linhas completas
+    for x, y, color in ((0, 18, 2), (3, 16, 3), (9, 16, 4), (4, 14, 5), (5, 10, 6)):
+        locked[(x, y)] = color
+
+    board = board_from(locked)
+    expected = dict(locked)
+    assert board.clear_full_rows() == old_clear_rows(expected) == 3
+    assert board_cells(board) == expected
+    assert board.fill == [sum(1 for (_, y) in expected if y == row)
+                          for row in range(ROWS)]
+
+
+def test_clear_rows_matches_old_rules_on_random_boards():
+    rng = random.Random(7)
+    for _ in range(300):
+        locked = {}
+        for y in range(ROWS):
+            if rng.random() < 0.3:
+                for x in range(COLUMNS):
+                    locked[(x, y)] = rng.randint(1, 7)
+            else:
+                for x in range(COLUMNS):
+                    if rng.random() < 0.4:
+                        locked[(x, y)] = rng.randint(1, 7)
+        board = board_from(locked)
+        expected = dict(locked)
+        assert board.clear_full_rows() == old_clear_rows(expected)
+        assert board_cells(board) == expected
+
+
+def test_random_games_match_old_rules():
+    actions = [LEFT, LEFT_RELEASE, RIGHT, RIGHT_RELEASE, ROTATE, DOWN, HARD_DROP]
+    for seed in range(20):
+        rng = random.Random(seed)
+        game = MirroredEngine(seed)
+        state = game.state
+        while not state.lost and state.ticks < 20000:
+            game.step([rng.choice(actions)] if rng.random() < 0.2 else ())
+            game.check_old_rules()
+
+
+def test_bot_games_match_old_rules():
+    # O bot remove linhas de verdade, inclusive várias de uma vez
+    lines = 0
+    for seed in range(3):
+        game = MirroredEngine(seed)
+        state = game.state
+        player = AutoPlayer(Bot(lookahead=False))
+        while not state.lost and state.pieces < 150:
+            game.step(player.actions(state))
+            game.check_old_rules()
+        lines += state.lines
+    assert lines > 0
+
+
+def test_lock_out_above_the_board_ends_the_game():
+    game = Engine(1)
+    state = game.state
+    # Colunas 4 e 5 cheias até o topo: a peça não consegue descer e trava acima
+    for y in range(ROWS):
+        state.board.lock([(4, y)], 1)
+        state.board.lock([(5, y)], 1)
+    place(game, piece('O', 5, 0))
+    events = game.step([HARD_DROP])
+    assert state.lost
+    assert state.board.overflow
+    assert EV_GAME_OVER in events
+    assert game.step([LEFT]) == []
+
+
+def test_lock_out_is_stricter_than_the_old_rules():
+    # Barra em pé travada com dois blocos acima do topo, completando as
+    # linhas 0 e 1. No jogo original os dois blocos desciam para essas
+    # linhas e a partida seguia; no motor é fim de jogo.
+    locked = {(x, y): 1 for y in (0, 1) for x in range(1, COLUMNS)}
+    locked[(0, 2)] = 2
+    game = MirroredEngine(1)
+    state = game.state
+    for (x, y), color in locked.items():
+        state.board.lock([(x, y)], color)
+    game.locked = dict(locked)
+    place(game, piece('I', 0, 2))
+    game.step([HARD_DROP])
+
+    assert state.lines == 2
+    assert game.locked_out and state.lost
+    assert not game.old_lost
+    assert game.locked == {(0, 0): 3, (0, 1): 3, (0, 2): 2}
+
+
+def test_garbage_pushing_blocks_out_of_the_top_overflows():
+    board = Board()
+    board.lock([(3, 1)], 2)
+    board.add_garbage(1, 0, engine.GARBAGE_COLOR)
+    assert not board.overflow
+    assert board.is_occupied(3, 0)
+    board.add_garbage(1, 5, engine.GARBAGE_COLOR)
+    assert board.overflow
+    assert board.rows[ROWS - 1] == board.full_mask & ~(1 << 5)
+    assert board.fill[ROWS - 2:] == [COLUMNS - 1, COLUMNS - 1]
+
+
+def test_wall_kick_off_the_left_wall():
+    game = Engine(1)
+    p = place(game, piece('I', 0, 10))
+    game.step([ROTATE])
+    # A barra deitada não cabe em x=0, x=-1, x=1 nem x=-2; o chute (2, 0) cabe
+    assert (p.rotation, p.x) == (1, 2)
+    assert old_valid_space(engine.convert_shape_format(p), {})
+
+
+def test_wall_kick_upwards_and_rejected_rotation():
+    game = Engine(1)
+    board = game.state.board
+    # Barra em pé no fundo de um poço de largura 1: nada cabe, a rotação falha
+    for y in range(12, ROWS):
+        for x in range(COLUMNS):
+            if x != 4:
+                board.lock([(x, y)], 1)
+    p = place(game, piece('I', 4, ROWS))
+    before = (p.rotation, p.x, p.y)
+    assert not game.rotate([])
+    assert (p.rotation, p.x, p.y) == before
+
+    # Com a barra mais alta, só o chute (0, -2) a deita na linha 11, livre
+    p = place(game, piece('I', 4, 16))
+    assert game.rotate([])
+    for dx, dy in engine.WALL_KICKS:
+        positions = [(x + 4 + dx, y + 16 + dy)
+                     for x, y in p.rotations[1].cells]
+        if old_valid_space(positions, board_cells(board)):
+            break
+    assert (dx, dy) == (0, -2)
+    assert (p.rotation, p.x, p.y) == (1, 4, 14)
+
+
+def test_lock_delay():
+    game = Engine(1)
+    state = game.state
+    p = state.current_piece
+    p.y += engine.drop_distance(p, state.board)
+    # O primeiro passo no chão inicia a espera; a peça trava lock_delay_ms depois
+    delay_ticks = int(round(game.lock_delay_ms / engine.TICK_MS))
+    for _ in range(delay_ticks):
+        game.step()
+        assert state.pieces == 0
+    game.step()
+    assert state.pieces == 1
+
+
+def test_lock_delay_resets_when_the_piece_moves():
+    game = Engine(1)
+    state = game.state
+    place(game, piece('O', 4, 0))
+    p = state.current_piece
+    p.y += engine.drop_distance(p, state.board)
+    for _ in range(20):
+        game.step()
+    game.step([RIGHT, RIGHT_RELEASE])
+    for _ in range(29):
+        game.step()
+        assert state.pieces == 0
+    for _ in range(2):
+        game.step()
+    assert state.pieces == 1
+
+
+@pytest.mark.parametrize('arr', [30, 10, 5])
+def test_das_arr_catch_up(arr):
+    """Todas as repetições que caem dentro de um passo são aplicadas uma vez só."""
+    game = Engine(1)
+    game.arr_delay_ms = arr
+    moves = []
+    game.shift = lambda dx, events: moves.append(dx) or True
+    held = 0
+    for tick in range(1, 60):
+        held = game.auto_repeat(held, -1, [])
+        das = game.das_delay_ms
+        expected = int((held - das) // arr) + 1 if held > das else 0
+        assert len(moves) == expected, tick
+
+
+def test_held_key_slides_to_the_wall():
+    game = Engine(1)
+    state = game.state
+    p = place(game, piece('O', 5, 2))
+    events = game.step([LEFT])
+    assert events.count(EV_MOVE) == 1 and p.x == 4
+    for _ in range(30):
+        game.step()
+    # Chegou à parede e parou sem atravessá-la
+    assert p.x + p.compiled().min_dx == 0
+    game.step([LEFT_RELEASE])
+    assert state.left_held_ms is None
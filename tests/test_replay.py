@@ -0,0 +1,161 @@
+import random
+
+import pytest
+
+import engine
+from bot import AutoPlayer, Bot
+from replay import (HEADER, HEADER_V1, MAGIC, Recorder, Replay, ReplayError,
+                    board_hash, verify)
+
+
+def record_game(seed, max_pieces=40):
+    game = engine.Engine(seed)
+    recorder = Recorder(game)
+    player = AutoPlayer(Bot(lookahead=False), delay_ticks=3)
+    while not game.state.lost and game.state.pieces < max_pieces:
+        recorder.step(player.actions(game.state))
+    return recorder.finish()
+
+
+def test_round_trip_packs_deltas_and_actions():
+    # Mesmo passo (delta 0), 1 byte (delta <= 7), 2 bytes e um delta grande
+    inputs = [(0, engine.LEFT), (0, engine.ROTATE), (7, engine.HARD_DROP),
+              (8, engine.LEFT_RELEASE), (1000, engine.DOWN),
+              (1000 + 2 ** 20, engine.DOWN_RELEASE)]
+    replay = Replay(2 ** 64 - 1, inputs, ticks=2 ** 32 - 1, score=123456,
+                    pieces=300, lines=120, board_hash=2 ** 64 - 2)
+    data = replay.encode()
+    body = data[HEADER.size:]
+    assert list(body[:3]) == [engine.LEFT, engine.ROTATE, 7 << 4 | engine.HARD_DROP]
+    assert body[3] == 1 << 4 | engine.LEFT_RELEASE
+    assert len(body) == 3 + 1 + 2 + 4
+
+    decoded = Replay.decode(data)
+    assert decoded.seed == 2 ** 64 - 1
+    assert decoded.inputs == inputs
+    assert (decoded.ticks, decoded.score) == (2 ** 32 - 1, 123456)
+    assert (decoded.pieces, decoded.lines, decoded.board_hash) == \
+        (300, 120, 2 ** 64 - 2)
+
+
+def test_recorded_game_round_trips_and_verifies(tmp_path):
+    replay = record_game(12345)
+    path = tmp_path / 'game.ttr'
+    replay.save(path)
+    loaded = Replay.load(path)
+    assert loaded.inputs == replay.inputs
+    ok, state = verify(loaded)
+    assert ok
+    assert state.score == replay.score
+
+
+def test_version_1_files_still_verify_score_and_ticks():
+    replay = record_game(7, max_pieces=15)
+    old = Replay(replay.seed, replay.inputs, replay.ticks, replay.score)
+    data = old.encode()
+    assert data[len(MAGIC)] == 1
+    decoded = Replay.decode(data)
+    assert decoded.inputs == replay.inputs
+    assert decoded.pieces is decoded.lines is decoded.board_hash is None
+    ok, _ = verify(decoded)
+    assert ok
+
+
+def record_idle_game(seed, reset_lock_delay):
+    """
+    Partida sem entradas: cada peça cai e espera o lock delay no chão. Com
+    `reset_lock_delay`, a espera da primeira peça recomeça no meio, uma vez
+    pela ação RESUME e outra mexendo no estado por fora de step().
+    """
+    game = engine.Engine(seed)
+    recorder = Recorder(game)
+    state = game.state
+    reset = False
+    while state.pieces < 3:
+        actions = ()
+        if (reset_lock_delay and not reset and state.lock_delay_start_time is not None
+                and state.now_ms - state.lock_delay_start_time > 200):
+            reset = True
+            if reset_lock_delay == 'action':
+                actions = (engine.RESUME,)
+            else:
+                state.lock_delay_start_time = None
+        recorder.step(actions)
+    return recorder.finish(), state
+
+
+def test_resume_action_during_lock_delay_replays_exactly():
+    plain, _ = record_idle_game(4, None)
+    replay, state = record_idle_game(4, 'action')
+    # A peça esperou mais no chão, e o replay reproduz isso
+    assert replay.ticks > plain.ticks
+    ok, simulated = verify(Replay.decode(replay.encode()))
+    assert ok
+    assert board_hash(simulated) == board_hash(state)
+
+
+def test_state_changed_outside_step_fails_verification():
+    # Mesma pontuação, passos e peças, mas a peça em jogo está em outro
+    # lugar: só o resumo do tabuleiro acusa a diferença
+    replay, _ = record_idle_game(4, 'outside')
+    ok, simulated = verify(Replay.decode(replay.encode()))
+    assert (simulated.score, simulated.ticks, simulated.pieces, simulated.lines) == \
+        (replay.score, replay.ticks, replay.pieces, replay.lines)
+    assert not ok
+
+
+def test_engine_seed_from_getrandbits_fits_the_header():
+    random.seed(3)
+    game = engine.Engine()
+    assert 0 <= game.seed < 2 ** 32
+    replay = Replay(game.seed, ticks=10)
+    assert Replay.decode(replay.encode()).seed == game.seed
+    # Uma semente de 64 bits também volta igual e gera as mesmas peças
+    seed = 2 ** 63 + 17
+    a = engine.Engine(seed)
+    b = engine.Engine(Replay.decode(Replay(seed).encode()).seed)
+    assert [a.state.current_piece.index, a.state.next_piece.index] == \
+        [b.state.current_piece.index, b.state.next_piece.index]
+
+
+def test_tampered_score_fails_verification():
+    replay = record_game(99, max_pieces=20)
+    replay.score += 100
+    ok, _ = verify(Replay.decode(replay.encode()))
+    assert not ok
+
+
+@pytest.mark.parametrize('data, message', [
+    (b'', 'curto'),
+    (MAGIC + b'\x01', 'curto'),
+    (MAGIC + b'\x02' + bytes(HEADER_V1.size), 'curto'),
+    (HEADER_V1.pack(b'XXXX', 1, 0, 0, 0, 0), 'não é'),
+    (HEADER_V1.pack(MAGIC, 99, 0, 0, 0, 0), 'versão'),
+    # Declara 2 entradas mas só traz uma, e depois um varint sem fim
+    (HEADER_V1.pack(MAGIC, 1, 0, 0, 0, 2) + b'\x01', 'truncado'),
+    (HEADER.pack(MAGIC, 2, 0, 0, 0, 0, 0, 0, 2) + b'\x01', 'truncado'),
+    (HEADER.pack(MAGIC, 2, 0, 0, 0, 0, 0, 0, 1) + b'\x81\x80', 'truncado'),
+])
+def test_corrupt_files_raise_replay_error(data, message):
+    with pytest.raises(ReplayError, match=message):
+        Replay.decode(data)
+
+
+def test_command_line_reports_bad_files(tmp_path, capsys, monkeypatch):
+    import runpy
+    import sys
+
+    good = tmp_path / 'good.ttr'
+    record_game(5, max_pieces=10).save(good)
+    bad = tmp_path / 'bad.ttr'
+    bad.write_bytes(b'lixo')
+    monkeypatch.setattr(sys, 'argv', ['replay.py', str(good), str(bad),
+                                      str(tmp_path / 'missing.ttr')])
+    with pytest.raises(SystemExit) as exit:
+        runpy.run_module('replay', run_name='__main__')
+    assert exit.value.code == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith('OK ')
+    assert lines[1].startswith(f'ERRO {bad}: ')
+    assert lines[2].startswith('ERRO ')
+    assert len(lines) == 3
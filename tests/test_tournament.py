@@ -0,0 +1,16 @@
+from bot import DEFAULT_WEIGHTS
+from tournament import BotMatch
+
+
+def test_stepping_a_finished_match_changes_nothing():
+    # A cena que revê partidas pode pedir vários passos no quadro do fim
+    match = BotMatch(5, ((DEFAULT_WEIGHTS, False), (DEFAULT_WEIGHTS, False)),
+                     max_ticks=300, delay_ticks=0).play()
+    final = [(game.state.ticks, game.state.score, game.state.pieces)
+             for game in match.games]
+    winner = match.winner()
+    for _ in range(15):
+        assert match.step() == [[], []]
+    assert [(game.state.ticks, game.state.score, game.state.pieces)
+            for game in match.games] == final
+    assert match.winner() == winner
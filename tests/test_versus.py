@@ -0,0 +1,85 @@
+import asyncio
+import struct
+
+import pytest
+
+import engine
+from versus import (MSG_ATTACK, MSG_GARBAGE, MSG_HELLO, MSG_OPPONENT, MSG_PING, MSG_PONG,
+                    MSG_RESULT, MSG_START, MSG_STATE, PING, STATE, BoardDelta, ProtocolError,
+                    VersusClient, VersusServer, check_message, encode, read_message)
+
+
+def test_state_deltas_from_a_game_are_accepted():
+    game = engine.Engine(3)
+    delta = BoardDelta()
+    for _ in range(300):
+        game.step([engine.HARD_DROP] if game.state.ticks % 20 == 0 else ())
+        payload = delta.encode(game.state)
+        if payload is not None:
+            check_message(MSG_STATE, payload)
+            check_message(MSG_OPPONENT, payload)
+
+
+@pytest.mark.parametrize('kind, payload', [
+    (MSG_ATTACK, b''),
+    (MSG_GARBAGE, b'\x02'),
+    (MSG_START, b'\x00' * 3),
+    (MSG_RESULT, b''),
+    (MSG_PING, b'\x00'),
+    (MSG_STATE, b''),
+    # Declara duas linhas alteradas mas traz uma
+    (MSG_STATE, STATE.pack(1, 0b11, 0, 0, 5, 0, 0, 0) + struct.pack('<H', 1)),
+    # Linha 20 não existe
+    (MSG_OPPONENT, STATE.pack(1, 1 << 20, 0, 0, 5, 0, 0, 0) + struct.pack('<H', 1)),
+    # Peça 7 e rotação 1 do O não existem
+    (MSG_OPPONENT, STATE.pack(1, 0, 7, 0, 5, 0, 0, 0)),
+    (MSG_OPPONENT, STATE.pack(1, 0, 3, 1, 5, 0, 0, 0)),
+])
+def test_malformed_payloads_raise_protocol_error(kind, payload):
+    with pytest.raises(ProtocolError):
+        check_message(kind, payload)
+
+
+def test_server_drops_a_client_that_sends_a_malformed_frame(capsys):
+    async def scenario():
+        server = VersusServer(seed=1)
+        listener = await server.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+
+        bad_reader, bad_writer = await asyncio.open_connection('127.0.0.1', port)
+        bad_writer.write(encode(MSG_HELLO, b'a') + encode(MSG_ATTACK))
+        # O servidor encerra só essa conexão
+        assert await asyncio.wait_for(bad_reader.read(), 5) == b''
+
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(encode(MSG_PING, PING.pack(1.5)))
+        kind, payload = await asyncio.wait_for(read_message(reader), 5)
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return kind, payload
+
+    assert asyncio.run(scenario()) == (MSG_PONG, PING.pack(1.5))
+    assert 'conexão encerrada' in capsys.readouterr().out
+
+
+def test_client_disconnects_on_a_malformed_frame(capsys):
+    async def serve(reader, writer):
+        writer.write(encode(MSG_GARBAGE, b'\x01'))
+        await reader.read()
+
+    async def scenario():
+        listener = await asyncio.start_server(serve, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        client = VersusClient('bot')
+        await client.connect('127.0.0.1', port)
+        await asyncio.wait_for(client.finished.wait(), 5)
+        await client.close()
+        listener.close()
+        await listener.wait_closed()
+        return client
+
+    client = asyncio.run(scenario())
+    assert not client.match.connected
+    assert not client.match.garbage
+    assert 'conexão encerrada' in capsys.readouterr().out
@@ -0,0 +1,467 @@
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from board import COLUMNS
+from bot import AutoPlayer, Bot, DEFAULT_WEIGHTS, FEATURES, load_weights
+from engine import GARBAGE_COLOR, Engine, garbage_color, shape_colors
+
+# Torneios entre configurações do bot, no modo versus (as linhas removidas
+# viram lixo para o adversário), sem tela nem rede: cada partida roda os
+# dois Engine lado a lado, passo a passo, em um processo do pool. As
+# regras são as do jogo (mesmas peças, WALL_KICKS e pontuação
+# 100/300/500/800 do engine.py, que o main.py usa).
+#
+#   python tournament.py padrao=default ajustado=tuning_checkpoint.json
+#   python tournament.py --random 16 --format bracket --games 3
+#   python main.py --watch-match 42      # revê a partida 42 na tela
+#
+# Cada resultado é gravado no banco assim que a partida termina, com a
+# semente e os pesos dos dois bots: como bots e motor são determinísticos,
+# isso basta para jogar a mesma partida de novo na interface.
+
+DB_PATH = 'tournament.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tournaments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    format TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    max_ticks INTEGER NOT NULL,
+    delay_ticks INTEGER NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tournament_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    weights TEXT NOT NULL,
+    lookahead INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tournament_id INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    entry_a INTEGER NOT NULL,
+    entry_b INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    winner INTEGER,
+    score_a INTEGER NOT NULL,
+    score_b INTEGER NOT NULL,
+    lines_a INTEGER NOT NULL,
+    lines_b INTEGER NOT NULL,
+    garbage_a INTEGER NOT NULL,
+    garbage_b INTEGER NOT NULL,
+    ticks INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    played_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_tournament ON entries (tournament_id);
+CREATE INDEX IF NOT EXISTS idx_matches_tournament ON matches (tournament_id);
+"""
+
+# Limite de uma partida: 5 minutos de jogo (no tempo do jogo, não no relógio)
+MAX_TICKS = 5 * 60 * 60
+# Espera do bot antes de cada jogada, como no --autoplay do main.py
+DELAY_TICKS = 10
+
+
+class BotMatch:
+    """
+    Uma partida versus entre dois bots. `entries` são dois pares
+    (pesos, lookahead). Os dois motores usam a mesma semente (as mesmas
+    peças), e o buraco de cada ataque sai de um gerador derivado dela.
+    """
+
+    def __init__(self, seed, entries, max_ticks=MAX_TICKS, delay_ticks=DELAY_TICKS):
+        self.seed = seed
+        self.max_ticks = max_ticks
+        self.games = [Engine(seed, versus=True) for _ in entries]
+        self.players = [AutoPlayer(Bot(weights, lookahead), delay_ticks)
+                        for weights, lookahead in entries]
+        self.holes = random.Random(f"{seed}:garbage")
+        self.sent = [0, 0]
+
+    def step(self):
+        """
+        Avança as duas partidas um passo; retorna os eventos de cada uma.
+        Com a partida já terminada não faz nada (e retorna listas vazias).
+        """
+        if self.over:
+            return [[] for _ in self.games]
+        events = [game.step(player.actions(game.state))
+                  for game, player in zip(self.games, self.players)]
+        for i, game in enumerate(self.games):
+            sent = game.state.garbage_sent
+            if sent > self.sent[i]:
+                self.games[1 - i].receive_garbage(
+                    sent - self.sent[i], self.holes.randrange(COLUMNS))
+                self.sent[i] = sent
+        return events
+
+    @property
+    def over(self):
+        return (any(game.state.lost for game in self.games)
+                or self.games[0].state.ticks >= self.max_ticks)
+
+    def winner(self):
+        """0 ou 1, ou None em empate. Sem ninguém perder, vence a maior pontuação."""
+        a, b = (game.state for game in self.games)
+        if a.lost != b.lost:
+            return 1 if a.lost else 0
+        if a.score != b.score:
+            return 0 if a.score > b.score else 1
+        return None
+
+    def play(self):
+        while not self.over:
+            self.step()
+        return self
+
+
+class GameView:
+    """O jogo de um Engine no formato que main.draw_opponent desenha."""
+
+    def __init__(self, game):
+        self.game = game
+
+    @property
+    def score(self):
+        return self.game.state.score
+
+    @property
+    def version(self):
+        state = self.game.state
+        piece = state.current_piece
+        return state.pieces, piece.x, piece.y, piece.rotation
+
+    def cells(self):
+        state = self.game.state
+        for x, y, color in state.board.cells():
+            yield x, y, (shape_colors[color - 1] if color != GARBAGE_COLOR
+                         else garbage_color)
+        piece = state.current_piece
+        for x, y in state.piece_positions():
+            if y >= 0:
+                yield x, y, piece.color
+
+
+def play_match(task):
+    """
+    Roda nos processos do pool. Recebe (chave, semente, entrada A,
+    entrada B, limite de passos, espera) e retorna uma tupla simples com o
+    resultado, o processo e os tempos de relógio e de CPU gastos.
+    """
+    key, seed, entry_a, entry_b, max_ticks, delay_ticks = task
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    match = BotMatch(seed, (entry_a, entry_b), max_ticks, delay_ticks).play()
+    a, b = (game.state for game in match.games)
+    return (key, match.winner(), a.score, b.score, a.lines, b.lines,
+            a.garbage_sent, b.garbage_sent, a.ticks, os.getpid(),
+            time.perf_counter() - start, time.process_time() - cpu_start)
+
+
+class TournamentStore:
+    """Banco SQLite com os torneios, as configurações e cada partida jogada."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def create_tournament(self, format, games, seed, max_ticks, delay_ticks, entries):
+        """Registra o torneio e as entradas [(nome, pesos, lookahead)]; retorna (id, ids das entradas)."""
+        cursor = self.conn.execute(
+            'INSERT INTO tournaments (format, games, seed, max_ticks, delay_ticks, started_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (format, games, seed, max_ticks, delay_ticks,
+             datetime.now().isoformat(timespec='seconds')))
+        tournament_id = cursor.lastrowid
+        entry_ids = []
+        for name, weights, lookahead in entries:
+            cursor = self.conn.execute(
+                'INSERT INTO entries (tournament_id, name, weights, lookahead) '
+                'VALUES (?, ?, ?, ?)',
+                (tournament_id, name, json.dumps(weights), int(lookahead)))
+            entry_ids.append(cursor.lastrowid)
+        self.conn.commit()
+        return tournament_id, entry_ids
+
+    def record_match(self, tournament_id, round, entry_a, entry_b, seed, result):
+        """Grava uma partida (`result` é o retorno de play_match); retorna o id."""
+        (_, winner, score_a, score_b, lines_a, lines_b, garbage_a, garbage_b,
+         ticks, _, seconds, _) = result
+        winner_id = None if winner is None else (entry_a, entry_b)[winner]
+        cursor = self.conn.execute(
+            'INSERT INTO matches (tournament_id, round, entry_a, entry_b, seed, '
+            'winner, score_a, score_b, lines_a, lines_b, garbage_a, garbage_b, '
+            'ticks, seconds, played_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (tournament_id, round, entry_a, entry_b, seed, winner_id, score_a,
+             score_b, lines_a, lines_b, garbage_a, garbage_b, ticks, seconds,
+             datetime.now().isoformat(timespec='seconds')))
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def finish_tournament(self, tournament_id):
+        self.conn.execute('UPDATE tournaments SET finished_at = ? WHERE id = ?',
+                          (datetime.now().isoformat(timespec='seconds'), tournament_id))
+        self.conn.commit()
+
+    def load_match(self, match_id):
+        """Tudo o que é preciso para jogar a partida de novo, ou None se não existir."""
+        row = self.conn.execute(
+            'SELECT m.seed, m.winner, m.score_a, m.score_b, t.max_ticks, t.delay_ticks, '
+            'a.id, a.name, a.weights, a.lookahead, b.id, b.name, b.weights, b.lookahead '
+            'FROM matches m JOIN tournaments t ON t.id = m.tournament_id '
+            'JOIN entries a ON a.id = m.entry_a JOIN entries b ON b.id = m.entry_b '
+            'WHERE m.id = ?', (match_id,)).fetchone()
+        if row is None:
+            return None
+        (seed, winner, score_a, score_b, max_ticks, delay_ticks,
+         id_a, name_a, weights_a, lookahead_a, id_b, name_b, weights_b, lookahead_b) = row
+        return MatchRecord(
+            match_id, seed, max_ticks, delay_ticks,
+            [(name_a, json.loads(weights_a), bool(lookahead_a)),
+             (name_b, json.loads(weights_b), bool(lookahead_b))],
+            None if winner is None else (0 if winner == id_a else 1),
+            (score_a, score_b))
+
+    def close(self):
+        self.conn.close()
+
+
+class MatchRecord:
+    """Uma partida gravada: refaz o BotMatch com a mesma semente e os mesmos bots."""
+
+    def __init__(self, match_id, seed, max_ticks, delay_ticks, entries, winner, scores):
+        self.match_id = match_id
+        self.seed = seed
+        self.max_ticks = max_ticks
+        self.delay_ticks = delay_ticks
+        self.entries = entries  # [(nome, pesos, lookahead), ...]
+        self.winner = winner
+        self.scores = scores
+
+    @property
+    def names(self):
+        return [name for name, _, _ in self.entries]
+
+    def new_match(self):
+        return BotMatch(self.seed, [(weights, lookahead) for _, weights, lookahead in self.entries],
+                        self.max_ticks, self.delay_ticks)
+
+
+def round_robin(count, games):
+    """Todos contra todos: [(a, b, jogo)], trocando os lados a cada jogo."""
+    pairs = []
+    for a in range(count):
+        for b in range(a + 1, count):
+            for game in range(games):
+                pairs.append((a, b, game) if game % 2 == 0 else (b, a, game))
+    return pairs
+
+
+def bracket_pairs(alive):
+    """Pares da rodada do mata-mata (1º contra último...); None = folga."""
+    size = 1
+    while size < len(alive):
+        size *= 2
+    seeded = alive + [None] * (size - len(alive))
+    return [(seeded[i], seeded[size - 1 - i]) for i in range(size // 2)]
+
+
+class Tournament:
+    def __init__(self, store, entries, format='round-robin', games=1, seed=0,
+                 max_ticks=MAX_TICKS, delay_ticks=DELAY_TICKS):
+        self.store = store
+        self.entries = entries  # [(nome, pesos, lookahead)]
+        self.format = format
+        self.games = games
+        self.seed = seed
+        self.max_ticks = max_ticks
+        self.delay_ticks = delay_ticks
+        self.seeds = random.Random(seed)
+        self.tournament_id, self.entry_ids = store.create_tournament(
+            format, games, seed, max_ticks, delay_ticks, entries)
+
+        self.stats = defaultdict(lambda: {'wins': 0, 'draws': 0, 'losses': 0, 'score': 0})
+        self.matches = 0
+        self.workers = defaultdict(lambda: {'matches': 0, 'wall': 0.0, 'cpu': 0.0})
+
+    def run(self, pool):
+        if self.format == 'bracket':
+            champion = self.run_bracket(pool)
+        else:
+            self.run_round(pool, 0, round_robin(len(self.entries), self.games))
+            champion = None
+        self.store.finish_tournament(self.tournament_id)
+        return champion
+
+    def run_round(self, pool, round, pairs):
+        """Joga as partidas `pairs` ao mesmo tempo; grava cada uma quando termina."""
+        tasks = {}
+        for a, b, game in pairs:
+            seed = self.seeds.getrandbits(32)
+            (_, weights_a, lookahead_a) = self.entries[a]
+            (_, weights_b, lookahead_b) = self.entries[b]
+            future = pool.submit(play_match, (
+                (a, b), seed, (weights_a, lookahead_a), (weights_b, lookahead_b),
+                self.max_ticks, self.delay_ticks))
+            tasks[future] = (a, b, seed)
+
+        results = []
+        for future in as_completed(tasks):
+            a, b, seed = tasks[future]
+            result = future.result()
+            match_id = self.store.record_match(
+                self.tournament_id, round, self.entry_ids[a], self.entry_ids[b],
+                seed, result)
+            self.add_result(a, b, result)
+            results.append((a, b, result))
+            print(f"  partida {match_id}: {self.entries[a][0]} {result[2]} x "
+                  f"{result[3]} {self.entries[b][0]}"
+                  f"{'' if result[1] is None else ' - vence ' + self.entries[(a, b)[result[1]]][0]}")
+            sys.stdout.flush()
+        return results
+
+    def add_result(self, a, b, result):
+        winner = result[1]
+        self.stats[a]['score'] += result[2]
+        self.stats[b]['score'] += result[3]
+        if winner is None:
+            self.stats[a]['draws'] += 1
+            self.stats[b]['draws'] += 1
+        else:
+            self.stats[(a, b)[winner]]['wins'] += 1
+            self.stats[(b, a)[winner]]['losses'] += 1
+        self.matches += 1
+        worker = self.workers[result[9]]
+        worker['matches'] += 1
+        worker['wall'] += result[10]
+        worker['cpu'] += result[11]
+
+    def run_bracket(self, pool):
+        """Mata-mata: cada confronto é uma série de `games` partidas."""
+        alive = list(range(len(self.entries)))
+        round = 0
+        while len(alive) > 1:
+            round += 1
+            print(f"Rodada {round}: {len(alive)} participantes")
+            pairs = bracket_pairs(alive)
+            games = [(a, b, game) if game % 2 == 0 else (b, a, game)
+                     for a, b in pairs if a is not None and b is not None
+                     for game in range(self.games)]
+            series = defaultdict(lambda: [0, 0])  # {entrada: [vitórias, pontos]}
+            for a, b, result in self.run_round(pool, round, games):
+                if result[1] is not None:
+                    series[(a, b)[result[1]]][0] += 1
+                series[a][1] += result[2]
+                series[b][1] += result[3]
+            # Quem vence mais partidas passa; empate vai para a pontuação
+            # somada e, por fim, para a melhor posição na chave
+            alive = [a if b is None else b if a is None else
+                     max((a, b), key=lambda e: (series[e][0], series[e][1], -e))
+                     for a, b in pairs]
+        return alive[0]
+
+    def standings(self):
+        order = sorted(range(len(self.entries)), key=lambda e: (
+            self.stats[e]['wins'] + 0.5 * self.stats[e]['draws'],
+            self.stats[e]['score']), reverse=True)
+        return [(self.entries[e][0], self.stats[e]) for e in order]
+
+
+def parse_entry(spec, lookahead):
+    """'nome=arquivo.json', 'nome=default' ou só 'arquivo.json'."""
+    name, _, path = spec.rpartition('=')
+    if not name:
+        name = os.path.splitext(os.path.basename(path))[0]
+    weights = dict(DEFAULT_WEIGHTS) if path == 'default' else {
+        **DEFAULT_WEIGHTS, **load_weights(path)}
+    return name, weights, lookahead
+
+
+def random_entries(count, seed, lookahead):
+    """Variações sorteadas dos pesos padrão (para torneios grandes de teste)."""
+    rng = random.Random(f"{seed}:entries")
+    return [(f"aleatorio{i + 1}",
+             {name: DEFAULT_WEIGHTS[name] + rng.gauss(0, 0.1) for name in FEATURES},
+             lookahead)
+            for i in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Torneio entre configurações do bot, em partidas versus sem tela.")
+    parser.add_argument('entries', nargs='*',
+                        help="nome=pesos.json (ou nome=default) de cada participante")
+    parser.add_argument('--random', type=int, default=0,
+                        help="acrescenta N participantes com pesos sorteados")
+    parser.add_argument('--format', choices=('round-robin', 'bracket'),
+                        default='round-robin')
+    parser.add_argument('--games', type=int, default=2,
+                        help="partidas por confronto")
+    parser.add_argument('--max-ticks', type=int, default=MAX_TICKS,
+                        help="passos até a partida acabar pela pontuação")
+    parser.add_argument('--delay-ticks', type=int, default=DELAY_TICKS,
+                        help="espera do bot antes de cada jogada, em passos")
+    parser.add_argument('--lookahead', action='store_true',
+                        help="bots olham também a próxima peça (mais lento)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                        help="quantidade de processos (padrão: núcleos da CPU)")
+    args = parser.parse_args(argv)
+
+    entries = [parse_entry(spec, args.lookahead) for spec in args.entries]
+    entries += random_entries(args.random, args.seed, args.lookahead)
+    if len(entries) < 2:
+        print("São precisos pelo menos dois participantes.")
+        return 2
+
+    store = TournamentStore(args.db)
+    tournament = Tournament(store, entries, args.format, args.games, args.seed,
+                            args.max_ticks, args.delay_ticks)
+    print(f"Torneio {tournament.tournament_id} ({args.format}, "
+          f"{len(entries)} participantes) em {args.db}")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        champion = tournament.run(pool)
+    elapsed = time.perf_counter() - start
+    store.close()
+
+    print("\nClassificação:")
+    for name, stats in tournament.standings():
+        print(f"  {name:<20}{stats['wins']:>4} V {stats['draws']:>3} E "
+              f"{stats['losses']:>3} D {stats['score']:>10} pontos")
+    if champion is not None:
+        print(f"Campeão: {entries[champion][0]}")
+
+    print(f"\n{tournament.matches} partidas em {elapsed:.1f} s "
+          f"({tournament.matches / elapsed * 60:,.1f} partidas/min)")
+    # Uso de cada núcleo: tempo de CPU do processo sobre o tempo total
+    total_cpu = 0.0
+    for pid, worker in sorted(tournament.workers.items()):
+        total_cpu += worker['cpu']
+        print(f"  processo {pid}: {worker['matches']} partidas, "
+              f"CPU {worker['cpu'] / elapsed:.0%}")
+    print(f"  uso médio dos {args.workers} núcleos: "
+          f"{total_cpu / (elapsed * args.workers):.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
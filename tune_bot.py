@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bot import Bot, DEFAULT_WEIGHTS, FEATURES, play_game
+
+# Ajuste automático dos pesos da heurística do bot pelo método de entropia
+# cruzada: a cada geração sorteia uma população de vetores de pesos ao redor
+# da média atual, avalia cada um jogando partidas sem tela (com as mesmas
+# regras do jogo, via engine) em um pool de processos, e move a média para
+# os melhores. O estado é salvo a cada geração e pode ser retomado.
+#
+#   python tune_bot.py --generations 20 --population 24 --games 8
+#   python tune_bot.py --resume
+
+CHECKPOINT_PATH = 'tuning_checkpoint.json'
+
+# Parâmetros do Tuner gravados no checkpoint, com os valores padrão
+TUNER_DEFAULTS = {
+    'population': 24,
+    'games': 8,
+    'max_pieces': 500,
+    'elite': 0.25,
+    'seed': 0,
+}
+
+
+def play_candidate(task):
+    """Roda nos processos do pool: (pesos, semente, limite) -> (linhas, peças)."""
+    weights, seed, max_pieces = task
+    state = play_game(Bot(weights, lookahead=False), seed, max_pieces).state
+    return state.lines, state.pieces
+
+
+class Tuner:
+    def __init__(self, population=24, games=8, max_pieces=500, elite=0.25,
+                 seed=0):
+        self.population = population
+        self.games = games
+        self.max_pieces = max_pieces
+        self.elite = elite
+        self.seed = seed
+
+        self.generation = 0
+        self.mean = dict(DEFAULT_WEIGHTS)
+        self.std = {name: 0.5 for name in FEATURES}
+        self.best = None  # {'weights': ..., 'lines': ...}
+        self.history = []
+
+    def to_dict(self):
+        return {
+            'population': self.population,
+            'games': self.games,
+            'max_pieces': self.max_pieces,
+            'elite': self.elite,
+            'seed': self.seed,
+            'generation': self.generation,
+            'mean': self.mean,
+            'std': self.std,
+            'best': self.best,
+            'history': self.history,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        tuner = cls(data['population'], data['games'], data['max_pieces'],
+                    data['elite'], data['seed'])
+        tuner.generation = data['generation']
+        tuner.mean = data['mean']
+        tuner.std = data['std']
+        tuner.best = data['best']
+        tuner.history = data['history']
+        return tuner
+
+    def save(self, path):
+        """Grava o checkpoint de forma atômica (arquivo temporário + rename)."""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    def sample(self):
+        """Sorteia a população da geração atual (reprodutível pela semente)."""
+        rng = random.Random(f"{self.seed}:{self.generation}")
+        return [{name: rng.gauss(self.mean[name], self.std[name])
+                 for name in FEATURES}
+                for _ in range(self.population)]
+
+    def run_generation(self, pool):
+        candidates = self.sample()
+        # Todos os candidatos jogam as mesmas sementes nesta geração, para
+        # que a comparação dependa só dos pesos
+        seeds = [self.seed * 1000003 + self.generation * 1009 + g
+                 for g in range(self.games)]
+        tasks = [(weights, seed, self.max_pieces)
+                 for weights in candidates for seed in seeds]
+
+        start = time.perf_counter()
+        results = list(pool.map(play_candidate, tasks,
+                                chunksize=max(1, len(tasks) // 64)))
+        elapsed = time.perf_counter() - start
+
+        fitness = []
+        total_pieces = 0
+        for i, weights in enumerate(candidates):
+            games = results[i * self.games:(i + 1) * self.games]
+            total_pieces += sum(pieces for _, pieces in games)
+            fitness.append((sum(lines for lines, _ in games) / self.games, weights))
+        fitness.sort(key=lambda item: item[0], reverse=True)
+
+        elite_count = max(2, int(round(self.population * self.elite)))
+        elite = [weights for _, weights in fitness[:elite_count]]
+        for name in FEATURES:
+            values = [weights[name] for weights in elite]
+            mean = sum(values) / len(values)
+            variance = sum((v - mean) ** 2 for v in values) / len(values)
+            self.mean[name] = mean
+            # Um pouco de ruído extra evita que a busca pare cedo demais
+            self.std[name] = variance ** 0.5 + 0.01
+
+        best_lines, best_weights = fitness[0]
+        if self.best is None or best_lines > self.best['lines']:
+            self.best = {'weights': best_weights, 'lines': best_lines}
+
+        report = {
+            'generation': self.generation,
+            'games': len(tasks),
+            'seconds': elapsed,
+            'games_per_second': len(tasks) / elapsed if elapsed > 0 else 0.0,
+            'pieces_per_second': total_pieces / elapsed if elapsed > 0 else 0.0,
+            'mean_lines': sum(lines for lines, _ in fitness) / len(fitness),
+            'best_lines': best_lines,
+        }
+        self.history.append(report)
+        self.generation += 1
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Ajusta os pesos da heurística do bot (entropia cruzada).")
+    parser.add_argument('--generations', type=int, default=10,
+                        help="gerações a rodar nesta execução")
+    # Sem valor padrão aqui: no --resume os valores vêm do checkpoint, e só
+    # os informados na linha de comando são comparados com eles
+    parser.add_argument('--population', type=int,
+                        help=f"candidatos por geração (padrão: {TUNER_DEFAULTS['population']})")
+    parser.add_argument('--games', type=int,
+                        help=f"partidas por candidato (padrão: {TUNER_DEFAULTS['games']})")
+    parser.add_argument('--max-pieces', type=int,
+                        help=f"limite de peças por partida (padrão: {TUNER_DEFAULTS['max_pieces']})")
+    parser.add_argument('--elite', type=float,
+                        help="fração da população usada para atualizar a média "
+                             f"(padrão: {TUNER_DEFAULTS['elite']})")
+    parser.add_argument('--seed', type=int,
+                        help=f"semente (padrão: {TUNER_DEFAULTS['seed']})")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--checkpoint', default=CHECKPOINT_PATH)
+    parser.add_argument('--resume', action='store_true',
+                        help="continua a partir do checkpoint")
+    args = parser.parse_args(argv)
+
+    options = {name: getattr(args, name) for name in TUNER_DEFAULTS}
+    if args.resume and os.path.exists(args.checkpoint):
+        tuner = Tuner.load(args.checkpoint)
+        for name, value in options.items():
+            if value is not None and value != getattr(tuner, name):
+                parser.error(
+                    f"--{name.replace('_', '-')} {value} difere do checkpoint "
+                    f"({getattr(tuner, name)}); retome sem ele ou use outro --checkpoint")
+        print(f"Retomando da geração {tuner.generation} ({args.checkpoint})")
+    else:
+        tuner = Tuner(**{name: TUNER_DEFAULTS[name] if value is None else value
+                         for name, value in options.items()})
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for _ in range(args.generations):
+            report = tuner.run_generation(pool)
+            tuner.save(args.checkpoint)
+            print(f"geração {report['generation']:>3}: "
+                  f"{report['games_per_second']:,.1f} partidas/s "
+                  f"({report['pieces_per_second']:,.0f} peças/s), "
+                  f"linhas média {report['mean_lines']:.1f}, "
+                  f"melhor {report['best_lines']:.1f}")
+            sys.stdout.flush()
+
+    if tuner.best is None:
+        # --generations 0, ou checkpoint salvo antes de alguma geração terminar
+        print("\nNenhuma geração terminou ainda: não há pesos para mostrar.")
+        return 0
+    print("\nMelhores pesos:")
+    for name in FEATURES:
+        print(f"  {name}: {tuner.best['weights'][name]:.6f}")
+    print(f"  (média de {tuner.best['lines']:.1f} linhas por partida)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from replay import REPLAY_EXTENSION, Replay, ReplayError, verify
+
+# Verifica em paralelo grandes quantidades de replays (.ttr): cada arquivo é
+# re-simulado sem renderização em um processo do pool, e o resultado de cada
+# um é impresso assim que ele termina.
+#
+#   python verify_replays.py replays/ outros/*.ttr --workers 8
+
+
+def find_replays(paths):
+    """Expande pastas em todos os arquivos .ttr que elas contêm."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith(REPLAY_EXTENSION):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def verify_file(path):
+    """
+    Re-simula um replay. Roda nos processos do pool, então retorna apenas
+    uma tupla simples: (caminho, ok, pontuação declarada, pontuação
+    simulada, passos, segundos, erro).
+    """
+    start = time.perf_counter()
+    try:
+        replay = Replay.load(path)
+        ok, state = verify(replay)
+    except (OSError, ReplayError) as e:
+        return path, False, None, None, 0, time.perf_counter() - start, str(e)
+    return (path, ok, replay.score, state.score, state.ticks,
+            time.perf_counter() - start, None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Verifica replays re-simulando cada partida em paralelo.")
+    parser.add_argument('paths', nargs='+',
+                        help="arquivos .ttr ou pastas com replays")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                        help="quantidade de processos (padrão: núcleos da CPU)")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="mostra apenas as falhas e o resumo")
+    args = parser.parse_args(argv)
+
+    files = list(find_replays(args.paths))
+    if not files:
+        print("Nenhum replay encontrado.")
+        return 2
+
+    passed = failed = 0
+    total_ticks = 0
+    busy_seconds = 0.0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(verify_file, path) for path in files]
+        for future in as_completed(futures):
+            path, ok, claimed, simulated, ticks, seconds, error = future.result()
+            total_ticks += ticks
+            busy_seconds += seconds
+            if ok:
+                passed += 1
+            else:
+                failed += 1
+
+            if error is not None:
+                print(f"ERRO {path}: {error}")
+            elif not ok or not args.quiet:
+                rate = ticks / seconds if seconds > 0 else 0
+                print(f"{'OK  ' if ok else 'FALHA'} {path}: declarada={claimed} "
+                      f"simulada={simulated} passos={ticks} ({rate:,.0f} passos/s)")
+            sys.stdout.flush()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(files)} replays: {passed} ok, {failed} com falha "
+          f"em {elapsed:.2f}s com {args.workers} processos")
+    if elapsed > 0:
+        print(f"Vazão: {len(files) / elapsed:,.1f} replays/s, "
+              f"{total_ticks / elapsed:,.0f} passos/s "
+              f"(speedup sobre 1 processo: {busy_seconds / elapsed:.1f}x)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,731 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import random
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from board import COLUMNS, ROWS
+from bot import AutoPlayer, Bot
+from engine import SHAPE_ROTATIONS, TICK_MS, Engine, garbage_color, shape_colors
+
+# Modo versus em rede local: dois jogadores, e as linhas que um remove
+# viram linhas de lixo no tabuleiro do outro. O servidor (asyncio) forma
+# as partidas com quem estiver na fila e repassa as mensagens; cada
+# cliente roda o próprio Engine e envia só o que mudou no tabuleiro.
+#
+#   python versus.py server                     # servidor na porta 7777
+#   python main.py --versus 127.0.0.1:7777      # um jogador (abra dois)
+#   python versus.py load --local --matches 100 # teste de carga com bots
+#
+# Protocolo (little-endian): cada mensagem é o tamanho dos dados (u16), o
+# tipo (u8) e os dados. O estado do jogo vai como delta: uma máscara com as
+# linhas que mudaram desde a última mensagem, a máscara de bits (u16) de
+# cada uma delas e a peça atual. A primeira mensagem de cada partida leva
+# todas as linhas.
+
+DEFAULT_PORT = 7777
+
+MSG_HELLO = 1     # cliente: entra na fila (nome em UTF-8)
+MSG_CANCEL = 2    # cliente: sai da fila
+MSG_START = 3     # servidor: a partida começou (semente, número do jogador)
+MSG_STATE = 4     # cliente: delta do próprio jogo
+MSG_OPPONENT = 5  # servidor: delta do jogo do adversário (mesmo formato)
+MSG_ATTACK = 6    # cliente: linhas de lixo enviadas (u8)
+MSG_GARBAGE = 7   # servidor: lixo recebido (linhas u8, coluna do buraco u8)
+MSG_PING = 8      # cliente: instante do envio (f64), devolvido em MSG_PONG
+MSG_PONG = 9
+MSG_LOST = 10     # cliente: perdeu (ou desistiu)
+MSG_RESULT = 11   # servidor: fim da partida (venceu u8)
+
+# Avisos do próprio cliente para MatchState, junto com as mensagens do
+# servidor: resposta de um ping (ida e volta em ms) e conexão encerrada
+RTT = 'rtt'
+DISCONNECTED = 'disconnected'
+
+FRAME = struct.Struct('<HB')
+START = struct.Struct('<IB')
+PING = struct.Struct('<d')
+# Passo (u32), linhas alteradas (u32, bit y = linha y), peça (forma u8,
+# rotação u8, x i8, y i8), pontuação (u32) e linhas removidas (u16)
+STATE = struct.Struct('<IIBBbbIH')
+
+# Uma mensagem de estado a cada 3 passos (no máximo 20 por segundo)
+STATE_INTERVAL_TICKS = 3
+PING_INTERVAL = 0.5
+# Pings usados na latência mostrada na tela
+LATENCY_WINDOW = 10
+CONNECT_TIMEOUT = 5
+
+
+# Tamanho exato dos dados das mensagens de tamanho fixo. MSG_HELLO aceita
+# qualquer nome; MSG_STATE e MSG_OPPONENT são conferidas em check_message.
+PAYLOAD_SIZES = {
+    MSG_CANCEL: 0,
+    MSG_START: START.size,
+    MSG_ATTACK: 1,
+    MSG_GARBAGE: 2,
+    MSG_PING: PING.size,
+    MSG_PONG: PING.size,
+    MSG_LOST: 0,
+    MSG_RESULT: 1,
+}
+
+
+class ProtocolError(Exception):
+    """Mensagem mal formada vinda do outro lado da conexão."""
+
+
+def check_message(kind, payload):
+    """
+    Levanta ProtocolError se os dados não têm o tamanho (ou, no delta de
+    estado, o conteúdo) esperado para o tipo da mensagem. Tipos
+    desconhecidos passam e são ignorados por quem recebe.
+    """
+    size = PAYLOAD_SIZES.get(kind)
+    if size is not None and len(payload) != size:
+        raise ProtocolError(f"mensagem {kind} com {len(payload)} bytes (esperados {size})")
+    if kind in (MSG_STATE, MSG_OPPONENT):
+        if len(payload) < STATE.size:
+            raise ProtocolError(f"estado com {len(payload)} bytes")
+        _, changed, shape, rotation, _, _, _, _ = STATE.unpack_from(payload)
+        if changed >> ROWS:
+            raise ProtocolError(f"estado com linhas inexistentes ({changed:#x})")
+        expected = STATE.size + 2 * bin(changed).count('1')
+        if len(payload) != expected:
+            raise ProtocolError(f"estado com {len(payload)} bytes (esperados {expected})")
+        if shape >= len(SHAPE_ROTATIONS) or rotation >= len(SHAPE_ROTATIONS[shape]):
+            raise ProtocolError(f"estado com peça inválida ({shape}, {rotation})")
+
+
+def encode(kind, payload=b''):
+    return FRAME.pack(len(payload), kind) + payload
+
+
+async def read_message(reader):
+    size, kind = FRAME.unpack(await reader.readexactly(FRAME.size))
+    payload = await reader.readexactly(size) if size else b''
+    return kind, payload
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class BoardDelta:
+    """Gera as mensagens de estado de um jogo, com só as linhas alteradas."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """A próxima mensagem leva o tabuleiro inteiro."""
+        self.rows = None
+        self.info = None
+
+    def encode(self, state):
+        """Dados de MSG_STATE, ou None se nada mudou desde o último envio."""
+        rows = state.board.rows
+        last = self.rows
+        changed = 0
+        masks = []
+        for y, mask in enumerate(rows):
+            if last is None or last[y] != mask:
+                changed |= 1 << y
+                masks.append(mask)
+
+        piece = state.current_piece
+        info = (piece.index, piece.rotation % len(piece.rotations),
+                piece.x, piece.y, state.score, state.lines)
+        if not changed and info == self.info:
+            return None
+        self.rows = rows[:]
+        self.info = info
+        return (STATE.pack(state.ticks, changed, *info)
+                + struct.pack(f'<{len(masks)}H', *masks))
+
+
+class OpponentView:
+    """O jogo do adversário, remontado a partir das mensagens de estado."""
+
+    def __init__(self, rows=ROWS):
+        self.height = rows
+        self.reset()
+
+    def reset(self):
+        self.rows = [0] * self.height
+        self.piece = None
+        self.score = 0
+        self.lines = 0
+        self.tick = 0
+        # Muda a cada mensagem aplicada (para saber quando redesenhar)
+        self.version = 0
+
+    def apply(self, payload):
+        tick, changed, shape, rotation, x, y, score, lines = STATE.unpack_from(payload)
+        masks = iter(struct.unpack_from(
+            f'<{bin(changed).count("1")}H', payload, STATE.size))
+        rows = self.rows
+        for row in range(self.height):
+            if changed >> row & 1:
+                rows[row] = next(masks)
+        self.piece = (shape, rotation, x, y)
+        self.score = score
+        self.lines = lines
+        self.tick = tick
+        self.version += 1
+
+    def cells(self):
+        """Gera (x, y, cor) dos blocos travados (em cinza) e da peça atual."""
+        for y, mask in enumerate(self.rows):
+            for x in range(COLUMNS):
+                if mask >> x & 1:
+                    yield x, y, garbage_color
+        if self.piece is not None:
+            shape, rotation, px, py = self.piece
+            for dx, dy in SHAPE_ROTATIONS[shape][rotation].cells:
+                if py + dy >= 0:
+                    yield px + dx, py + dy, shape_colors[shape]
+
+
+class MatchState:
+    """
+    O que um jogador sabe da partida, montado a partir das mensagens que
+    chegam: o jogo do adversário (OpponentView), o lixo ainda não aplicado
+    [(linhas, buraco), ...], a semente, o resultado ('won'/'lost') e a
+    latência. Só `handle` o altera, e sempre na thread que o lê.
+    """
+
+    def __init__(self):
+        self.opponent = OpponentView()
+        self.garbage = deque()
+        self.recent_rtts = deque(maxlen=LATENCY_WINDOW)
+        self.connected = True
+        self.reset()
+
+    def reset(self):
+        """Esquece a partida anterior (ao entrar de novo na fila)."""
+        self.in_match = False
+        self.seed = None
+        self.player = None
+        self.result = None
+        self.opponent.reset()
+        self.garbage.clear()
+
+    def handle(self, kind, payload):
+        if kind == MSG_OPPONENT:
+            if self.in_match:
+                self.opponent.apply(payload)
+        elif kind == MSG_GARBAGE:
+            if self.in_match:
+                self.garbage.append((payload[0], payload[1]))
+        elif kind == RTT:
+            self.recent_rtts.append(payload)
+        elif kind == MSG_START:
+            self.seed, self.player = START.unpack(payload)
+            self.in_match = True
+        elif kind == MSG_RESULT:
+            self.result = 'won' if payload[0] else 'lost'
+            self.in_match = False
+        elif kind == DISCONNECTED:
+            self.connected = False
+            self.in_match = False
+
+    def latency_ms(self):
+        """Média dos últimos pings (ida e volta), ou None antes do primeiro."""
+        if not self.recent_rtts:
+            return None
+        return sum(self.recent_rtts) / len(self.recent_rtts)
+
+
+class MatchLink:
+    """
+    Liga um Engine à partida em rede: aplica o lixo recebido antes de cada
+    passo e, depois dele, envia os ataques e o delta do estado.
+    """
+
+    def __init__(self, game, send):
+        self.game = game
+        self.send = send
+        self.delta = BoardDelta()
+        self.sent = 0
+        self.reported_loss = False
+
+    def reset(self):
+        self.delta.reset()
+        self.sent = 0
+        self.reported_loss = False
+
+    def receive(self, garbage):
+        while garbage:
+            self.game.receive_garbage(*garbage.popleft())
+
+    def publish(self):
+        state = self.game.state
+        if state.garbage_sent > self.sent:
+            self.send(MSG_ATTACK, bytes([min(255, state.garbage_sent - self.sent)]))
+            self.sent = state.garbage_sent
+        if state.ticks % STATE_INTERVAL_TICKS == 0 or state.lost:
+            payload = self.delta.encode(state)
+            if payload is not None:
+                self.send(MSG_STATE, payload)
+        if state.lost and not self.reported_loss:
+            self.send(MSG_LOST)
+            self.reported_loss = True
+
+
+class Player:
+    """Um cliente conectado ao servidor."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.name = ''
+        self.opponent = None
+
+    def send(self, kind, payload=b''):
+        if not self.writer.is_closing():
+            self.writer.write(encode(kind, payload))
+
+
+class VersusServer:
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.waiting = None
+        self.clients = 0
+        self.active = 0
+        self.matches = 0
+        self.messages = 0
+
+    async def start(self, host='0.0.0.0', port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def handle_client(self, reader, writer):
+        player = Player(writer)
+        self.clients += 1
+        try:
+            while True:
+                kind, payload = await read_message(reader)
+                self.messages += 1
+                check_message(kind, payload)
+                self.dispatch(player, kind, payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ProtocolError as e:
+            print(f"Cliente {writer.get_extra_info('peername')}: {e}; conexão encerrada")
+        finally:
+            self.leave(player)
+            self.clients -= 1
+            writer.close()
+
+    def dispatch(self, player, kind, payload):
+        opponent = player.opponent
+        if kind == MSG_STATE:
+            if opponent is not None:
+                opponent.send(MSG_OPPONENT, payload)
+        elif kind == MSG_PING:
+            player.send(MSG_PONG, payload)
+        elif kind == MSG_ATTACK:
+            if opponent is not None:
+                # Cada ataque tem um buraco só, na mesma coluna em todas as linhas
+                opponent.send(MSG_GARBAGE, bytes([payload[0], self.rng.randrange(COLUMNS)]))
+        elif kind == MSG_HELLO:
+            player.name = payload.decode('utf-8', 'replace')
+            self.enqueue(player)
+        elif kind == MSG_CANCEL:
+            if self.waiting is player:
+                self.waiting = None
+        elif kind == MSG_LOST:
+            if opponent is not None:
+                self.finish(winner=opponent, loser=player)
+
+    def enqueue(self, player):
+        if player.opponent is not None:
+            return
+        if self.waiting is None or self.waiting is player:
+            self.waiting = player
+            return
+        first, self.waiting = self.waiting, None
+        first.opponent = player
+        player.opponent = first
+        seed = self.rng.getrandbits(32)
+        # Os dois recebem a mesma semente, então as mesmas peças
+        first.send(MSG_START, START.pack(seed, 0))
+        player.send(MSG_START, START.pack(seed, 1))
+        self.active += 1
+
+    def finish(self, winner, loser):
+        winner.opponent = None
+        loser.opponent = None
+        winner.send(MSG_RESULT, b'\x01')
+        loser.send(MSG_RESULT, b'\x00')
+        self.active -= 1
+        self.matches += 1
+
+    def leave(self, player):
+        """Cliente desconectado: sai da fila, e quem jogava com ele vence."""
+        if self.waiting is player:
+            self.waiting = None
+        if player.opponent is not None:
+            self.finish(winner=player.opponent, loser=player)
+
+
+class VersusClient:
+    """
+    Conexão de um jogador com o servidor. O que chega do servidor vai para
+    `match` (MatchState), ou, se `inbox` (queue.SimpleQueue) for informado,
+    para a fila, e quem roda em outra thread aplica as mensagens no seu
+    próprio MatchState. `on_event(kind)` é chamado com 'start', 'result' e
+    'disconnected', depois de a mensagem correspondente ser entregue.
+    """
+
+    def __init__(self, name='jogador', on_event=None, inbox=None):
+        self.name = name
+        self.on_event = on_event
+        self.inbox = inbox
+        self.reader = None
+        self.writer = None
+        self.connected = False
+        self.tasks = []
+
+        self.match = MatchState()
+
+        # Tempos de ida e volta de todos os pings (teste de carga)
+        self.rtts = []
+        self.sent_messages = 0
+        self.state_messages = 0
+        self.state_bytes = 0
+
+    async def connect(self, host, port):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.connected = True
+        self.started = asyncio.Event()
+        self.finished = asyncio.Event()
+        self.tasks = [asyncio.ensure_future(self.receive_loop()),
+                      asyncio.ensure_future(self.ping_loop())]
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        self.connected = False
+
+    def notify(self, kind):
+        if self.on_event is not None:
+            self.on_event(kind)
+
+    def deliver(self, kind, payload):
+        if self.inbox is not None:
+            self.inbox.put((kind, payload))
+        else:
+            self.match.handle(kind, payload)
+
+    def send(self, kind, payload=b''):
+        if not self.connected or self.writer.is_closing():
+            return
+        self.writer.write(encode(kind, payload))
+        self.sent_messages += 1
+        if kind == MSG_STATE:
+            self.state_messages += 1
+            self.state_bytes += FRAME.size + len(payload)
+
+    def find_match(self):
+        """
+        Entra na fila; `started` é sinalizado quando a partida começar. Com
+        `inbox`, quem lê a fila zera o próprio MatchState antes de chamar.
+        """
+        if self.inbox is None:
+            self.match.reset()
+        self.started.clear()
+        self.finished.clear()
+        self.send(MSG_HELLO, self.name.encode('utf-8'))
+
+    async def receive_loop(self):
+        try:
+            while True:
+                kind, payload = await read_message(self.reader)
+                check_message(kind, payload)
+                if kind == MSG_PONG:
+                    (sent,) = PING.unpack(payload)
+                    rtt = (time.perf_counter() - sent) * 1000
+                    self.rtts.append(rtt)
+                    self.deliver(RTT, rtt)
+                    continue
+                self.deliver(kind, payload)
+                if kind == MSG_START:
+                    self.started.set()
+                    self.notify('start')
+                elif kind == MSG_RESULT:
+                    self.finished.set()
+                    self.notify('result')
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ProtocolError as e:
+            print(f"Servidor versus: {e}; conexão encerrada")
+            self.writer.close()
+        finally:
+            self.connected = False
+            self.deliver(DISCONNECTED, None)
+            # Libera quem estiver esperando a partida começar ou acabar
+            self.started.set()
+            self.finished.set()
+            self.notify('disconnected')
+
+    async def ping_loop(self):
+        while self.connected:
+            self.send(MSG_PING, PING.pack(time.perf_counter()))
+            await asyncio.sleep(PING_INTERVAL)
+
+
+class VersusConnection:
+    """
+    VersusClient para a interface pygame: o loop asyncio roda em uma thread
+    própria. As mensagens recebidas passam por uma queue.SimpleQueue e são
+    aplicadas em `match` por `poll`, na thread do jogo; os envios são
+    repassados ao loop com call_soon_threadsafe. Nenhum estado é
+    compartilhado entre as duas threads.
+    """
+
+    def __init__(self, host, port, name='jogador', on_event=None):
+        self.inbox = queue.SimpleQueue()
+        self.match = MatchState()
+        self.client = VersusClient(name, on_event, self.inbox)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name='versus-net', daemon=True)
+        self.thread.start()
+        future = asyncio.run_coroutine_threadsafe(
+            self.client.connect(host, port), self.loop)
+        try:
+            future.result(CONNECT_TIMEOUT)
+        except BaseException:
+            self.stop_loop()
+            raise
+
+    def poll(self):
+        """Aplica em `match` as mensagens que chegaram desde a última vez."""
+        inbox = self.inbox
+        while not inbox.empty():
+            self.match.handle(*inbox.get())
+
+    def send(self, kind, payload=b''):
+        self.loop.call_soon_threadsafe(self.client.send, kind, payload)
+
+    def find_match(self):
+        self.poll()
+        self.match.reset()
+        self.loop.call_soon_threadsafe(self.client.find_match)
+
+    def cancel(self):
+        self.send(MSG_CANCEL)
+
+    def close(self):
+        self.poll()
+        if self.match.connected:
+            asyncio.run_coroutine_threadsafe(
+                self.client.close(), self.loop).result(CONNECT_TIMEOUT)
+        self.stop_loop()
+
+    def stop_loop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(CONNECT_TIMEOUT)
+
+
+async def play_headless(client, speed=1.0, max_ticks=None, delay_ticks=0,
+                        weights=None):
+    """
+    Joga uma partida com o bot, sem tela, no ritmo do jogo (vezes `speed`).
+    `delay_ticks` é a espera do bot antes de cada jogada. Chegar a
+    `max_ticks` conta como derrota. Retorna o Engine ao final, ou None se a
+    conexão caiu antes de a partida começar.
+    """
+    match = client.match
+    client.find_match()
+    await client.started.wait()
+    if match.seed is None:
+        return None
+
+    game = Engine(match.seed, versus=True)
+    player = AutoPlayer(Bot(weights, lookahead=False), delay_ticks=delay_ticks)
+    link = MatchLink(game, client.send)
+    state = game.state
+    loop = asyncio.get_running_loop()
+    tick_seconds = TICK_MS / 1000 / speed
+    next_tick = loop.time()
+
+    while match.result is None and client.connected and not state.lost:
+        link.receive(match.garbage)
+        game.step(player.actions(state))
+        link.publish()
+        if max_ticks is not None and state.ticks >= max_ticks:
+            client.send(MSG_LOST)
+            break
+        next_tick += tick_seconds
+        await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    await client.finished.wait()
+    return game
+
+
+async def load_clients(host, port, count, speed, max_ticks, delay_ticks):
+    """Roda `count` clientes sem tela ao mesmo tempo e soma os números deles."""
+    clients = [VersusClient(f'bot{i}') for i in range(count)]
+    await asyncio.gather(*(client.connect(host, port) for client in clients))
+    games = await asyncio.gather(*(
+        play_headless(client, speed, max_ticks, delay_ticks) for client in clients))
+    await asyncio.gather(*(client.close() for client in clients))
+
+    played = [game for game in games if game is not None]
+    return {
+        'wins': sum(1 for client in clients if client.match.result == 'won'),
+        'pieces': sum(game.state.pieces for game in played),
+        'garbage': sum(game.state.garbage_sent for game in played),
+        'sent': sum(client.sent_messages for client in clients),
+        'state_messages': sum(client.state_messages for client in clients),
+        'state_bytes': sum(client.state_bytes for client in clients),
+        'rtts': [rtt for client in clients for rtt in client.rtts],
+    }
+
+
+def load_worker(host, port, count, speed, max_ticks, delay_ticks):
+    """Um processo do teste de carga (cada um com o próprio loop asyncio)."""
+    return asyncio.run(load_clients(host, port, count, speed, max_ticks, delay_ticks))
+
+
+def load_test(host, port, matches, workers, speed, max_ticks, delay_ticks):
+    """
+    Joga `matches` partidas simultâneas entre bots. Os clientes são
+    divididos entre `workers` processos, para que o tempo de CPU dos bots
+    não atrase as mensagens e a latência medida seja a da rede e do
+    servidor.
+    """
+    count = matches * 2
+    workers = max(1, min(workers, count))
+    shares = [count // workers + (1 if i < count % workers else 0)
+              for i in range(workers)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(
+            load_worker, [host] * workers, [port] * workers, shares,
+            [speed] * workers, [max_ticks] * workers, [delay_ticks] * workers))
+    elapsed = time.perf_counter() - start
+
+    total = {key: sum(result[key] for result in results)
+             for key in results[0] if key != 'rtts'}
+    rtts = sorted(rtt for result in results for rtt in result['rtts'])
+
+    print(f"{total['wins']} partidas ({count} clientes, {workers} processos) "
+          f"em {elapsed:.1f} s, {total['pieces']} peças, "
+          f"{total['garbage']} linhas de lixo enviadas")
+    print(f"{total['sent']:,} mensagens enviadas pelos clientes "
+          f"({total['sent'] / elapsed:,.0f}/s)")
+    if total['state_messages']:
+        print(f"{total['state_messages']:,} mensagens de estado, em média "
+              f"{total['state_bytes'] / total['state_messages']:.1f} bytes "
+              f"(grade completa: {COLUMNS * ROWS} células)")
+    if rtts:
+        print(f"latência ida e volta (ms): p50 {percentile(rtts, 0.50):.2f}  "
+              f"p95 {percentile(rtts, 0.95):.2f}  p99 {percentile(rtts, 0.99):.2f}  "
+              f"max {rtts[-1]:.2f}  ({len(rtts)} pings)")
+    return 0 if total['wins'] == matches else 1
+
+
+async def run_server(host, port, report_seconds=None, ready=None):
+    versus_server = VersusServer()
+    server = await versus_server.start(host, port)
+    if ready is not None:
+        ready.set()
+    if report_seconds is None:
+        async with server:
+            await server.serve_forever()
+        return
+
+    print(f"Servidor versus em {host}:{port}")
+    last = versus_server.messages
+    async with server:
+        while True:
+            await asyncio.sleep(report_seconds)
+            messages = versus_server.messages
+            print(f"{versus_server.clients} conectados, {versus_server.active} "
+                  f"partidas em andamento, {versus_server.matches} terminadas, "
+                  f"{(messages - last) / report_seconds:,.0f} mensagens/s")
+            last = messages
+
+
+def serve(host, port, ready):
+    """Servidor em um processo separado (teste de carga com --local)."""
+    try:
+        asyncio.run(run_server(host, port, ready=ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Servidor do modo versus e teste de carga com clientes sem tela.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    server = commands.add_parser('server', help="roda o servidor")
+    server.add_argument('--host', default='0.0.0.0')
+    server.add_argument('--port', type=int, default=DEFAULT_PORT)
+    server.add_argument('--report', type=float, default=10,
+                        help="segundos entre os resumos impressos")
+
+    load = commands.add_parser('load', help="partidas simultâneas entre bots")
+    load.add_argument('--host', default='127.0.0.1')
+    load.add_argument('--port', type=int, default=DEFAULT_PORT)
+    load.add_argument('--matches', type=int, default=50)
+    load.add_argument('--speed', type=float, default=1.0,
+                      help="multiplicador do ritmo do jogo")
+    load.add_argument('--max-ticks', type=int, default=3600,
+                      help="passos até a partida acabar (padrão: 1 minuto)")
+    load.add_argument('--delay-ticks', type=int, default=20,
+                      help="espera do bot antes de cada jogada, em passos")
+    load.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                      help="processos com clientes (padrão: núcleos da CPU)")
+    load.add_argument('--local', action='store_true',
+                      help="sobe o servidor em outro processo desta máquina")
+    args = parser.parse_args(argv)
+
+    if args.command == 'server':
+        try:
+            asyncio.run(run_server(args.host, args.port, args.report))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    server = None
+    if args.local:
+        ready = multiprocessing.Event()
+        server = multiprocessing.Process(
+            target=serve, args=(args.host, args.port, ready), daemon=True)
+        server.start()
+        if not ready.wait(CONNECT_TIMEOUT):
+            print("O servidor local não subiu.")
+            return 1
+    try:
+        return load_test(args.host, args.port, args.matches, args.workers,
+                         args.speed, args.max_ticks, args.delay_ticks)
+    except KeyboardInterrupt:
+        return 1
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+
+
+if __name__ == "__main__":
+    sys.exit(main())